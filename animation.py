@@ -0,0 +1,195 @@
+"""Classic effects as functions of elapsed time (like `iris_wash.frame_index`).
+
+The old effects advanced their state by a fixed step per *call*, so their
+visual speed was tied to the loop rate — which moved with the speed slider,
+with render time and with whatever else the Pi was doing. Here the state is
+derived from time instead:
+
+* `Clock` turns wall time into **ticks** — fractional nominal frames at the
+  loop rate the speed slider always meant, `(101 - speed) ms`. Changing the
+  speed changes the rate from that moment on; the phase never jumps.
+* `pulse_level`, `breathe_level`, `chase_position`, `sinelon_position` and
+  `juggle_positions` are pure functions of the clock's counters.
+* `Trail` renders the fading-trail effects at a tick: the result equals what
+  the per-frame fade-and-paint loop produced after that many frames. It
+  catches up incrementally (the usual case is one step) and rebuilds from
+  `depth` steps back when it jumps, so sampling slower or faster than the
+  nominal rate changes smoothness, never speed.
+
+Periodic results depend only on (tick, parameters) — cacheable by phase.
+"""
+from __future__ import annotations
+
+import math
+import time
+
+
+def frame_period(speed) -> float:
+    """Seconds per nominal frame — the loop delay the speed slider set."""
+    return max(0.01, (101 - speed) / 1000.0)
+
+
+# ---- frame-rate targets ----------------------------------------------------
+# The loop used to render every effect at the slider's nominal rate — up to
+# 100 Hz, past the wire ceiling, so the surplus was dropped or wasted. Time-
+# based effects can be sampled at any rate, so they only get what their
+# motion needs; effects that still advance per call keep the nominal rate,
+# or their speed would change.
+BIT_S = 1.25e-6              # WS2812 bit time at 800 kHz
+MIN_FPS = 20.0               # floor for smooth motion of time-based effects
+KEEPALIVE_FPS = 2.0          # static frames: re-assert only (API wakes paint)
+LEVEL_STEP = 4 / 255.0       # largest brightness step per frame that reads as smooth
+STATIC_EFFECTS = frozenset(('solid',))
+LEVEL_EFFECTS = {'pulse': 1 / 1000.0, 'breathe': 1 / 2000.0}   # level per sweep unit
+TICK_EFFECTS = frozenset(('chase', 'theater', 'gradient', 'sinelon', 'juggle'))
+
+
+def wire_time_s(n) -> float:
+    """Shift-out time of one frame: n LEDs × 24 bit × 1.25 µs (600 → 18 ms)."""
+    return max(0, int(n)) * 24 * BIT_S
+
+
+def target_fps(effect, speed, n, wire=None) -> float:
+    """Frames per second `effect` needs at `speed` on an `n`-LED strip.
+
+    Never above the wire ceiling: a frame cannot go out faster than it
+    shifts out. `wire` is the device's own shift-out time when it knows it
+    (PixelStrip.wire_time_s); else the 800-kHz model for `n` LEDs.
+    """
+    wire = wire_time_s(n) if wire is None else wire
+    ceiling = 1.0 / wire if wire > 0 else 100.0
+    nominal = 1.0 / frame_period(speed)
+    if effect in STATIC_EFFECTS:
+        fps = KEEPALIVE_FPS
+    elif effect in LEVEL_EFFECTS:
+        # Level change per second, in frames of at most LEVEL_STEP each
+        fps = max(MIN_FPS, LEVEL_EFFECTS[effect] * speed * nominal / LEVEL_STEP)
+    elif effect in TICK_EFFECTS:
+        fps = max(MIN_FPS, nominal)
+    else:
+        fps = nominal        # still advances per call: keep its speed
+    return min(fps, ceiling)
+
+
+class Clock:
+    """Nominal frames elapsed since `reset()`, continuous across speed changes.
+
+    Two counters advance together: `ticks` (frames — chase moves one LED per
+    frame) and `sweep` (frames × speed — the effects whose per-frame step
+    scaled with speed). Integrating both is what keeps a slider move from
+    jumping the phase.
+    """
+
+    def __init__(self, now=None, timer=time.monotonic):
+        self._timer = timer
+        self.reset(now)
+
+    def reset(self, now=None):
+        self._t = self._timer() if now is None else now
+        self._speed = None
+        self.ticks = 0.0
+        self.sweep = 0.0
+
+    def advance(self, speed, now=None):
+        now = self._timer() if now is None else now
+        if self._speed is not None and now > self._t:
+            d = (now - self._t) / frame_period(self._speed)
+            self.ticks += d
+            self.sweep += d * self._speed
+        self._t = now
+        self._speed = speed
+        return self
+
+    def sweep_at(self, tick) -> float:
+        """Sweep at an earlier/later tick, at the current speed."""
+        return self.sweep + (tick - self.ticks) * (self._speed or 0)
+
+
+def triangle(x, step, lo, hi=1.0) -> float:
+    """lo -> hi -> lo at `step` per unit of x, starting at lo and rising."""
+    span = hi - lo
+    if step <= 0 or span <= 0:
+        return lo
+    x = (x * step) % (2.0 * span)
+    return lo + (x if x <= span else 2.0 * span - x)
+
+
+def pulse_level(sweep) -> float:
+    return triangle(sweep, 1 / 1000.0, 0.1)
+
+
+def breathe_level(sweep) -> float:
+    return triangle(sweep, 1 / 2000.0, 0.05)
+
+
+def ramp_index(level, lo, count) -> int:
+    """Frame of a `count`-step ramp from `lo` to 1.0 closest to `level`."""
+    idx = int(round((level - lo) / (1.0 - lo) * (count - 1)))
+    return max(0, min(count - 1, idx))
+
+
+def chase_position(ticks, n) -> int:
+    return int(ticks) % max(1, n)
+
+
+def sinelon_position(sweep, n) -> int:
+    phase = sweep / 500.0
+    return int((math.sin(phase) + 1.0) * 0.5 * (n - 1))
+
+
+def juggle_positions(sweep, n, dots=8):
+    phase = sweep / 300.0
+    return [int((math.sin((dot + 7) * phase * 1.2) + 1.0) * 0.5 * (n - 1))
+            for dot in range(dots)]
+
+
+def fade_lut(factor) -> bytes:
+    """256-byte `translate` table for a trail fade: v -> int(v * factor).
+
+    The classic trail effects fade every channel of every LED once per frame;
+    as a table that is one C-speed pass over the plane instead of 1800
+    multiplications and int() calls.
+    """
+    return bytes(int(v * factor) for v in range(256))
+
+
+def fade_depth(lut) -> int:
+    """Steps until a full byte fades to 0 through `lut` — a trail's memory."""
+    v, steps = 255, 0
+    while v and steps < 1024:
+        v = lut[v]
+        steps += 1
+    return steps
+
+
+class Trail:
+    """A fade-and-paint trail as a function of the integer tick.
+
+    `paint(plane, tick)` draws the heads for one tick into the plane (RGBW
+    payload layout). Rendering tick k means: fade once and paint, for every
+    tick up to k — exactly the old per-frame loop. Anything older than
+    `depth` ticks has faded to black, so a jump replays at most `depth` steps.
+    """
+
+    def __init__(self, n, lut, paint):
+        self.n = max(0, int(n))
+        self.lut = lut
+        self.paint = paint
+        self.depth = fade_depth(lut)
+        self.plane = bytearray(self.n * 4)
+        self.tick = None
+
+    def render(self, tick: int) -> bytearray:
+        tick = int(tick)
+        last = self.tick
+        if last is None or tick < last or tick - last > self.depth:
+            self.plane[:] = bytes(len(self.plane))
+            start = max(0, tick - self.depth)   # nothing painted before 0
+        else:
+            start = last + 1
+        plane, lut, paint = self.plane, self.lut, self.paint
+        for k in range(start, tick + 1):
+            plane[:] = plane.translate(lut)
+            paint(plane, k)
+        self.tick = tick
+        return plane
@@ -0,0 +1,89 @@
+"""Hot-plug supervisor: bring chains that were missing at boot online later.
+
+Chains used to be resolved once in `__init__`: a `/dev/ledsN` absent at
+boot (overlay bound late, chain unplugged, boot conflict) was skipped for
+the life of the process. The supervisor keeps the skipped chains on a list
+and retries each on its own exponential backoff. The controller's `resolve`
+re-reads the kernel's pin map (parse_pio_map) only when the set of
+`/dev/leds*` nodes changed, so an idle retry costs a directory listing.
+A device that resolves is built, begun and handed to `attach`, which joins
+it to the running strip (MultiStrip) without a restart.
+
+Chains that fail at runtime come back here too: MultiStrip quarantines
+them and, through the controller, hands them to `readd`. They then take the
+same path — re-resolve by pin, rebuild, attach — so a chain whose ledsN
+number moved while it was gone finds its new device. A chain that keeps
+failing is re-added with a doubled delay each time (up to the maximum).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+BACKOFF_S = 1.0
+MAX_BACKOFF_S = 30.0
+
+
+class ChainSupervisor:
+    def __init__(self, chains, resolve, build, attach, claimed=(),
+                 backoff_s: float = BACKOFF_S, max_backoff_s: float = MAX_BACKOFF_S):
+        """`chains`: dicts with at least 'pin'. `resolve(pin)` -> device or None,
+        `build(chain, dev)` -> begun strip (raises on failure), `attach(strip)`."""
+        self.resolve = resolve
+        self.build = build
+        self.attach = attach
+        self.claimed = set(claimed)
+        self.backoff_s = max(0.01, float(backoff_s))
+        self.max_backoff_s = max(self.backoff_s, float(max_backoff_s))
+        self.pending = [{'chain': dict(c), 'due': 0.0, 'delay': self.backoff_s}
+                        for c in chains]
+        self.recovered = []
+        self._relapse = {}             # pin -> first delay on the next readd
+        self.wake = threading.Event()  # set by readd: the poll loop looks now
+
+    def readd(self, chain, dev=None, now=None):
+        """A chain failed at runtime: release its device, retry it after a backoff."""
+        now = time.monotonic() if now is None else now
+        pin = int(chain['pin'])
+        self.claimed.discard(dev)
+        delay = self._relapse.get(pin, self.backoff_s)
+        self._relapse[pin] = min(self.max_backoff_s, delay * 2.0)
+        self.pending.append({'chain': dict(chain), 'due': now + delay, 'delay': delay})
+        self.wake.set()
+
+    def poll(self, now=None) -> list:
+        """Retry every chain that is due; returns the devices attached now."""
+        now = time.monotonic() if now is None else now
+        attached = []
+        for entry in list(self.pending):
+            if now < entry['due']:
+                continue
+            chain = entry['chain']
+            dev = self.resolve(int(chain['pin']))
+            strip = None
+            if dev and dev not in self.claimed and os.path.exists(dev):
+                try:
+                    strip = self.build(chain, dev)
+                except (RuntimeError, OSError):
+                    strip = None
+            if strip is None:
+                entry['due'] = now + entry['delay']
+                entry['delay'] = min(self.max_backoff_s, entry['delay'] * 2.0)
+                continue
+            self.attach(strip)
+            self.claimed.add(dev)
+            self.pending.remove(entry)
+            self.recovered.append({'pin': int(chain['pin']), 'device': dev})
+            attached.append(dev)
+        return attached
+
+    def sleep_hint(self, now=None) -> float:
+        now = time.monotonic() if now is None else now
+        if not self.pending:
+            return self.max_backoff_s
+        return max(0.0, min(e['due'] for e in self.pending) - now)
+
+    def status(self) -> dict:
+        return {'missing': [int(e['chain']['pin']) for e in self.pending],
+                'recovered': list(self.recovered)}
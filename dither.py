@@ -0,0 +1,74 @@
+"""Temporal dithering for the output stage.
+
+Every scale the driver applies — the strip brightness LUT in show(), the gain
+of show_payload() — is an integer product `v * scale / 255` truncated to a
+byte. At low duties the truncation is most of the signal: the iris red at
+led_brightness 100 lands on G ≈ 6, and one duty step up or down is 16 %. That
+is the banding in slow fades, and on single LEDs with a marginal bin it is the
+yellow-green scatter the renderer comments keep fighting.
+
+The product is exact before it is truncated, so the fraction is not lost, just
+thrown away. An ordered dither keeps it: over a cycle of PHASES frames each
+value is rounded against a different threshold, and the frames average to the
+exact product. Neighbouring LEDs run the cycle at different phases, so the
+strip never flickers as a whole — it shimmers below the level the eye reads
+as motion.
+
+It has to be free at 50 fps on 600 LEDs. The threshold is folded into the
+scale table itself — one 256-byte table per (scale, phase), memoised — so a
+frame is PHASES × 4 strided `translate` calls instead of one. No per-pixel
+Python anywhere.
+"""
+from __future__ import annotations
+
+PHASES = 4
+# 1-D Bayer order: consecutive frames land far apart on the threshold ladder,
+# so a two-frame window already averages close to the exact value.
+ORDER = (0, 2, 1, 3)
+BYTES_PER_LED = 4
+
+
+def _scale_table(scale: int, phase: int) -> bytes:
+    # floor(v * scale / 255 + threshold) in integers — 2·PHASES·255 keeps the
+    # threshold exact, no float rounding at the table edges.
+    den = 2 * PHASES * 255
+    off = (2 * ORDER[phase % PHASES] + 1) * 255
+    return bytes(min(255, (v * scale * 2 * PHASES + off) // den)
+                 for v in range(256))
+
+
+class OrderedDither:
+    """Ordered temporal dither with a frame counter and memoised tables.
+
+    One instance per output device: the phase advances once per emitted
+    frame, so every device cycles through the ladder on its own frames.
+    """
+
+    def __init__(self):
+        self.frame = 0
+        self._tables: dict[tuple[int, int], bytes] = {}
+
+    def table(self, scale: int, phase: int) -> bytes:
+        key = (scale, phase)
+        lut = self._tables.get(key)
+        if lut is None:
+            lut = _scale_table(scale, phase)
+            self._tables[key] = lut
+        return lut
+
+    def scale(self, payload, scale: int) -> bytes:
+        """`payload` × scale/255 with the fraction spread over PHASES frames."""
+        frame = self.frame
+        self.frame = (frame + 1) % PHASES
+        scale = max(0, min(255, int(scale)))
+        if scale >= 255 or scale <= 0:
+            # Exact at both ends — nothing to dither.
+            return bytes(payload) if scale >= 255 else bytes(len(payload))
+        out = bytearray(len(payload))
+        step = BYTES_PER_LED * PHASES
+        for p in range(PHASES):
+            lut = self.table(scale, (frame + p) % PHASES)
+            for c in range(BYTES_PER_LED):
+                s = BYTES_PER_LED * p + c
+                out[s::step] = payload[s::step].translate(lut)
+        return bytes(out)
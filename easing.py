@@ -0,0 +1,121 @@
+"""CSS timing functions (cubic-bezier) — solved once, sampled at frame rate.
+
+A CSS `cubic-bezier(x1,y1,x2,y2)` is a curve in the parameter t: the
+progress x gives t only by inverting x(t), then y(t) is the eased value.
+`solve()` does that inversion exactly — Newton-Raphson from t = x, which
+converges in a handful of steps on every sane curve, with bisection as the
+fallback where the slope flattens out (x1 or x2 near 0 or 1).
+
+Precompute (iris_wash frames) can afford the exact solve. Anything that
+runs per frame takes an `Easing` instead: the curve sampled at SAMPLES
+points once, then a lookup plus one linear interpolation per call. Tables
+are memoised per (bezier, samples), so every effect asking for "ease-in-out"
+shares one.
+"""
+from __future__ import annotations
+
+import re
+
+LINEAR = (0.0, 0.0, 1.0, 1.0)
+NAMED = {
+    'linear': LINEAR,
+    'ease': (0.25, 0.1, 0.25, 1.0),
+    'ease-in': (0.42, 0.0, 1.0, 1.0),
+    'ease-out': (0.0, 0.0, 0.58, 1.0),
+    'ease-in-out': (0.42, 0.0, 0.58, 1.0),
+}
+SAMPLES = 256               # table points; lerp error ≤ 1e-4 on the CSS curves
+NEWTON_ITERATIONS = 8
+NEWTON_MIN_SLOPE = 1e-3     # flatter than this: Newton overshoots, bisect instead
+EPSILON = 1e-7
+_CSS = re.compile(r'^\s*cubic-bezier\(([^)]*)\)\s*$')
+
+
+def parse(spec) -> tuple:
+    """'ease-in-out', 'cubic-bezier(.2,0,0,1)' or a 4-sequence → bezier tuple."""
+    if isinstance(spec, str):
+        named = NAMED.get(spec.strip().lower())
+        if named is not None:
+            return named
+        m = _CSS.match(spec)
+        if not m:
+            raise ValueError(f"unknown timing function: {spec!r}")
+        spec = [float(v) for v in m.group(1).split(',')]
+    bezier = tuple(float(v) for v in spec)
+    if len(bezier) != 4:
+        raise ValueError(f"cubic-bezier needs 4 values, got {len(bezier)}")
+    if not (0.0 <= bezier[0] <= 1.0 and 0.0 <= bezier[2] <= 1.0):
+        raise ValueError("cubic-bezier x values must lie in [0, 1]")
+    return bezier
+
+
+def _poly(p1: float, p2: float):
+    """Coefficients of B(t) = ((a·t + b)·t + c)·t for control values p1, p2."""
+    c = 3.0 * p1
+    b = 3.0 * (p2 - p1) - c
+    return 1.0 - c - b, b, c
+
+
+def solve(x: float, bezier=LINEAR) -> float:
+    """Exact eased value of progress `x` for a cubic-bezier tuple."""
+    x1, y1, x2, y2 = bezier
+    x = max(0.0, min(1.0, x))
+    if x in (0.0, 1.0) or (x1 == y1 and x2 == y2):
+        return x
+    ax, bx, cx = _poly(x1, x2)
+    ay, by, cy = _poly(y1, y2)
+    t = x
+    for _ in range(NEWTON_ITERATIONS):
+        err = ((ax * t + bx) * t + cx) * t - x
+        if abs(err) < EPSILON:
+            return ((ay * t + by) * t + cy) * t
+        slope = (3.0 * ax * t + 2.0 * bx) * t + cx
+        if abs(slope) < NEWTON_MIN_SLOPE:
+            break
+        t -= err / slope
+        if not 0.0 <= t <= 1.0:
+            break
+    lo, hi = 0.0, 1.0
+    t = x
+    while hi - lo > EPSILON:
+        if ((ax * t + bx) * t + cx) * t < x:
+            lo = t
+        else:
+            hi = t
+        t = (lo + hi) / 2.0
+    return ((ay * t + by) * t + cy) * t
+
+
+class Easing:
+    """A timing function as a sample table: `easing(x)` costs one lerp."""
+
+    __slots__ = ('bezier', 'samples', '_ys')
+
+    def __init__(self, bezier=LINEAR, samples: int = SAMPLES):
+        self.bezier = parse(bezier)
+        self.samples = max(2, int(samples))
+        self._ys = tuple(solve(i / self.samples, self.bezier)
+                         for i in range(self.samples + 1))
+
+    def __call__(self, x: float) -> float:
+        if x <= 0.0:
+            return self._ys[0]
+        f = x * self.samples
+        i = int(f)
+        if i >= self.samples:
+            return self._ys[-1]
+        y0 = self._ys[i]
+        return y0 + (self._ys[i + 1] - y0) * (f - i)
+
+
+_TABLES: dict = {}
+
+
+def table(spec='ease', samples: int = SAMPLES) -> Easing:
+    """The shared Easing for `spec` (name, CSS string or tuple), built once."""
+    key = (parse(spec), int(samples))
+    easing = _TABLES.get(key)
+    if easing is None:
+        easing = Easing(key[0], samples)
+        _TABLES[key] = easing
+    return easing
@@ -0,0 +1,2 @@
+"""Drop-in effects: every module here is scanned for effect_registry.Effect
+subclasses at startup (effect_registry.Registry.discover)."""
@@ -0,0 +1,22 @@
+"""Fire — 1D heat simulation (fire.FireEngine, table-driven)."""
+from effect_registry import Effect
+from fire import FireEngine
+
+
+class Fire(Effect):
+    __slots__ = ('engine',)
+    name = 'fire'
+
+    def __init__(self):
+        super().__init__()
+        self.engine = None
+
+    def init(self, n):
+        super().init(n)
+        self.engine = FireEngine(n)
+
+    def render(self, t, buf):
+        engine = self.engine
+        engine.step()
+        # Mirrored palette payload straight out; brightness is the output gain
+        buf[:] = engine.payload()
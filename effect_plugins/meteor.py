@@ -0,0 +1,68 @@
+"""Meteor — at most two meteors with long tails, fading 0.92 per frame.
+
+The state plane keeps the trail between frames and is the frame itself; a
+meteor is a small [position, size, speed, trail] list instead of a dict.
+"""
+import random
+
+import animation
+from effect_registry import Effect, Param
+
+FADE = animation.fade_lut(0.92)
+SPAWN_GAP = 100          # minimum frames between spawns
+MAX_METEORS = 2
+
+
+class Meteor(Effect):
+    __slots__ = ('color', 'speed', 'plane', 'meteors', 'since_spawn')
+    name = 'meteor'
+    params = (Param('color', (255, 255, 255)), Param('speed', 50, 1, 100))
+
+    def __init__(self):
+        super().__init__()
+        self.plane = bytearray()
+        self.meteors = []
+        self.since_spawn = 0
+
+    def init(self, n):
+        super().init(n)
+        self.plane = bytearray(n * 4)
+
+    def render(self, t, buf):
+        n = self.n
+        plane = self.plane
+        # Fade all pixels more gradually and visibly (one LUT pass)
+        plane[:] = plane.translate(FADE)
+
+        # Create new meteors MUCH less frequently with minimum spacing
+        self.since_spawn += 1
+        if (self.since_spawn > SPAWN_GAP and random.random() < self.speed / 5000.0
+                and len(self.meteors) < MAX_METEORS):
+            size = random.randint(10, 20)  # Larger meteors
+            # position, size, speed, trail length (longer for visibility)
+            self.meteors.append([0, size, random.uniform(1.5, 2.5), size * 3])
+            self.since_spawn = 0
+
+        r, g, b = self.color[:3]
+        active = []
+        for meteor in self.meteors:
+            meteor[0] += meteor[2]
+            position, size, _, trail = meteor
+            for i in range(trail):
+                pos = int(position - i)
+                if 0 <= pos < n:
+                    if i < size:
+                        # Bright head of meteor
+                        brightness = 1.0 - (i * 0.05)
+                    else:
+                        # Fading tail
+                        brightness = max(0.05, 0.8 * (1.0 - ((i - size) / (trail - size))))
+                    j = pos * 4
+                    plane[j] = int(r * brightness)
+                    plane[j + 1] = int(g * brightness)
+                    plane[j + 2] = int(b * brightness)
+            # Keep meteor if still visible (including tail)
+            if position < n + trail:
+                active.append(meteor)
+        self.meteors = active
+        buf[:] = plane
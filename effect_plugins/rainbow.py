@@ -0,0 +1,41 @@
+"""Rainbow — the hue wheel scrolling one step per frame.
+
+The classic per-pixel loop (wheel() + set_pixel for every LED, every frame)
+as a plugin: the wheel is laid out once per strip length, a frame is one
+slice of it.
+"""
+from effect_registry import Effect
+
+
+def wheel(pos):
+    """Classic 0..255 colour wheel, same stops as the controller's wheel()."""
+    if pos < 85:
+        return pos * 3, 255 - pos * 3, 0
+    if pos < 170:
+        pos -= 85
+        return 255 - pos * 3, 0, pos * 3
+    pos -= 170
+    return 0, pos * 3, 255 - pos * 3
+
+
+WHEEL = tuple(bytes(wheel(k) + (0,)) for k in range(256))
+
+
+class Rainbow(Effect):
+    __slots__ = ('offset', 'row')
+    name = 'rainbow'
+
+    def __init__(self):
+        super().__init__()
+        self.offset = 0
+        self.row = b''
+
+    def init(self, n):
+        super().init(n)
+        # n + 256 LEDs of wheel: every offset is a plain slice
+        self.row = b''.join(WHEEL[i % 256] for i in range(n + 256))
+
+    def render(self, t, buf):
+        o = self.offset * 4
+        buf[:] = self.row[o:o + self.n * 4]
+        self.offset = (self.offset + 1) % 256
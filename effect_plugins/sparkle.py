@@ -0,0 +1,28 @@
+"""Sparkle — random twinkles in the current colour (sparkle.SparklePool)."""
+from effect_registry import Effect, Param
+from sparkle import SparklePool, level_luts
+
+
+class Sparkle(Effect):
+    __slots__ = ('color', 'speed', 'pool', 'rgb', 'luts')
+    name = 'sparkle'
+    params = (Param('color', (255, 255, 255)), Param('speed', 50, 1, 100))
+
+    def __init__(self):
+        super().__init__()
+        self.pool = None
+        self.rgb = None
+        self.luts = ()
+
+    def init(self, n):
+        super().init(n)
+        # Level plane: fade and retire per LUT, spawn from one draw
+        self.pool = SparklePool(n, max(1, int(n * 0.02)))
+
+    def render(self, t, buf):
+        self.pool.step(self.speed / 100.0)
+        rgb = tuple(self.color[:3])
+        if rgb != self.rgb:
+            self.rgb = rgb
+            self.luts = level_luts(rgb)
+        buf[:] = self.pool.render(self.luts)
@@ -0,0 +1,76 @@
+"""Sinelon and juggle — heads painted into a fading trail.
+
+Both are functions of the clock (animation.Trail replays fade-and-paint per
+nominal frame), so the trail and the paint callback are the whole state.
+"""
+import abc
+import colorsys
+
+import animation
+from effect_registry import Effect, Param
+
+SINELON_FADE = animation.fade_lut(0.95)
+JUGGLE_FADE = animation.fade_lut(0.92)
+# Juggle's eight dot colours: fixed hues (dot * 32 / 255), S 0.8, V 1.0.
+JUGGLE_COLORS = tuple(
+    tuple(int(c * 255) for c in colorsys.hsv_to_rgb((dot * 32) / 255.0, 0.8, 1.0))
+    for dot in range(8))
+
+
+class _TrailEffect(Effect):
+    """Shared trail plumbing; subclasses set `fade` (a fade LUT) and `paint`."""
+
+    __slots__ = ('trail',)
+    fade = None
+
+    def __init__(self):
+        super().__init__()
+        self.trail = None
+
+    def init(self, n):
+        super().init(n)
+        self.trail = animation.Trail(n, self.fade, self.paint)
+
+    def render(self, t, buf):
+        buf[:] = self.trail.render(t)
+
+    @abc.abstractmethod
+    def paint(self, plane, tick):
+        """Draw the heads of one nominal frame into the faded plane."""
+
+
+class Sinelon(_TrailEffect):
+    """A sinusoidal sweep with a fading trail (0.95 per frame)."""
+
+    __slots__ = ('color',)
+    name = 'sinelon'
+    params = (Param('color', (255, 255, 255)),)
+    fade = SINELON_FADE
+
+    def paint(self, plane, tick):
+        n = self.n
+        pos = animation.sinelon_position(self.clock.sweep_at(tick), n)
+        # The configured color, unscaled; brightness is applied on output so
+        # the trail fades in full resolution
+        if 0 <= pos < n:
+            j = pos * 4
+            plane[j:j + 3] = bytes(self.color[:3])
+
+
+class Juggle(_TrailEffect):
+    """Eight coloured dots weaving in and out (0.92 per frame)."""
+
+    __slots__ = ()
+    name = 'juggle'
+    fade = JUGGLE_FADE
+
+    def paint(self, plane, tick):
+        n = self.n
+        positions = animation.juggle_positions(self.clock.sweep_at(tick), n)
+        for pos, color in zip(positions, JUGGLE_COLORS):
+            if 0 <= pos < n:
+                # Add to existing pixel value
+                j = pos * 4
+                plane[j] = min(255, plane[j] + color[0])
+                plane[j + 1] = min(255, plane[j + 1] + color[1])
+                plane[j + 2] = min(255, plane[j + 2] + color[2])
@@ -0,0 +1,191 @@
+"""Effect registry: every effect the controller can run, bound once.
+
+Two kinds of entry share one name space:
+
+- built-ins — the controller's `effect_*` methods, handed to `bind()` as
+  they are, plus the reset hook /api/effect runs on a switch (`on_reset`);
+- plugins — `Effect` subclasses. State lives in `__slots__` attributes of
+  the instance instead of string keys in `effect_params`; `init(n)` sizes it,
+  `render(t, buf)` writes one RGBW frame (4 bytes per LED, unscaled colour —
+  the host applies master brightness and the driver LUT). Declared `params`
+  name the host settings (colour, speed …) the effect reads; they are copied
+  onto the instance on its first frame and again when the host pushes a
+  change (`Runner.sync`), not per frame. The clock is handed over per frame.
+
+Plugins are dropped into the `effect_plugins` package as modules and found
+by `discover()` at startup. `bind(host, builtins)` turns the lot into one
+name → callable table; the host caches the entry of the running effect, so
+a frame costs one call instead of a dict of bound methods.
+"""
+from __future__ import annotations
+
+import abc
+import importlib
+import inspect
+import pkgutil
+from collections import namedtuple
+
+PLUGIN_PACKAGE = 'effect_plugins'
+
+# A declared setting: read from the host attribute `name` (else `default`),
+# clamped to [lo, hi] where given
+Param = namedtuple('Param', 'name default lo hi', defaults=(None, None))
+
+
+class Effect(abc.ABC):
+    """Base class of a plugin effect.
+
+    Subclasses set `name`, may declare `params` (a tuple of `Param`) and add
+    their own state to `__slots__`. `n` is -1 until the first `init()`;
+    `clock` is the host's animation.Clock, already advanced for the frame
+    being rendered (`sweep_at()` for the trails).
+    """
+
+    __slots__ = ('n', 'clock')
+    name = None
+    params = ()
+
+    def __init__(self):
+        self.n = -1
+        self.clock = None
+
+    def init(self, n):
+        """(Re)size the state for `n` LEDs — first frame and every resize."""
+        self.n = n
+
+    @abc.abstractmethod
+    def render(self, t, buf):
+        """Write one frame into `buf` (n*4 bytes). `t`: nominal frames since start."""
+
+
+class Runner:
+    """One plugin instance bound to its host; calling it renders one frame.
+
+    The host is anything with `strip`, `anim_clock`, `speed` and
+    `_show_plane` — the controller itself or a zones.ZoneView.
+    """
+
+    __slots__ = ('cls', 'effect', 'buf', 'host', '_params')
+
+    def __init__(self, cls, host=None):
+        self.cls = cls
+        self.host = host
+        self.effect = cls()
+        self.buf = bytearray()
+        self._params = tuple(cls.params)
+
+    def reset(self):
+        """Fresh state: a new instance, sized on the next frame."""
+        self.effect = self.cls()
+
+    def fork(self):
+        """Same effect, own state — for a zone running it beside the strip."""
+        return Runner(self.cls)
+
+    def sync(self, host=None):
+        """Copy the declared params from the host onto the effect.
+
+        Runs on the first frame after a reset or resize; the host calls it
+        when a setting changes (/api/color, /api/speed) — not every frame.
+        """
+        host = self.host if host is None else host
+        effect = self.effect
+        for p in self._params:
+            v = getattr(host, p.name, p.default)
+            if p.lo is not None:
+                v = max(p.lo, v)
+            if p.hi is not None:
+                v = min(p.hi, v)
+            setattr(effect, p.name, v)
+
+    def __call__(self, host=None):
+        host = self.host if host is None else host
+        strip = host.strip
+        if not strip:
+            return
+        n = strip.numPixels()
+        effect = self.effect
+        if effect.n != n:
+            effect.init(n)
+            self.buf = bytearray(n * 4)
+            self.sync(host)
+        effect.clock = clock = host.anim_clock
+        effect.render(clock.advance(host.speed).ticks, self.buf)
+        # Handed over as is: the host writes (or copies) it before returning
+        host._show_plane(self.buf)
+
+
+class Registry:
+    """Plugin classes and reset hooks by effect name."""
+
+    def __init__(self):
+        self.plugins = {}
+        self._resets = {}
+
+    def register(self, cls):
+        """Add a plugin class (usable as a decorator)."""
+        if not (inspect.isclass(cls) and issubclass(cls, Effect)):
+            raise TypeError(f"{cls!r} is not an Effect subclass")
+        if inspect.isabstract(cls):
+            raise TypeError(f"{cls.__name__} does not implement render()")
+        if not cls.name:
+            raise ValueError(f"{cls.__name__} has no effect name")
+        if cls.name in self.plugins and self.plugins[cls.name] is not cls:
+            raise ValueError(f"effect {cls.name!r} is already registered")
+        self.plugins[cls.name] = cls
+        return cls
+
+    def on_reset(self, name, fn):
+        """Run `fn(host)` whenever /api/effect switches to `name`."""
+        self._resets[name] = fn
+
+    def discover(self, package=PLUGIN_PACKAGE):
+        """Import every module of `package`, register its Effect subclasses.
+
+        A broken plugin must not take the controller down: its error is
+        returned (module → message) and the others still load.
+        """
+        errors = {}
+        try:
+            pkg = importlib.import_module(package)
+        except ImportError as e:
+            return {package: str(e)}
+        for info in pkgutil.iter_modules(pkg.__path__):
+            modname = f"{package}.{info.name}"
+            try:
+                mod = importlib.import_module(modname)
+                for _, cls in inspect.getmembers(mod, inspect.isclass):
+                    if issubclass(cls, Effect) and cls.name and cls.__module__ == modname:
+                        self.register(cls)
+            except Exception as e:
+                errors[modname] = f"{type(e).__name__}: {e}"
+        return errors
+
+    def bind(self, host, builtins):
+        """Name → callable for `host`: the built-ins, then one Runner per plugin.
+
+        Built-in names win; a plugin cannot shadow a method effect.
+        """
+        table = dict(builtins)
+        for name, cls in self.plugins.items():
+            table.setdefault(name, Runner(cls, host))
+        return table
+
+    def reset(self, host, name, table=None):
+        """Fresh state for `name` on `host` (what /api/effect does on a switch).
+
+        `table` is the host's bound table. A zone passes none: its switch
+        already dropped the zone's runners, only the hook is left to run.
+        """
+        entry = table.get(name) if table else None
+        if isinstance(entry, Runner):
+            entry.reset()
+            host.anim_clock.reset()
+        fn = self._resets.get(name)
+        if fn is not None:
+            fn(host)
+
+    def describe(self):
+        """Declared parameters per plugin, for /api/effects."""
+        return {name: [p._asdict() for p in cls.params]
+                for name, cls in sorted(self.plugins.items())}
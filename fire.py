@@ -0,0 +1,87 @@
+"""1-D fire simulation on byte arrays (FastLED's Fire2012, table-driven).
+
+The original effect ran three Python loops over a list per frame — a
+`random.randint` per cell to cool, a diffusion loop, and a branchy palette
+conversion — and it is the effect guests ask for, so it ran the Pi hottest.
+
+Here every stage is a whole-array pass at C speed:
+
+* **Cooling** subtracts a slice of a pre-generated random byte pool. The
+  saturating subtract is a 256×256 table walked with `map(getitem, …)`, so no
+  Python frame runs per cell and no RNG call either.
+* **Diffusion** is the same table trick on two shifted views of the heat
+  array. Fire2012 walks k downwards, so every cell reads *old* neighbours —
+  which is exactly a vector operation on the un-updated slices.
+* **Palette** is a 256-entry table of ready 4-byte RGBW payload chunks; the
+  mirrored frame is one `b"".join` over the reversed heat array.
+
+The result goes straight out as a payload — no per-pixel strip calls.
+"""
+from __future__ import annotations
+
+import random
+from operator import getitem
+
+COOLING = 55     # how much each cell cools per step (Fire2012 units)
+SPARKING = 120   # chance out of 255 that a new spark ignites
+SPARK_ZONE = 8   # sparks ignite in the bottom cells
+POOL_SIZE = 4096
+
+
+def heat_rgb(heat: int):
+    """Heat palette: black -> red -> yellow -> white."""
+    heat = max(0, min(255, heat))
+    if heat < 85:
+        return heat * 3, 0, 0
+    if heat < 170:
+        return 255, (heat - 85) * 3, 0
+    return 255, 255, (heat - 170) * 3
+
+
+PALETTE = tuple(bytes((*heat_rgb(h), 0)) for h in range(256))
+
+# Row a, column b: the two-operand byte ops as tables.
+_COOL = tuple(bytes(max(0, h - c) for c in range(256)) for h in range(256))
+_DIFFUSE = tuple(bytes((a + 2 * b) // 3 for b in range(256)) for a in range(256))
+
+
+class FireEngine:
+    """Heat state + one `step()` per frame; `payload()` renders it mirrored."""
+
+    def __init__(self, n: int, rng=None, pool_size: int = POOL_SIZE):
+        self.n = max(0, int(n))
+        self.heat = bytearray(self.n)
+        self._rng = rng or random
+        # Per-cell cooldowns drawn up front: randint(0, cooling*10/n + 2), the
+        # same distribution the per-cell calls had (a cell never holds more
+        # than 255, so larger draws on tiny strips clamp without effect).
+        top = (COOLING * 10) // max(1, self.n) + 2
+        self._pool = bytes(min(255, self._rng.randint(0, top))
+                           for _ in range(pool_size + self.n))
+
+    def cool(self):
+        n = self.n
+        off = self._rng.randrange(len(self._pool) - n + 1)
+        self.heat[:] = bytes(map(getitem, map(_COOL.__getitem__, self.heat),
+                                 self._pool[off:off + n]))
+
+    def diffuse(self):
+        heat = self.heat
+        if self.n > 2:
+            heat[2:] = bytes(map(getitem, map(_DIFFUSE.__getitem__, heat[1:-1]),
+                                 heat[:-2]))
+
+    def ignite(self):
+        rng = self._rng
+        if self.n and rng.randint(0, 255) < SPARKING:
+            y = rng.randint(0, min(SPARK_ZONE - 1, self.n - 1))
+            self.heat[y] = min(255, self.heat[y] + rng.randint(160, 255))
+
+    def step(self):
+        self.cool()
+        self.diffuse()
+        self.ignite()
+
+    def payload(self) -> bytes:
+        """RGBW payload, mirrored so the fire rises from the far end."""
+        return b"".join(map(PALETTE.__getitem__, reversed(self.heat)))
@@ -0,0 +1,76 @@
+"""Byte-capped LRU of precomputed frame periods (like `iris_wash.build_frames`).
+
+Periodic effects — pulse, breathe, theater — repeat the same payloads over
+and over. (Not gradient: its hues change every sweep, so a period would be
+built once and never played again.) Rendering one period once and then playing it back
+turns the steady state into an index plus a write. The cache is keyed by
+everything the frames depend on (effect, LED count, colour, …); a parameter
+change simply looks up a different key, and whatever is no longer used ages
+out of the LRU once the byte budget is reached.
+
+Brightness is deliberately *not* part of any key: it is the output gain in
+`_show_payload`, so a slider move never throws a period away.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+MAX_BYTES = 4 << 20     # a few MB: 600 LEDs × 768 theater frames is ~1.8 MB
+
+
+class FrameCache:
+    """`get(key, build)` → tuple of payloads; `build()` runs only on a miss."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries = OrderedDict()   # key -> (frames, size)
+        self._oversized = None          # (key, frames): last period over the cap
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self._oversized is not None
+                                        and self._oversized[0] == key)
+
+    def get(self, key, build):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if self._oversized is not None and self._oversized[0] == key:
+            self.hits += 1
+            return self._oversized[1]
+        self.misses += 1
+        frames = tuple(build())
+        size = sum(map(len, frames))
+        if size <= self.max_bytes:
+            self._entries[key] = (frames, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, old) = self._entries.popitem(last=False)
+                self.bytes -= old
+        else:
+            # Oversized periods stay out of the LRU — they would evict
+            # everything else and then themselves on the next miss. The last
+            # one is kept aside, so the caller playing it back every frame
+            # looks it up instead of rebuilding it.
+            self._oversized = (key, frames)
+        return frames
+
+    def fit(self, nbytes: int):
+        """Raise the cap to at least `nbytes` (never lowers it)."""
+        self.max_bytes = max(self.max_bytes, int(nbytes))
+
+    def clear(self):
+        self._entries.clear()
+        self._oversized = None
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'bytes': self.bytes,
+                'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,88 @@
+"""Load governor: trade render quality for frame deadlines under CPU load.
+
+On a Pi that also runs other services, render time spikes and the iris
+renderer misses its 20 ms write gate — a missed gate is a visibly held
+frame. The governor watches the render time of recent frames and steps a
+single quality level up (cheaper) when a high percentile breaks the budget,
+and back down (nicer) only after a sustained stretch of headroom, so it
+never oscillates frame to frame.
+
+Effects declare their knobs as per-level tables (`QUALITY`); `knob(name)`
+returns the value for the current level. Level 0 is always the full-quality
+value the effect used before the governor existed — unloaded, nothing
+changes (the iris golden-frame test pins that bit for bit).
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+
+MAX_LEVEL = 3
+WINDOW = 48          # frames in the percentile window
+PERCENTILE = 0.9
+HEADROOM = 0.5       # step back up only below half the budget …
+RECOVER_S = 3.0      # … held this long
+
+# Per-level knob tables. Index = quality level (0 = full quality).
+QUALITY = {
+    # iris_warn
+    'glow_block': (4, 8, 16, 32),          # LEDs per glow/shadow sample
+    'wave_step': (1, 2, 3, 4),             # shockwave: evaluate every n-th LED
+    'spark_scale': (1.0, 0.75, 0.5, 0.35),  # kick spark shower size
+    'shadow_scale': (1.0, 0.75, 0.5, 0.25),  # shadow pockets kept alive
+    # time-based classic effects (animation.LEVEL/TICK_EFFECTS)
+    'fps_scale': (1.0, 0.8, 0.6, 0.45),
+}
+
+
+class LoadGovernor:
+    def __init__(self, budget_s: float = 0.012, window: int = WINDOW):
+        self.budget_s = max(0.001, float(budget_s))
+        self.level = 0
+        self._times = deque(maxlen=max(4, int(window)))
+        self._calm_since = None
+        self.steps_down = 0
+        self.steps_up = 0
+
+    def knob(self, name):
+        table = QUALITY[name]
+        return table[min(self.level, len(table) - 1)]
+
+    def percentile(self) -> float:
+        if not self._times:
+            return 0.0
+        ordered = sorted(self._times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * PERCENTILE))]
+
+    def record(self, render_s: float, now=None) -> int:
+        """Feed one frame's render time; returns the (possibly new) level."""
+        now = time.monotonic() if now is None else now
+        self._times.append(max(0.0, float(render_s)))
+        if len(self._times) < self._times.maxlen:
+            return self.level
+        p = self.percentile()
+        if p > self.budget_s:
+            self._calm_since = None
+            if self.level < MAX_LEVEL:
+                self._step(+1)
+        elif p < self.budget_s * HEADROOM and self.level > 0:
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= RECOVER_S:
+                self._calm_since = now
+                self._step(-1)
+        else:
+            self._calm_since = None
+        return self.level
+
+    def _step(self, delta):
+        self.level += delta
+        if delta > 0:
+            self.steps_down += 1
+        else:
+            self.steps_up += 1
+        self._times.clear()     # judge the new level on its own frames
+
+    def status(self) -> dict:
+        return {'level': self.level, 'p90_ms': round(self.percentile() * 1000.0, 2),
+                'budget_ms': round(self.budget_s * 1000.0, 2)}
@@ -43,6 +43,10 @@ from __future__ import annotations
 
 import math
 
+import easing
+from frame_cache import FrameCache
+from transitions import crossfade
+
 # ---- the page, verbatim ----------------------------------------------------
 PAGE_BASE = (58, 16, 16)                    # #3a1010
 GRADIENT_STOPS = (                          # (position, rgb, alpha)
@@ -68,28 +72,13 @@ def _lerp(a: float, b: float, t: float) -> float:
     return a + (b - a) * t
 
 
-def ease(x: float, bezier=EASE, iterations: int = 24) -> float:
+def ease(x: float, bezier=EASE) -> float:
     """Evaluate a CSS cubic-bezier(x1,y1,x2,y2) timing function at progress x.
 
-    Solved by bisection — this only ever runs at precompute time, so accuracy
-    is free and there is no reason to approximate it with a smoothstep.
+    Exact (easing.solve) — this runs at precompute time, so accuracy is free.
+    Per-frame callers use the sampled table instead (see release_gain).
     """
-    x1, y1, x2, y2 = bezier
-    x = max(0.0, min(1.0, x))
-    if x in (0.0, 1.0):
-        return x
-    lo, hi = 0.0, 1.0
-    for _ in range(iterations):
-        t = (lo + hi) / 2.0
-        u = 1.0 - t
-        bx = 3.0 * u * u * t * x1 + 3.0 * u * t * t * x2 + t * t * t
-        if bx < x:
-            lo = t
-        else:
-            hi = t
-    t = (lo + hi) / 2.0
-    u = 1.0 - t
-    return 3.0 * u * u * t * y1 + 3.0 * u * t * t * y2 + t * t * t
+    return easing.solve(x, bezier)
 
 
 def gradient_at(t: float):
@@ -242,15 +231,64 @@ def build_frames(n: int, steps: int = DEFAULT_STEPS,
     return tuple(frames)
 
 
-def frame_index(elapsed_s: float, steps: int) -> int:
-    """Breathe position at `elapsed_s` seconds, as an index into build_frames()."""
+# Built ramps, shared by every chain and zone in the process. Keyed by what
+# the frames depend on, so strips of different lengths coexist and switching
+# layouts back and forth is a lookup, not a rebuild. The white point is not
+# part of the key: the base carries no white (WHITE_PEAK), the highlights are
+# drawn on top at playback.
+CACHE_BYTES = 2 << 20       # ~13 ramps of 64 × 600 LEDs
+FRAME_CACHE = FrameCache(CACHE_BYTES)
+
+
+def cache_key(n: int, steps: int = DEFAULT_STEPS, exposure: float = DEFAULT_EXPOSURE,
+              max_current_a: float | None = None):
+    return ('wash', max(0, int(n)), max(2, int(steps)), float(exposure),
+            float(max_current_a) if max_current_a else None, WHITE_PEAK)
+
+
+def cached_frames(n: int, steps: int = DEFAULT_STEPS,
+                  exposure: float = DEFAULT_EXPOSURE,
+                  max_current_a: float | None = None, cache: FrameCache | None = None):
+    """build_frames() through the shared LRU — built once per key."""
+    cache = FRAME_CACHE if cache is None else cache
+    return cache.get(cache_key(n, steps, exposure, max_current_a),
+                     lambda: build_frames(n, steps, exposure, max_current_a))
+
+
+def frame_position(elapsed_s: float, steps: int) -> float:
+    """Unrounded breathe position at `elapsed_s`, in frames of build_frames()."""
     steps = max(2, int(steps))
     cycle = elapsed_s % (BREATHE_PERIOD_S * 2.0)
     frac = cycle / BREATHE_PERIOD_S
     if frac > 1.0:
         frac = 2.0 - frac
-    idx = int(round(frac * (steps - 1)))
-    return max(0, min(steps - 1, idx))
+    return max(0.0, min(steps - 1.0, frac * (steps - 1)))
+
+
+def frame_index(elapsed_s: float, steps: int) -> int:
+    """Breathe position at `elapsed_s` seconds, as an index into build_frames()."""
+    steps = max(2, int(steps))
+    return max(0, min(steps - 1, int(round(frame_position(elapsed_s, steps)))))
+
+
+def interpolated_frame(frames, pos: float) -> bytes:
+    """The breathe between two stored keyframes at fractional position `pos`.
+
+    Keyframes trade memory for a blend: a handful of frames plus two
+    translates and a big-int add (transitions.crossfade) per played frame.
+    The breathe changes slowly between neighbours, so the linear blend of
+    the eased keyframes stays within a few PWM steps of the exact frame
+    (16 keyframes on 600 LEDs: ≤ 3 against the 64-frame ramp).
+    """
+    last = len(frames) - 1
+    pos = max(0.0, min(float(last), pos))
+    lo = int(pos)
+    if lo >= last:
+        return frames[last]
+    return crossfade(frames[lo], frames[lo + 1], int(round((pos - lo) * 255)))
+
+
+_RELEASE_EASE = easing.table(EASE)     # runs every fade frame: table, not solve
 
 
 def release_gain(elapsed_s: float) -> int:
@@ -259,7 +297,7 @@ def release_gain(elapsed_s: float) -> int:
         return 255
     if elapsed_s >= RELEASE_FADE_S:
         return 0
-    return int(round(255.0 * (1.0 - ease(elapsed_s / RELEASE_FADE_S))))
+    return int(round(255.0 * (1.0 - _RELEASE_EASE(elapsed_s / RELEASE_FADE_S))))
 
 
 # ---- white highlights ------------------------------------------------------
@@ -402,3 +440,156 @@ def estimate_current_a(n: int, e: float, exposure: float = DEFAULT_EXPOSURE) ->
     for i in range(n):
         total += sum(led_rgb(i, n, e, exposure)) / 255.0 * MA_PER_CHANNEL
     return total + n * MA_IDLE_PER_LED
+
+
+# ---- playback overlay: the highlights from tables --------------------------
+# The functions above are the maths; playback must not run them per LED per
+# frame. HighlightTables samples them once — shimmer profiles at sub-LED
+# offsets and breathe levels, the spark envelope by age, and a white-blend LUT
+# per mix level — so a frame is the base copied with one slice plus a table
+# lookup for each LED a highlight actually touches.
+MIX_LEVELS = 32             # white-blend quantisation; 1/32 steps are invisible
+SHIMMER_SUBSTEPS = 8        # shimmer profiles per LED of band travel
+PHASE_LEVELS = 16           # breathe phases the shimmer swell is sampled at
+ENVELOPE_STEPS = 32         # spark age bins across SPARK_LIFE_S
+MEMO_MAX = 4096             # blended pixels remembered per mix level
+
+
+class HighlightTables:
+    """Precomputed overlay for sparks and shimmer on top of a wash frame."""
+
+    def __init__(self, point=WHITE_POINT, width: int = SHIMMER_WIDTH,
+                 kernel=None, life_s: float = SPARK_LIFE_S):
+        self.width = max(0, int(width))
+        self.life_s = life_s
+        kernel = spark_kernel() if kernel is None else tuple(kernel)
+        self.kernel_half = len(kernel) // 2
+        # blend[level] = per-channel 256-entry LUT: base byte -> blended byte.
+        # The top level lands exactly on the white point whatever the base,
+        # so full-white spans are written as one slice instead.
+        self.blend = []
+        for lvl in range(MIX_LEVELS + 1):
+            m = lvl / MIX_LEVELS
+            self.blend.append(tuple(
+                bytes(int(round(c + (p - c) * m)) for c in range(256)) for p in point))
+        self.white_px = bytes(point[:3]) + b"\x00"
+        # _memo[level] = {base pixel: blended pixel}, both as native uint32
+        self._memo = [{} for _ in range(MIX_LEVELS + 1)]
+        # shimmer[phase][sub] = (core_lo, core_hi, (offset, ...), (level, ...)),
+        # offsets relative to floor(centre); the core is the full-white span
+        self.shimmer = []
+        for ph in range(PHASE_LEVELS + 1):
+            e = ph / PHASE_LEVELS
+            per_sub = []
+            for sub in range(SHIMMER_SUBSTEPS):
+                frac = sub / SHIMMER_SUBSTEPS
+                core = []
+                edge = []
+                for off in range(-self.width, self.width + 2):
+                    lvl = int(round(shimmer_amp(off - frac, e, self.width) * MIX_LEVELS))
+                    if lvl >= MIX_LEVELS:
+                        core.append(off)
+                    elif lvl:
+                        edge.append((off, lvl))
+                lo, hi = (core[0], core[-1] + 1) if core else (0, 0)
+                offs = tuple(off for off, _ in edge)
+                per_sub.append((lo, hi, offs, tuple(lvl for _, lvl in edge)))
+            self.shimmer.append(tuple(per_sub))
+        # spark[age_bin] = (first offset, (level, ...)): one packed run of
+        # consecutive LEDs relative to the spark centre, zero ends trimmed
+        self.spark = []
+        for k in range(ENVELOPE_STEPS):
+            env = spark_envelope((k + 0.5) / ENVELOPE_STEPS * life_s, life_s)
+            row = [int(round(w * SPARK_MIX * env * MIX_LEVELS)) for w in kernel]
+            lit = [off for off, lvl in enumerate(row) if lvl]
+            if lit:
+                row = row[lit[0]:lit[-1] + 1]
+                self.spark.append((lit[0] - self.kernel_half, tuple(row)))
+            else:
+                self.spark.append((0, ()))
+
+    def touched(self, n: int, e: float, elapsed_s: float, sparks=(), now: float = 0.0,
+                shimmer: bool = True):
+        """This frame's highlights as (full-white spans, {LED: mix level}).
+
+        Overlapping partial highlights take the max; a full-white span wins
+        over anything under it. On a strip long enough that the bands cannot
+        meet, a band's edge goes in with one dict update.
+        """
+        spans = []
+        levels = {}
+        if n <= 0:
+            return spans, levels
+        get = levels.get
+        if shimmer and self.width:
+            rows = self.shimmer[int(round(max(0.0, min(1.0, e)) * PHASE_LEVELS))]
+            apart = n >= SHIMMER_COUNT * (2 * self.width + 2)
+            for b in range(SHIMMER_COUNT):
+                c = shimmer_centre(elapsed_s, n, b)
+                base = int(c)
+                lo, hi, offs, lvls = rows[int((c - base) * SHIMMER_SUBSTEPS)]
+                if hi > lo:
+                    start = (base + lo) % n
+                    end = start + min(n, hi - lo)
+                    if end > n:                      # wraps: two slices
+                        spans.append((start, n))
+                        spans.append((0, end - n))
+                    else:
+                        spans.append((start, end))
+                if apart:
+                    levels.update(zip([(base + off) % n for off in offs], lvls))
+                    continue
+                for off, lvl in zip(offs, lvls):
+                    i = (base + off) % n
+                    if lvl > get(i, 0):
+                        levels[i] = lvl
+        for centre, born in sparks:
+            k = int((now - born) / self.life_s * ENVELOPE_STEPS)
+            if not 0 <= k < ENVELOPE_STEPS:
+                continue
+            off, lvls = self.spark[k]
+            start = centre + off
+            stop = min(n, start + len(lvls))
+            if start < 0:
+                lvls = lvls[-start:]
+                start = 0
+            for i, lvl in zip(range(start, stop), lvls):
+                if lvl > get(i, 0):
+                    levels[i] = lvl
+        return spans, levels
+
+    def apply(self, base: bytes, touched) -> bytes:
+        """`base` copied once, only the touched LEDs blended toward white.
+
+        The wash has only a few hundred distinct pixels, so each blended
+        pixel is memoised per mix level: a hit is one 32-bit load and store
+        instead of three LUT round trips.
+        """
+        spans, levels = touched
+        if not spans and not levels:
+            return base
+        buf = bytearray(base)
+        if levels:
+            px = memoryview(buf).cast('I')
+            memo = self._memo
+            blend = self.blend
+            for i, lvl in levels.items():
+                p = px[i]
+                seen = memo[lvl]
+                v = seen.get(p)
+                if v is None:
+                    r, g, b = blend[lvl]
+                    j = i * 4
+                    buf[j] = r[buf[j]]
+                    buf[j + 1] = g[buf[j + 1]]
+                    buf[j + 2] = b[buf[j + 2]]
+                    if len(seen) >= MEMO_MAX:
+                        seen.clear()
+                    seen[p] = px[i]
+                else:
+                    px[i] = v
+            px.release()
+        white = self.white_px
+        for lo, hi in spans:
+            buf[lo * 4:hi * 4] = white * (hi - lo)
+        return bytes(buf)
@@ -14,14 +14,75 @@ Driver contract (measured on ws2812_pio_rp1, 600 LEDs):
     Pacing is the caller's job (see LedController's effect loop).
 
 Brightness scaling uses a 256-byte translation table, so show() stays at C
-speed instead of running a 2400-element generator expression per frame.
+speed instead of running a 2400-element generator expression per frame. With
+setDither(True) that table becomes a small set of ordered-dither tables (see
+dither.py): low duties keep their fraction across frames instead of banding.
 """
 from __future__ import annotations
 
+import errno
 import os
+import time
+import zlib
+from collections import deque
+
+from dither import OrderedDither
 
 DEV_DEFAULT = "/dev/leds0"
 
+BITS_PER_LED = 24        # the wire carries GRB, 24 bit per LED (W is not sent)
+# Write pacing: a frame is held until the previous one has left the wire plus
+# a guard (reset/latch slack). EBUSY despite the model widens the guard; clean
+# frames let it decay back.
+GUARD_MIN_S = 0.0005
+GUARD_MAX_S = 0.005
+GUARD_STEP_S = 0.0005
+
+# Current estimate of what actually went out: WS2812B ~20 mA per channel at
+# full duty plus ~1 mA quiescent per LED (the figures iris_wash budgets with).
+MA_PER_CHANNEL = 0.020
+MA_IDLE_PER_LED = 0.001
+CURRENT_WINDOW = 100     # frames in the rolling average / peak
+DUTY_CACHE_MAX = 128     # payloads remembered by identity (precomputed frames)
+_SUM_CHUNK = 256         # 256 × 255 + 1 < 65521: adler32's low half = exact sum
+
+
+def byte_sum(data) -> int:
+    """Sum of all bytes, at C speed.
+
+    adler32's low half is 1 + Σbytes mod 65521, and a 256-byte chunk cannot
+    reach the modulus — per chunk it IS the sum. ~5× faster than sum(bytes),
+    which boxes every byte into an int.
+    """
+    mv = memoryview(data)
+    total = 0
+    for i in range(0, len(mv), _SUM_CHUNK):
+        total += (zlib.adler32(mv[i:i + _SUM_CHUNK]) & 0xFFFF) - 1
+    return total
+
+
+def payload_duty(payload) -> int:
+    """Summed R+G+B duty of an RGBW payload; W never goes on the wire."""
+    total = byte_sum(payload)
+    w = payload[3::4]
+    if w.count(0) != len(w):
+        total -= byte_sum(w)
+    return total
+
+
+def payload_current_a(payload, gain: int = 255) -> float:
+    """5 V draw of one frame as written, `gain` being the output scale."""
+    n = len(payload) // 4
+    return (payload_duty(payload) * gain / (255.0 * 255.0) * MA_PER_CHANNEL
+            + n * MA_IDLE_PER_LED)
+
+# MultiStrip chain health: a chain dropping more than QUARANTINE_RATE of its
+# last HEALTH_WINDOW frames is parked and re-probed every PROBE_S.
+HEALTH_WINDOW = 50
+HEALTH_MIN = 20
+QUARANTINE_RATE = 0.5
+PROBE_S = 5.0
+
 _IDENTITY = bytes(range(256))
 
 
@@ -50,7 +111,19 @@ class PixelStrip:
         self._begun = False
         self._gamma_bypass = False
         self._luts: dict[int, bytes] = {}
+        self._dither: OrderedDither | None = None
         self._dropped = 0
+        self._collisions = 0           # EBUSY: wrote into an in-flight frame
+        self._errors = 0               # everything else (ENOSPC, ENODEV, ...)
+        self._held = 0                 # frames held back: wire still busy
+        self._bit_s = 1.0 / max(1, int(freq_hz))
+        self._busy_until = 0.0
+        self._guard = GUARD_MIN_S
+        self._duty_cache = {}          # id(payload) -> (payload, duty)
+        self._amps = deque(maxlen=CURRENT_WINDOW)
+        # (duty function or None, payload or duty, scale) of the frame in
+        # _write — summed only once the frame has landed
+        self._frame_src = None
 
     # ---- lifecycle ---------------------------------------------------------
     def begin(self):
@@ -84,6 +157,10 @@ class PixelStrip:
     def getBrightness(self) -> int:
         return self._brightness
 
+    def setDither(self, on: bool):
+        """Temporal dithering of every scale applied on output (off by default)."""
+        self._dither = OrderedDither() if on else None
+
     def setPixelColor(self, n: int, color: int):
         if n < 0 or n >= self._num:
             return
@@ -121,19 +198,73 @@ class PixelStrip:
             self._luts[scale] = lut
         return lut
 
+    def _scale(self, payload: bytes, scale: int) -> bytes:
+        """Apply an output scale — plain LUT, or the dithered tables if enabled."""
+        if self._dither is not None:
+            return self._dither.scale(payload, scale)
+        return payload.translate(self._brightness_lut(scale))
+
+    @property
+    def busy_until(self) -> float:
+        """time.monotonic() at which the last landed frame has left the wire."""
+        return self._busy_until
+
     def _write(self, payload: bytes) -> bool:
-        """One frame = one open. Returns False if the kernel refused the frame."""
+        """One frame = one open. Returns False if the frame did not go out.
+
+        The driver refuses a frame while the previous one is still shifting
+        out (EBUSY). The modelled end of that transfer — LEDs × 24 bit /
+        freq_hz after the last landed write, plus an adaptive guard — is
+        `busy_until`. A frame handed in before it is held back (not written,
+        counted in `held`) rather than waited for: show() may run under the
+        controller's strip lock, so pacing on `busy_until` is the caller's
+        job, outside any lock. A collision anyway widens the guard and drops
+        the frame. Collisions and hard errors are counted separately.
+        """
+        if time.monotonic() < self._busy_until:
+            self.hold()
+            self._frame_src = None
+            return False
+        err = self._write_once(payload)
+        if err is None:
+            self._busy_until = (time.monotonic()
+                                + len(payload) // 4 * BITS_PER_LED * self._bit_s
+                                + self._guard)
+            self._guard = max(GUARD_MIN_S, self._guard * 0.99)
+            src = self._frame_src
+            if src is not None:
+                # duty × output scale of the frame show*() handed us
+                summed, data, scale = src
+                duty = data if summed is None else summed(data)
+                self._amps.append(duty * scale / (255.0 * 255.0) * MA_PER_CHANNEL
+                                  + self._num * MA_IDLE_PER_LED)
+                self._frame_src = None
+            return True
+        if err == errno.EBUSY:
+            self._collisions += 1
+            self._guard = min(GUARD_MAX_S, self._guard + GUARD_STEP_S)
+            self._busy_until = time.monotonic() + self._guard
+        else:
+            self._errors += 1
+        self._frame_src = None
+        self._dropped += 1
+        return False
+
+    def hold(self):
+        """Count one frame held back, unwritten, while the wire is busy."""
+        self._held += 1
+
+    def _write_once(self, payload: bytes):
+        """None on success, else the errno of the failed open/write."""
         try:
             fd = os.open(self._device, os.O_WRONLY)
-        except OSError:
-            self._dropped += 1
-            return False
+        except OSError as e:
+            return e.errno or -1
         try:
             os.write(fd, payload)
-            return True
-        except OSError:
-            self._dropped += 1
-            return False
+            return None
+        except OSError as e:
+            return e.errno or -1
         finally:
             os.close(fd)
 
@@ -145,11 +276,12 @@ class PixelStrip:
             return
         payload = bytes(self._buf)
         scale = self._brightness
+        self._frame_src = (payload_duty, payload, scale)
         if scale < 255:
-            payload = payload.translate(self._brightness_lut(scale))
+            payload = self._scale(payload, scale)
         return self._write(payload)
 
-    def show_payload(self, payload: bytes, gain: int = 255):
+    def show_payload(self, payload: bytes, gain: int = 255, duty: int | None = None):
         """Write a pre-rendered RGBW payload (4 bytes/LED) straight out.
 
         Lets callers precompute whole frames — master brightness and any fade
@@ -160,18 +292,59 @@ class PixelStrip:
         ignores `self._brightness`: payloads come from a gamma-corrected render
         with an exposure chosen against a power budget, and silently folding in
         a second multiplier would invalidate both.
+
+        `duty` is payload_duty(payload) when the caller already summed it
+        (MultiStrip does, once for every chain).
         """
         if not self._begun:
             return
         scale = max(0, min(255, int(gain)))
+        self._frame_src = ((None, duty, scale) if duty is not None
+                           else (self._cached_duty, payload, scale))
         if scale < 255:
-            payload = payload.translate(self._brightness_lut(scale))
-        self._write(payload)
+            payload = self._scale(payload, scale)
+        return self._write(payload)
+
+    def _cached_duty(self, payload) -> int:
+        """payload_duty, remembered per payload object.
+
+        Precomputed frames (wash ramp, cached effect periods) come back as the
+        very same bytes object, so their duty is summed once. The entry keeps
+        the payload alive, which is what makes its id() a safe key.
+        """
+        if not isinstance(payload, bytes):
+            return payload_duty(payload)
+        hit = self._duty_cache.get(id(payload))
+        if hit is not None and hit[0] is payload:
+            return hit[1]
+        duty = payload_duty(payload)
+        if len(self._duty_cache) >= DUTY_CACHE_MAX:
+            self._duty_cache.clear()
+        self._duty_cache[id(payload)] = (payload, duty)
+        return duty
+
+    @property
+    def current_stats(self) -> dict:
+        """Rolling 5 V estimate over the last CURRENT_WINDOW written frames."""
+        amps = self._amps
+        if not amps:
+            return {'avg_a': 0.0, 'peak_a': 0.0}
+        return {'avg_a': round(sum(amps) / len(amps), 2), 'peak_a': round(max(amps), 2)}
 
     @property
     def dropped_frames(self) -> int:
         return self._dropped
 
+    @property
+    def wire_time_s(self) -> float:
+        """Shift-out time of one full frame: LEDs × 24 bit / freq_hz."""
+        return self._num * BITS_PER_LED * self._bit_s
+
+    @property
+    def write_stats(self) -> dict:
+        return {'collisions': self._collisions, 'errors': self._errors,
+                'held': self._held, 'guard_ms': round(self._guard * 1000.0, 2)}
+
 
 class MultiStrip:
     """One logical strip fanned out to N identical PIO devices ("analog").
@@ -186,13 +359,66 @@ class MultiStrip:
     device dropped its frame, so clear() keeps retrying until every chain is
     really black — one chain must never silently keep an image the other lost.
     dropped_frames sums across devices for the status endpoint.
+
+    Chains can join a running group (`add`, hot-plug via the controller's
+    chain supervisor). A chain whose recent drop rate passes QUARANTINE_RATE
+    is quarantined: it gets no frames and does not count against show() —
+    a dying chain must not keep the healthy ones from proving black — and is
+    re-probed with one frame every PROBE_S. The last writing chain is never
+    quarantined.
+
+    With `on_lost` set (the controller's hot-plug supervisor) a quarantined
+    chain is detached instead of parked and handed to `on_lost(strip)`: the
+    supervisor re-resolves its pin — the /dev/ledsN number may have moved —
+    and attaches a freshly built strip through `add`.
     """
 
-    def __init__(self, strips):
+    def __init__(self, strips, on_lost=None):
         if not strips:
             raise ValueError("MultiStrip needs at least one strip")
         self._strips = list(strips)
         self._p = self._strips[0]
+        self._health = [deque(maxlen=HEALTH_WINDOW) for _ in self._strips]
+        self._parked = [None] * len(self._strips)   # None or next probe time
+        self.on_lost = on_lost
+
+    def add(self, strip):
+        """Hot-add a chain: it takes the group's settings and mirrors from the next frame."""
+        strip.setBrightness(self._p.getBrightness())
+        dither = getattr(self._p, '_dither', None)
+        if hasattr(strip, 'setDither'):
+            strip.setDither(dither is not None)
+        # health slots first: show() may be iterating _strips right now
+        self._health.append(deque(maxlen=HEALTH_WINDOW))
+        self._parked.append(None)
+        self._strips.append(strip)
+
+    def remove(self, strip):
+        """Detach a chain. The primary hands its pixel buffer to the next one."""
+        i = self._strips.index(strip)
+        if len(self._strips) < 2:
+            raise ValueError("MultiStrip cannot remove its last chain")
+        if strip is self._p:
+            nxt = self._strips[1] if i == 0 else self._strips[0]
+            buf = getattr(strip, '_buf', None)
+            if buf is not None and len(getattr(nxt, '_buf', b'')) == len(buf):
+                nxt._buf[:] = buf
+            self._p = nxt
+        del self._strips[i], self._health[i], self._parked[i]
+
+    def devices(self):
+        return [getattr(s, '_device', None) for s in self._strips]
+
+    def chain_status(self):
+        out = []
+        for s, h, parked in zip(self._strips, self._health, self._parked):
+            cur = getattr(s, 'current_stats', None) or {}
+            out.append({'device': getattr(s, '_device', None),
+                        'wire_ms': round(getattr(s, 'wire_time_s', 0.0) * 1000.0, 2),
+                        'quarantined': parked is not None,
+                        'drop_rate': round(h.count(False) / len(h), 2) if h else 0.0,
+                        'avg_a': cur.get('avg_a', 0.0), 'peak_a': cur.get('peak_a', 0.0)})
+        return out
 
     # ---- drawing: one buffer, the primary's ----
     def numPixels(self):
@@ -223,27 +449,93 @@ class MultiStrip:
     def getBrightness(self):
         return self._p.getBrightness()
 
+    def setDither(self, on):
+        for s in self._strips:
+            s.setDither(on)
+
     @property
     def dropped_frames(self):
         return sum(getattr(s, "dropped_frames", 0) or 0 for s in self._strips)
 
+    @property
+    def busy_until(self):
+        """The group is free once every chain has shifted out."""
+        return max(getattr(s, 'busy_until', 0.0) for s in self._strips)
+
+    @property
+    def wire_time_s(self):
+        """The group is as fast as its slowest chain (all start together)."""
+        return max(getattr(s, 'wire_time_s', 0.0) for s in self._strips)
+
+    @property
+    def current_stats(self):
+        """Whole group: every chain shows the same frame, so the sums hold."""
+        out = {'avg_a': 0.0, 'peak_a': 0.0}
+        for s in self._strips:
+            st = getattr(s, "current_stats", None) or {}
+            for k in out:
+                out[k] += st.get(k, 0.0)
+        return {k: round(v, 2) for k, v in out.items()}
+
+    @property
+    def write_stats(self):
+        out = {'collisions': 0, 'errors': 0, 'held': 0}
+        for s in self._strips:
+            st = getattr(s, "write_stats", None) or {}
+            for k in out:
+                out[k] += st.get(k, 0)
+        return out
+
     # ---- output ----
     def show(self):
         # Render once (brightness LUT folded in like PioStrip.show), write N x.
         payload = bytes(self._p._buf)
         scale = self._p._brightness
         if scale < 255:
-            payload = payload.translate(self._p._brightness_lut(scale))
-        ok = True
-        for s in self._strips:
-            # show_payload applies gain only — brightness is already folded in.
-            if s.show_payload(payload, 255) is False:
-                ok = False
-        return ok
+            payload = self._p._scale(payload, scale)
+        # show_payload applies gain only — brightness is already folded in.
+        return self._fan_out(payload, 255)
 
     def show_payload(self, payload, gain=255):
+        return self._fan_out(payload, gain)
+
+    def _fan_out(self, payload, gain):
         ok = True
-        for s in self._strips:
-            if s.show_payload(payload, gain) is False:
+        now = time.monotonic()
+        lost = []
+        duty = None
+        for i, s in enumerate(self._strips):
+            if getattr(s, 'busy_until', 0.0) > now:
+                # Still shifting out: held back, not a sign of a sick chain
+                if hasattr(s, 'hold'):
+                    s.hold()
+                ok = False
+                continue
+            if duty is None:
+                # Summed once for all chains — and only if one of them writes
+                duty = getattr(self._p, '_cached_duty', payload_duty)(payload)
+            parked = self._parked[i]
+            if parked is not None:
+                if now >= parked:
+                    # Probe: one frame decides release or another PROBE_S
+                    if s.show_payload(payload, gain, duty) is False:
+                        self._parked[i] = now + PROBE_S
+                    else:
+                        self._parked[i] = None
+                        self._health[i].clear()
+                continue
+            landed = s.show_payload(payload, gain, duty) is not False
+            h = self._health[i]
+            h.append(landed)
+            if not landed:
                 ok = False
+                if (len(h) >= HEALTH_MIN and h.count(False) > QUARANTINE_RATE * len(h)
+                        and self._parked.count(None) - len(lost) > 1):
+                    if self.on_lost is not None:
+                        lost.append(s)
+                    else:
+                        self._parked[i] = now + PROBE_S
+        for s in lost:
+            self.remove(s)
+            self.on_lost(s)
         return ok
@@ -0,0 +1,71 @@
+"""Real-time priority and CPU pinning for the render loop, plus jitter stats.
+
+The effect loop competes with Flask worker threads for the CPU, and its
+priority was left to the OS — an HTTP burst shows up as a late frame.
+`led_config.realtime` (`{"cpu": 3, "priority": 50}`) pins the render task to
+one core (ideally one isolated with `isolcpus=3` on the kernel command line)
+and runs it under `SCHED_FIFO`. On Linux every thread is its own task, so
+both calls take the render thread's native id and leave Flask alone.
+
+Raising the priority needs root or `CAP_SYS_NICE`. A refusal is reported,
+never fatal: the loop runs on as before.
+
+`JitterMeter` collects how late the loop woke up against its deadline —
+the number to watch when deciding whether any of this is needed.
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+
+WINDOW = 256      # wake-ups in the jitter window
+
+
+def apply_realtime(cpu=None, priority=None, tid=0) -> dict:
+    """Pin task `tid` (0 = caller) to `cpu` and/or run it SCHED_FIFO.
+
+    Returns what was applied: `{'cpu': …, 'priority': …, 'errors': [...]}`.
+    """
+    applied = {'cpu': None, 'priority': None, 'errors': []}
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(tid, {int(cpu)})
+            applied['cpu'] = int(cpu)
+        except (AttributeError, OSError, ValueError) as e:
+            applied['errors'].append(f"affinity: {e}")
+    if priority is not None:
+        try:
+            lo = os.sched_get_priority_min(os.SCHED_FIFO)
+            hi = os.sched_get_priority_max(os.SCHED_FIFO)
+            prio = max(lo, min(hi, int(priority)))
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(prio))
+            applied['priority'] = prio
+        except (AttributeError, OSError, ValueError) as e:
+            applied['errors'].append(f"SCHED_FIFO: {e}")
+    return applied
+
+
+class JitterMeter:
+    """Rolling window of wake-up lateness (seconds past the deadline)."""
+
+    def __init__(self, window: int = WINDOW):
+        self._late = deque(maxlen=max(1, int(window)))
+        self.worst = 0.0
+
+    def record(self, late_s: float):
+        late = max(0.0, float(late_s))
+        self._late.append(late)
+        if late > self.worst:
+            self.worst = late
+
+    def percentile(self, q: float) -> float:
+        if not self._late:
+            return 0.0
+        ordered = sorted(self._late)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def status(self) -> dict:
+        return {'p50_ms': round(self.percentile(0.5) * 1000.0, 2),
+                'p99_ms': round(self.percentile(0.99) * 1000.0, 2),
+                'max_ms': round(self.worst * 1000.0, 2),
+                'samples': len(self._late)}
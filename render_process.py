@@ -0,0 +1,263 @@
+"""Renderer in its own process, fed through shared memory.
+
+Flask handlers mutate the controller directly while the effect thread reads
+it, and both share one GIL: a burst of JSON requests is pixel math that does
+not happen. With `led_config.render_process` the strip is owned by a forked
+renderer process. The API process keeps validation and the response; each
+POST becomes one compact typed command (`COMMANDS`: op code plus fixed
+fields) that the renderer applies to its own controller — the route body
+runs once, in the process that owns the strip.
+
+Two named `multiprocessing.shared_memory` blocks carry the traffic:
+
+* `CommandRing` — API → renderer. A single-producer/single-consumer byte
+  ring of `[length][seq][payload]` records. Head, tail and the last pushed
+  and popped sequence numbers live in the block header; the consumer only
+  accepts the record numbered `done + 1`, so a record whose bytes are not
+  fully visible yet is simply picked up on the next poll. A full ring drops
+  the command (and counts it) instead of blocking an HTTP thread.
+* `StateBlock` — renderer → API. A seqlock around one JSON status snapshot
+  (odd sequence = write in progress), published a few times per second; it
+  doubles as the renderer's heartbeat.
+
+Both blocks outlive their creator on purpose: a crashed or restarting API
+worker re-attaches to a renderer that never stopped painting.
+"""
+from __future__ import annotations
+
+import json
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+RING_BYTES = 64 << 10
+STATE_BYTES = 16 << 10
+POLL_S = 0.002        # renderer: command poll interval
+PUBLISH_S = 0.25      # renderer: status snapshot interval
+STALE_S = 2.0         # snapshot older than this = renderer gone
+
+_RING_HDR = struct.Struct('<QQQQ')    # head, tail, pushed seq, popped seq
+_U64 = struct.Struct('<Q')            # each header field has one writer
+_REC = struct.Struct('<IQ')           # payload length, seq
+_WRAP = 0xFFFFFFFF
+_STATE_HDR = struct.Struct('<QI')     # seqlock, payload length
+
+
+def block_names(tag) -> tuple[str, str]:
+    """Shared-memory names (command ring, state block) for one strip."""
+    return f"lichtwerk_{tag}_cmd", f"lichtwerk_{tag}_state"
+
+
+def _attach(name, size):
+    """Attach to `name`, creating it (zeroed) if it does not exist yet.
+
+    The resource tracker would unlink the block when its creator exits —
+    exactly what must not happen when the API worker dies under a renderer.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+        created = False
+    except FileNotFoundError:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        created = True
+    try:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+    return shm, created
+
+
+def _close(shm, unlink):
+    shm.close()
+    if unlink:
+        # unlink() unregisters from the tracker; _attach already did that
+        resource_tracker.register(shm._name, 'shared_memory')
+        shm.unlink()
+
+
+class CommandRing:
+    def __init__(self, name, size: int = RING_BYTES):
+        self.shm, _ = _attach(name, size)
+        self.buf = self.shm.buf
+        self.cap = self.shm.size - _RING_HDR.size
+        self.dropped = 0
+
+    def _header(self):
+        return list(_RING_HDR.unpack_from(self.buf, 0))
+
+    def push(self, payload: bytes):
+        """Append one record; returns its seq, or None if the ring is full."""
+        head, tail, seq, _ = self._header()
+        need = _REC.size + len(payload)
+        pos = head % self.cap
+        pad = self.cap - pos if self.cap - pos < need else 0
+        if need + pad > self.cap - (head - tail):
+            self.dropped += 1
+            return None
+        if pad:
+            if pad >= 4:
+                struct.pack_into('<I', self.buf, _RING_HDR.size + pos, _WRAP)
+            head += pad
+            pos = 0
+        seq += 1
+        at = _RING_HDR.size + pos
+        _REC.pack_into(self.buf, at, len(payload), seq)
+        self.buf[at + _REC.size:at + need] = payload
+        # Record first, head last: the consumer never reads past `head`.
+        # Producer fields only — tail/popped seq belong to the consumer.
+        _U64.pack_into(self.buf, 16, seq)
+        _U64.pack_into(self.buf, 0, head + need)
+        return seq
+
+    def pop_all(self) -> list:
+        """Every complete record in order, as (seq, payload)."""
+        out = []
+        head, tail, _, done = self._header()
+        while tail < head:
+            pos = tail % self.cap
+            left = self.cap - pos
+            if left < 4 or struct.unpack_from('<I', self.buf, _RING_HDR.size + pos)[0] == _WRAP:
+                tail += left
+                continue
+            if left < _REC.size:
+                tail += left
+                continue
+            size, seq = _REC.unpack_from(self.buf, _RING_HDR.size + pos)
+            if seq != done + 1:
+                break       # not fully visible yet: next poll
+            at = _RING_HDR.size + pos + _REC.size
+            out.append((seq, bytes(self.buf[at:at + size])))
+            tail += _REC.size + size
+            done = seq
+        _U64.pack_into(self.buf, 24, done)
+        _U64.pack_into(self.buf, 8, tail)
+        return out
+
+    def pending(self) -> int:
+        head, tail, _, _ = self._header()
+        return head - tail
+
+    def close(self, unlink=False):
+        self.buf = None
+        _close(self.shm, unlink)
+
+
+class StateBlock:
+    def __init__(self, name, size: int = STATE_BYTES):
+        self.shm, self.created = _attach(name, size)
+        self.buf = self.shm.buf
+
+    def publish(self, payload: bytes) -> bool:
+        limit = self.shm.size - _STATE_HDR.size
+        if len(payload) > limit:
+            return False
+        seq = _STATE_HDR.unpack_from(self.buf, 0)[0]
+        _STATE_HDR.pack_into(self.buf, 0, seq + 1, 0)               # odd: writing
+        self.buf[_STATE_HDR.size:_STATE_HDR.size + len(payload)] = payload
+        _STATE_HDR.pack_into(self.buf, 0, seq + 2, len(payload))    # even: done
+        return True
+
+    def read(self, attempts: int = 4):
+        """The last published payload, or None (never published / torn)."""
+        for _ in range(attempts):
+            seq, size = _STATE_HDR.unpack_from(self.buf, 0)
+            if seq == 0:
+                return None
+            if seq & 1:
+                continue
+            payload = bytes(self.buf[_STATE_HDR.size:_STATE_HDR.size + size])
+            if _STATE_HDR.unpack_from(self.buf, 0)[0] == seq:
+                return payload
+        return None
+
+    def close(self, unlink=False):
+        self.buf = None
+        _close(self.shm, unlink)
+
+
+# op -> field kinds, in wire order; the op code is the position + 1.
+# '?' bool, 'B' 0-255, 'h' int16 (-1 = unset), 'd' float, 's' short str
+COMMANDS = (
+    ('power', '??'),              # power, clear_warn_mode
+    ('warn_gate', '?'),           # over
+    ('warn_kick', 'dd'),          # strength, bpm (0 = none)
+    ('warn_event', 'sdB'),        # kind, gap_s, n
+    ('warn_mode', '?'),           # on
+    ('brightness', 'B'),
+    ('speed', 'B'),
+    ('effect', 's'),
+    ('color', 'BBB'),
+    ('solid', '?BBBB'),           # power, r, g, b, brightness
+    ('theater_mode', '?'),        # rainbow
+    ('overlay', 'ss?BBB'),        # effect ('' = off), mode, has colour, r, g, b
+    ('zone_effect', 'ss'),        # zone, effect
+    ('zone_color', 'sBBB'),
+    ('zone_speed', 'sB'),
+    ('zone_brightness', 'sh'),    # zone, brightness (-1 = master)
+)
+_OP_CODE = {op: (code, kinds) for code, (op, kinds) in enumerate(COMMANDS, 1)}
+_FIELD = {k: struct.Struct('<' + k) for k in '?Bhd'}
+
+
+def encode_command(op: str, *fields) -> bytes:
+    """One command record: op code byte, then each field packed by kind."""
+    code, kinds = _OP_CODE[op]
+    if len(fields) != len(kinds):
+        raise ValueError(f"{op} takes {len(kinds)} fields, got {len(fields)}")
+    out = bytearray((code,))
+    for kind, value in zip(kinds, fields):
+        if kind == 's':
+            raw = value.encode()
+            if len(raw) > 255:
+                raise ValueError(f"{op}: string field too long")
+            out.append(len(raw))
+            out += raw
+        else:
+            out += _FIELD[kind].pack(value)
+    return bytes(out)
+
+
+def decode_command(payload: bytes) -> tuple[str, tuple]:
+    """(op, fields) of one record; ValueError on an unknown op code."""
+    code = payload[0]
+    if not 1 <= code <= len(COMMANDS):
+        raise ValueError(f"unknown command op {code}")
+    op, kinds = COMMANDS[code - 1]
+    fields = []
+    at = 1
+    for kind in kinds:
+        if kind == 's':
+            size = payload[at]
+            fields.append(payload[at + 1:at + 1 + size].decode())
+            at += 1 + size
+        else:
+            fields.append(_FIELD[kind].unpack_from(payload, at)[0])
+            at += _FIELD[kind].size
+    return op, tuple(fields)
+
+
+class RenderClient:
+    """API-process end: send commands, read the renderer's snapshot."""
+
+    def __init__(self, ring: CommandRing, state: StateBlock, pid: int):
+        self.ring = ring
+        self.state = state
+        self.pid = pid
+        self._lock = threading.Lock()     # one producer: serialise HTTP threads
+
+    def send(self, op: str, *fields):
+        payload = encode_command(op, *fields)
+        with self._lock:
+            return self.ring.push(payload)
+
+    def snapshot(self, now=None):
+        """The renderer's last status dict, or None when it is stale/absent."""
+        raw = self.state.read()
+        if raw is None:
+            return None
+        snap = json.loads(raw.decode())
+        now = time.monotonic() if now is None else now
+        if now - snap.get('published', 0.0) > STALE_S:
+            return None
+        return snap
@@ -0,0 +1,118 @@
+"""Sparkle particles as one level byte per LED (no dicts, no particle loop).
+
+The original kept a list of `{'index', 'brightness'}` dicts, multiplied each
+by 0.9, rebuilt the list with a comprehension every frame and rolled
+`random.random()` once per spawn slot. Cost grew with every live particle
+and every slot, and the allocator churned through dicts.
+
+Every particle starts at full level and fades by the same factor per frame,
+so a particle is fully described by the level of its LED. The pool is that
+level plane:
+
+* the **fade** of the whole pool is one `translate` of the plane through a
+  per-level LUT; the LUT also drops everything below LEVEL_MIN to 0, which
+  is the retire — dead LEDs sit at 0 and stay there;
+* **spawn** writes 255 at the new positions — the newest particle on an LED
+  wins, as before;
+* a frame's spawns come from **one** `getrandbits` draw: the first word
+  picks how many slots fired (inverse binomial CDF, cached per density and
+  probability), the following words pick their positions;
+* **render** turns levels into colour with three `translate`s (one per
+  channel) written into the payload as strided slices.
+
+Per-frame cost is a handful of C-speed byte passes over the strip plus one
+write per spawn — independent of how many particles are alive. Only the
+strip length enters, and only through those C passes.
+"""
+from __future__ import annotations
+
+import math
+import random
+from bisect import bisect_right
+
+FADE = 0.9
+LEVEL_FADE = bytes(int(level * FADE) for level in range(256))
+LEVEL_MIN = 3          # ≈ the old 0.01 brightness cut-off on a 0..255 scale
+# Fade and retire in one table: below LEVEL_MIN a particle is gone
+PLANE_FADE = bytes(v if v >= LEVEL_MIN else 0 for v in LEVEL_FADE)
+WORD = 32
+
+
+def _life(start: int = 255) -> int:
+    """Frames until a fresh particle drops below LEVEL_MIN."""
+    level, frames = start, 0
+    while level >= LEVEL_MIN:
+        level = LEVEL_FADE[level]
+        frames += 1
+    return frames
+
+
+LIFE = _life()
+
+
+def level_luts(rgb) -> tuple:
+    """Per-channel level → byte tables for one colour (the draw LUTs)."""
+    return tuple(bytes(c * lv // 255 for lv in range(256))
+                 for c in (max(0, min(255, int(c))) for c in rgb[:3]))
+
+
+class SparklePool:
+    """Particle levels by LED: 0 = dark, 255 = born this frame."""
+
+    def __init__(self, n: int, slots: int, rng=None):
+        self.n = max(1, int(n))
+        self.slots = max(1, int(slots))
+        self.plane = bytearray(self.n)
+        self._out = bytearray(self.n * 4)
+        self._rng = rng or random
+        self._cdf_key = None
+        self._cdf = ()
+
+    @property
+    def count(self) -> int:
+        """Live particles (LEDs above 0) — one C-speed count."""
+        return self.n - self.plane.count(0)
+
+    def _spawn_cdf(self, p: float):
+        """Cumulative binomial(slots, p) as WORD-bit thresholds, cached."""
+        key = (self.slots, p)
+        if key != self._cdf_key:
+            top = 1 << WORD
+            acc, cdf = 0.0, []
+            for k in range(self.slots + 1):
+                acc += math.comb(self.slots, k) * p ** k * (1.0 - p) ** (self.slots - k)
+                cdf.append(min(top, int(acc * top)))
+            self._cdf_key, self._cdf = key, tuple(cdf)
+        return self._cdf
+
+    def spawn(self, p: float) -> int:
+        """Fire each of `slots` with probability p — one RNG draw in total."""
+        p = max(0.0, min(1.0, p))
+        if p <= 0.0:
+            return 0
+        cdf = self._spawn_cdf(p)
+        mask = (1 << WORD) - 1
+        bits = self._rng.getrandbits(WORD * (self.slots + 1))
+        k = min(self.slots, bisect_right(cdf, bits & mask))
+        plane, n = self.plane, self.n
+        for _ in range(k):
+            bits >>= WORD
+            plane[(bits & mask) % n] = 255
+        return k
+
+    def step(self, p: float):
+        """One frame: fade (and retire) everything, spawn new ones."""
+        self.plane[:] = self.plane.translate(PLANE_FADE)
+        self.spawn(p)
+
+    def render(self, luts) -> bytes:
+        """RGBW payload: three channel translates, white stays 0."""
+        out, plane = self._out, self.plane
+        out[0::4] = plane.translate(luts[0])
+        out[1::4] = plane.translate(luts[1])
+        out[2::4] = plane.translate(luts[2])
+        return bytes(out)
+
+    def render_into(self, layer, luts):
+        """Draw into a compositor layer — trimmed to the lit extent."""
+        layer.fill(self.render(luts))
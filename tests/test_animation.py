@@ -0,0 +1,93 @@
+"""animation — effect state as a function of elapsed time, not of calls."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import animation  # noqa: E402
+
+
+def test_clock_counts_nominal_frames():
+    c = animation.Clock(now=0.0)
+    c.advance(50, now=0.0)
+    c.advance(50, now=0.51)                  # 51 ms per frame at speed 50
+    assert c.ticks == pytest.approx(10.0)
+    assert c.sweep == pytest.approx(500.0)
+
+
+def test_speed_change_never_jumps_the_phase():
+    c = animation.Clock(now=0.0)
+    c.advance(50, now=0.0)
+    c.advance(50, now=1.0)
+    before = animation.sinelon_position(c.sweep, 600)
+    c.advance(90, now=1.0)                   # slider moves, no time passes
+    assert animation.sinelon_position(c.sweep, 600) == before
+    c.advance(90, now=1.011)                 # one frame at the new rate
+    assert c.sweep - c.sweep_at(c.ticks - 1) == pytest.approx(90)
+
+
+def test_levels_are_the_old_triangles():
+    # pulse: +speed/1000 per frame from 0.1 up to 1.0 and back
+    assert animation.pulse_level(0) == pytest.approx(0.1)
+    assert animation.pulse_level(900) == pytest.approx(1.0)
+    assert animation.pulse_level(1350) == pytest.approx(0.55)
+    assert animation.pulse_level(1800) == pytest.approx(0.1)
+    # breathe: half the rate, floor 0.05
+    assert animation.breathe_level(0) == pytest.approx(0.05)
+    assert animation.breathe_level(1900) == pytest.approx(1.0)
+
+
+def _loop_trail(n, lut, paint, frames):
+    plane = bytearray(n * 4)
+    for k in range(frames):
+        plane[:] = plane.translate(lut)
+        paint(plane, k)
+    return plane
+
+
+def _dot(plane, k):
+    j = (k * 3 % (len(plane) // 4)) * 4
+    plane[j:j + 3] = b"\xff\x80\x10"
+
+
+def test_trail_equals_the_per_frame_loop_at_any_sampling():
+    lut = bytes(int(v * 0.9) for v in range(256))
+    expected = _loop_trail(20, lut, _dot, 120)
+    for stride in (1, 7, 50, 119):
+        t = animation.Trail(20, lut, _dot)
+        for tick in range(0, 120, stride):
+            t.render(tick)
+        assert t.render(119) == expected
+
+
+def test_trail_rebuilds_when_time_runs_backwards():
+    lut = bytes(int(v * 0.9) for v in range(256))
+    t = animation.Trail(20, lut, _dot)
+    t.render(80)
+    assert t.render(30) == _loop_trail(20, lut, _dot, 31)
+
+
+def test_wire_time_is_the_documented_floor():
+    assert animation.wire_time_s(600) == pytest.approx(0.018)
+    assert animation.wire_time_s(0) == 0
+
+
+def test_target_fps_follows_motion_and_respects_the_wire():
+    ceiling = 1 / 0.018
+    assert animation.target_fps('solid', 50, 600) == animation.KEEPALIVE_FPS
+    # slow ambient effects settle at the smooth-motion floor
+    assert animation.target_fps('breathe', 10, 600) == animation.MIN_FPS
+    assert animation.target_fps('gradient', 20, 600) == animation.MIN_FPS
+    # fast ones stop at the shift-out ceiling instead of 100 Hz
+    assert animation.target_fps('pulse', 100, 600) == pytest.approx(ceiling)
+    assert animation.target_fps('chase', 100, 600) == pytest.approx(ceiling)
+    # per-call effects keep their nominal rate, or their speed would change
+    assert animation.target_fps('rainbow', 50, 600) == pytest.approx(1 / 0.051)
+    assert animation.target_fps('rainbow', 1, 600) == pytest.approx(10.0)
@@ -0,0 +1,87 @@
+"""chain_supervisor.ChainSupervisor — backoff retries and hot attach."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from chain_supervisor import ChainSupervisor  # noqa: E402
+
+
+def _sup(tmp_path, devices, build=None, **kw):
+    attached = []
+
+    def resolve(pin):
+        return devices.get(pin)
+
+    def default_build(chain, dev):
+        return ('strip', chain['pin'], dev)
+
+    sup = ChainSupervisor([{'pin': 18, 'led_count': 300}], resolve,
+                          build or default_build, attached.append, **kw)
+    return sup, attached
+
+
+def test_missing_chain_backs_off_exponentially(tmp_path):
+    sup, attached = _sup(tmp_path, {}, backoff_s=1.0, max_backoff_s=4.0)
+    waits = []
+    now = 0.0
+    for _ in range(5):
+        sup.poll(now=now)
+        waits.append(sup.pending[0]['due'] - now)
+        now = sup.pending[0]['due']
+    assert waits == [1.0, 2.0, 4.0, 4.0, 4.0]
+    assert sup.sleep_hint(now=now - 1.0) == 1.0
+    assert attached == []
+
+
+def test_device_that_appears_is_attached_once(tmp_path):
+    dev = tmp_path / "leds1"
+    devices = {}
+    sup, attached = _sup(tmp_path, devices)
+    assert sup.poll(now=0.0) == []
+    dev.write_bytes(b"")
+    devices[18] = str(dev)
+    assert sup.poll(now=0.5) == [], "not due yet"
+    assert sup.poll(now=1.0) == [str(dev)]
+    assert attached == [('strip', 18, str(dev))]
+    assert sup.pending == [] and sup.status() == {
+        'missing': [], 'recovered': [{'pin': 18, 'device': str(dev)}]}
+    assert sup.poll(now=100.0) == []
+
+
+def test_claimed_or_failing_devices_are_not_attached(tmp_path):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    sup, attached = _sup(tmp_path, {18: str(dev)}, claimed={str(dev)})
+    sup.poll(now=0.0)
+    assert attached == [] and sup.status()['missing'] == [18]
+
+    def broken(chain, d):
+        raise OSError("EBUSY")
+
+    sup, attached = _sup(tmp_path, {18: str(dev)}, build=broken)
+    sup.poll(now=0.0)
+    assert attached == [] and sup.pending[0]['due'] == 1.0
+
+
+def test_chain_lost_at_runtime_is_reresolved_and_reattached(tmp_path):
+    old, new = tmp_path / "leds1", tmp_path / "leds0"
+    new.write_bytes(b"")
+    devices = {18: str(old)}
+    sup, attached = _sup(tmp_path, devices, backoff_s=1.0, max_backoff_s=4.0)
+    sup.pending.clear()                       # chain was up at boot
+    sup.claimed.add(str(old))
+    sup.readd({'pin': 18, 'led_count': 300}, str(old), now=10.0)
+    assert sup.wake.is_set() and str(old) not in sup.claimed
+    assert sup.status()['missing'] == [18]
+    assert sup.poll(now=10.5) == [], "lost chains back off before the rebuild"
+    devices[18] = str(new)                    # overlays renumbered meanwhile
+    assert sup.poll(now=11.0) == [str(new)]
+    assert attached == [('strip', 18, str(new))]
+    sup.readd({'pin': 18}, str(new), now=20.0)
+    assert sup.pending[0]['due'] == 22.0, "a relapsing chain waits longer"
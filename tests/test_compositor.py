@@ -0,0 +1,69 @@
+"""compositor — blend tables, dirty spans, one-pass composite."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import compositor  # noqa: E402
+
+A = bytes([0, 100, 200, 255])
+B = bytes([255, 100, 100, 0])
+
+
+def test_blend_modes_are_the_textbook_formulas():
+    assert compositor.blend('replace', A, B) == B
+    assert compositor.blend('add', A, B) == bytes([255, 200, 255, 255])
+    assert compositor.blend('screen', A, B) == bytes(
+        255 - (255 - a) * (255 - b) // 255 for a, b in zip(A, B))
+    assert compositor.blend('multiply', A, B) == bytes(a * b // 255 for a, b in zip(A, B))
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        compositor.Layer(4, 'dodge')
+
+
+def test_sparse_layer_only_touches_its_leds():
+    comp = compositor.Compositor(6)
+    layer = comp.layer('dots', 'replace')
+    layer.put(1, bytes([9, 9, 9, 0]))
+    layer.put(4, bytes([7, 7, 7, 0]))
+    layer.put(1, bytes([8, 8, 8, 0]))           # same LED twice: blended once
+    assert layer.spans() == [[1, 2], [4, 5]]
+    base = bytes([1, 2, 3, 0]) * 6
+    out = comp.composite(base)
+    assert out[4:8] == bytes([8, 8, 8, 0]) and out[16:20] == bytes([7, 7, 7, 0])
+    assert out[:4] == base[:4] and out[8:16] == base[8:16]
+
+
+def test_add_never_double_counts_overlapping_spans():
+    comp = compositor.Compositor(4)
+    layer = comp.layer('l', 'add')
+    layer.write(0, bytes([10, 0, 0, 0]) * 3)
+    layer.write(1, bytes([10, 0, 0, 0]) * 3)
+    assert layer.spans() == [[0, 4]]
+    assert comp.composite(bytes(16))[::4] == bytes([10, 10, 10, 10])
+
+
+def test_reset_blanks_only_what_was_drawn_and_fill_trims():
+    layer = compositor.Layer(5)
+    layer.fill(bytes(4) + bytes([1, 2, 3, 0]) * 2 + bytes(8))
+    assert layer.spans() == [[1, 3]]
+    layer.reset()
+    assert layer.spans() == [] and not any(layer.plane)
+    layer.fill(bytes(20))
+    assert layer.spans() == []
+
+
+def test_layers_stack_in_creation_order():
+    comp = compositor.Compositor(1)
+    comp.layer('a', 'replace').put(0, bytes([200, 200, 200, 0]))
+    comp.layer('b', 'multiply').put(0, bytes([128, 255, 0, 0]))
+    assert comp.composite()[:3] == bytes([200 * 128 // 255, 200, 0])
@@ -0,0 +1,88 @@
+"""Temporal dithering in the output stage — no hardware needed."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import dither  # noqa: E402
+from pio_strip import Color, PixelStrip  # noqa: E402
+
+
+def _cycle_mean(d, payload, scale, idx):
+    return sum(d.scale(payload, scale)[idx] for _ in range(dither.PHASES)) / dither.PHASES
+
+
+def test_cycle_averages_to_the_exact_product():
+    """G ≈ 6 after the LUT: the fraction must survive as a time average."""
+    d = dither.OrderedDither()
+    payload = bytes([255, 16, 7, 0]) * 8
+    for idx, v in enumerate(payload[:4]):
+        exact = v * 100 / 255
+        assert _cycle_mean(d, payload, 100, idx) == pytest.approx(exact, abs=0.5 / dither.PHASES + 1e-9)
+
+
+def test_full_and_zero_scale_are_exact():
+    d = dither.OrderedDither()
+    payload = bytes(range(0, 256, 8)) * 4
+    assert d.scale(payload, 255) == payload
+    assert d.scale(payload, 0) == bytes(len(payload))
+
+
+def test_integer_products_never_dither():
+    """A value that scales to an integer must be identical on every frame."""
+    d = dither.OrderedDither()
+    payload = bytes([255, 0, 51, 0]) * 4          # 255·51/255 = 51, 51·... exact
+    frames = {d.scale(payload, 255)[0] for _ in range(8)}
+    assert frames == {255}
+    frames = {d.scale(payload, 51)[0] for _ in range(8)}
+    assert frames == {51}
+
+
+def test_neighbouring_leds_run_different_phases():
+    """The strip must never flicker as a whole — phases stagger per LED."""
+    d = dither.OrderedDither()
+    payload = bytes([16, 0, 0, 0]) * dither.PHASES
+    out = d.scale(payload, 100)
+    reds = [out[i * 4] for i in range(dither.PHASES)]
+    assert len(set(reds)) > 1
+
+
+def _fake_dev(monkeypatch):
+    writes = []
+    monkeypatch.setattr("os.open", lambda path, flags: 11)
+    monkeypatch.setattr("os.write", lambda fd, data: writes.append(bytes(data)) or len(data))
+    monkeypatch.setattr("os.close", lambda fd: None)
+    clock = [0.0]                       # 100 ms per read: the wire is always free
+
+    def tick():
+        clock[0] += 0.1
+        return clock[0]
+    monkeypatch.setattr("pio_strip.time.monotonic", tick)
+    return writes
+
+
+def test_driver_dithers_only_when_enabled(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    writes = _fake_dev(monkeypatch)
+    s = PixelStrip(4, brightness=100, device=str(dev))
+    s.begin()
+    s.fill(Color(255, 16, 0))
+    for _ in range(4):
+        s.show()
+    assert {w[1] for w in writes[1:]} == {16 * 100 // 255}, "off = the plain LUT"
+
+    s.setDither(True)
+    del writes[:]
+    for _ in range(dither.PHASES):
+        s.show()
+    greens = [w[1] for w in writes]
+    assert len(set(greens)) > 1
+    assert sum(greens) / len(greens) == pytest.approx(16 * 100 / 255, abs=0.2)
@@ -0,0 +1,65 @@
+"""easing — cubic-bezier solve, sampled tables, CSS parsing."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import easing  # noqa: E402
+
+
+def _bisect(x, bezier):
+    """Reference: plain bisection on x(t), as iris_wash used to do."""
+    x1, y1, x2, y2 = bezier
+    lo, hi = 0.0, 1.0
+    for _ in range(60):
+        t = (lo + hi) / 2.0
+        u = 1.0 - t
+        if 3 * u * u * t * x1 + 3 * u * t * t * x2 + t ** 3 < x:
+            lo = t
+        else:
+            hi = t
+    t = (lo + hi) / 2.0
+    u = 1.0 - t
+    return 3 * u * u * t * y1 + 3 * u * t * t * y2 + t ** 3
+
+
+@pytest.mark.parametrize("bezier", list(easing.NAMED.values())
+                         + [(0.2, 0.0, 0.0, 1.0), (0.9, 0.1, 0.1, 0.9)])
+def test_solve_matches_bisection(bezier):
+    for i in range(101):
+        x = i / 100
+        assert easing.solve(x, bezier) == pytest.approx(_bisect(x, bezier), abs=1e-6)
+
+
+def test_flat_slope_falls_back_to_bisection():
+    # x1 = x2 = 0 starts with zero slope: Newton alone would divide by ~0
+    bezier = (0.0, 0.5, 0.0, 0.5)
+    assert easing.solve(1e-4, bezier) == pytest.approx(_bisect(1e-4, bezier), abs=1e-6)
+
+
+def test_table_interpolates_close_to_the_exact_curve():
+    t = easing.Easing((0.2, 0.0, 0.0, 1.0))
+    for i in range(997):
+        x = i / 996
+        assert t(x) == pytest.approx(easing.solve(x, t.bezier), abs=2e-4)
+    assert t(-1.0) == 0.0 and t(2.0) == 1.0
+
+
+def test_tables_are_shared_per_curve():
+    assert easing.table('ease-in-out') is easing.table((0.42, 0, 0.58, 1))
+    assert easing.table('ease') is not easing.table('ease', samples=64)
+
+
+def test_parse_accepts_css_forms_and_rejects_nonsense():
+    assert easing.parse('cubic-bezier(.2, 0, 0, 1)') == (0.2, 0.0, 0.0, 1.0)
+    assert easing.parse(' Ease-Out ') == easing.NAMED['ease-out']
+    for bad in ('bounce', 'cubic-bezier(1,2,3)', (1.5, 0, 0, 1)):
+        with pytest.raises(ValueError):
+            easing.parse(bad)
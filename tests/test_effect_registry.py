@@ -0,0 +1,227 @@
+"""effect_registry — plugin classes, discovery, runners, reset hooks."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import animation  # noqa: E402
+import effect_registry  # noqa: E402
+from effect_plugins import rainbow  # noqa: E402
+from effect_registry import Effect, Param, Registry, Runner  # noqa: E402
+
+
+class Fill(Effect):
+    """Test plugin: the declared colour, level stepping with `t`."""
+
+    __slots__ = ('color', 'speed', 'frames', 'inits')
+    name = 'fill'
+    params = (Param('color', (1, 2, 3)), Param('speed', 50, 1, 100))
+
+    def __init__(self):
+        super().__init__()
+        self.frames = 0
+        self.inits = 0
+
+    def init(self, n):
+        super().init(n)
+        self.inits += 1
+
+    def render(self, t, buf):
+        self.frames += 1
+        buf[:] = bytes(tuple(self.color[:3]) + (0,)) * self.n
+
+
+class Strip:
+    def __init__(self, n):
+        self.n = n
+
+    def numPixels(self):
+        return self.n
+
+
+class Host:
+    """Controller stand-in: strip, clock, speed and the plane writer."""
+
+    def __init__(self, n=5):
+        self.strip = Strip(n)
+        self.anim_clock = animation.Clock(now=0.0)
+        self.speed = 50
+        self.planes = []
+
+    def _show_plane(self, plane):
+        self.planes.append(bytes(plane))
+        self.last = plane
+
+
+def test_register_validates_the_class():
+    reg = Registry()
+    assert reg.register(Fill) is Fill
+    assert reg.register(Fill) is Fill, "re-registering the same class is harmless"
+    with pytest.raises(TypeError):
+        reg.register(object)
+
+    class Nameless(Fill):
+        __slots__ = ()
+        name = None
+
+    with pytest.raises(ValueError):
+        reg.register(Nameless)
+
+    class Other(Fill):
+        __slots__ = ()
+
+    with pytest.raises(ValueError):
+        reg.register(Other)
+
+    class Unfinished(Effect):
+        __slots__ = ()
+        name = 'unfinished'
+
+    with pytest.raises(TypeError):
+        reg.register(Unfinished)
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+def test_effect_state_is_slotted():
+    e = rainbow.Rainbow()
+    with pytest.raises(AttributeError):
+        e.anything = 1
+    assert e.n == -1
+
+
+def test_runner_sizes_copies_params_and_writes_a_plane():
+    host = Host(5)
+    host.color = [9, 8, 7]
+    host.speed = 500                               # clamped to the declared hi
+    run = Runner(Fill, host)
+    run()
+    run()
+    assert run.effect.inits == 1 and run.effect.frames == 2
+    assert run.effect.clock is host.anim_clock
+    assert run.effect.speed == 100
+    assert host.planes[-1] == bytes((9, 8, 7, 0)) * 5
+    host.strip.n = 3                               # resize: init again
+    run()
+    assert run.effect.inits == 2 and host.planes[-1] == bytes((9, 8, 7, 0)) * 3
+
+
+def test_params_are_pushed_on_change_not_read_per_frame():
+    host = Host(2)
+    host.color = [9, 8, 7]
+    run = Runner(Fill, host)
+    run()
+    host.color = [1, 1, 1]
+    run()
+    assert host.planes[-1] == bytes((9, 8, 7, 0)) * 2, "no per-frame copy"
+    run.sync()
+    run()
+    assert host.planes[-1] == bytes((1, 1, 1, 0)) * 2
+    assert host.last is run.buf, "the plane is handed over, not copied"
+
+
+def test_runner_falls_back_to_declared_defaults_and_skips_without_strip():
+    host = Host(2)
+    run = Runner(Fill, host)
+    run()
+    assert host.planes[-1] == bytes((1, 2, 3, 0)) * 2
+    host.strip = None
+    run()
+    assert len(host.planes) == 1
+
+
+def test_fork_keeps_its_own_state():
+    a = Runner(Fill, Host())
+    a()
+    b = a.fork()
+    b(Host(4))
+    assert a.effect is not b.effect and b.effect.n == 4 and a.effect.n == 5
+
+
+def test_bind_keeps_builtins_and_reset_runs_hooks():
+    reg = Registry()
+    reg.register(Fill)
+    hits = []
+    reg.on_reset('solid', lambda h: hits.append(h))
+    host = Host()
+    solid = object()
+    table = reg.bind(host, {'solid': solid, 'fill': solid})
+    assert table['solid'] is solid and table['fill'] is solid, "built-ins win"
+    table = reg.bind(host, {'solid': solid})
+    assert isinstance(table['fill'], Runner) and table['fill'].host is host
+    table['fill']()
+    before = table['fill'].effect
+    reg.reset(host, 'fill', table)
+    assert table['fill'].effect is not before and table['fill'].effect.n == -1
+    reg.reset(host, 'solid', table)
+    assert hits == [host]
+    assert reg.describe() == {'fill': [
+        {'name': 'color', 'default': (1, 2, 3), 'lo': None, 'hi': None},
+        {'name': 'speed', 'default': 50, 'lo': 1, 'hi': 100}]}
+
+
+def test_discover_loads_the_bundled_plugins():
+    reg = Registry()
+    assert reg.discover() == {}
+    assert reg.plugins['rainbow'] is rainbow.Rainbow
+    assert set(reg.plugins) == {'rainbow', 'sparkle', 'meteor', 'sinelon', 'juggle', 'fire'}
+
+
+def test_zone_reset_runs_only_the_hook():
+    reg = Registry()
+    reg.register(Fill)
+    hits = []
+    reg.on_reset('fill', hits.append)
+    host = Host()
+    host.anim_clock.advance(50, now=0.0).advance(50, now=1.0)
+    reg.reset(host, 'fill')
+    assert hits == [host] and host.anim_clock.ticks > 0, "no table: no runner, no clock reset"
+
+
+def test_discover_reports_a_broken_plugin_and_loads_the_rest(tmp_path, monkeypatch):
+    pkg = tmp_path / 'drop_in_fx'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'good.py').write_text(
+        "from effect_registry import Effect\n"
+        "class Good(Effect):\n"
+        "    __slots__ = ()\n"
+        "    name = 'good'\n"
+        "    def render(self, t, buf):\n"
+        "        pass\n")
+    (pkg / 'bad.py').write_text("raise RuntimeError('kaputt')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    reg = Registry()
+    errors = reg.discover('drop_in_fx')
+    assert list(reg.plugins) == ['good']
+    assert list(errors) == ['drop_in_fx.bad'] and 'kaputt' in errors['drop_in_fx.bad']
+    assert 'no_such_pkg' in reg.discover('no_such_pkg')
+
+
+def test_rainbow_plugin_is_the_classic_per_pixel_wheel():
+    def wheel(pos):                                # controller.wheel()
+        if pos < 85:
+            return pos * 3, 255 - pos * 3, 0
+        if pos < 170:
+            pos -= 85
+            return 255 - pos * 3, 0, pos * 3
+        pos -= 170
+        return 0, pos * 3, 255 - pos * 3
+
+    host = Host(300)
+    run = Runner(rainbow.Rainbow, host)
+    for offset in range(260):
+        run()
+        want = b''.join(bytes(wheel((i + offset % 256) % 256) + (0,)) for i in range(300))
+        assert host.planes[-1] == want, offset
+
+
+def test_plugin_package_default():
+    assert effect_registry.PLUGIN_PACKAGE == 'effect_plugins'
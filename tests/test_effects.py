@@ -0,0 +1,856 @@
+"""Classic effects driven for real against a payload-capturing fake strip.
+
+Like the iris smoke suite this imports web_controller (demo mode, no
+hardware). The module controller's background effect loop is stopped first:
+the tests drive frames themselves, and a concurrent painter on the same fake
+strip would make every assertion a race.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import time
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+if 'flask_cors' not in sys.modules:
+    try:
+        import flask_cors  # noqa: F401
+    except ImportError:
+        import types
+        sys.modules['flask_cors'] = types.SimpleNamespace(CORS=lambda app: None)
+
+import animation  # noqa: E402
+import transitions  # noqa: E402
+import web_controller as wc  # noqa: E402
+
+
+def _stop_background_loop():
+    c = wc.controller
+    c.running = False
+    c._effect_wake.set()
+    if c.effect_thread is not None:
+        c.effect_thread.join(timeout=1.0)
+
+
+_stop_background_loop()
+
+
+class PayloadStrip:
+    """Fake PIO strip: keeps the last written payload and its gain."""
+
+    def __init__(self, n=40, brightness=255):
+        self._n = n
+        self._bri = brightness
+        self.payloads = []
+
+    def numPixels(self):
+        return self._n
+
+    def setPixelColor(self, i, c):
+        raise AssertionError("trail effects must not paint per pixel")
+
+    def getBrightness(self):
+        return self._bri
+
+    def setBrightness(self, b):
+        self._bri = int(b)
+
+    def show_payload(self, payload, gain=255):
+        self.payloads.append((bytes(payload), gain))
+        return True
+
+
+def fresh(strip=None):
+    c = wc.controller
+    c.strip = strip or PayloadStrip()
+    c.effect_params = {}
+    c.brightness = 255
+    c.speed = 50
+    c.color = [255, 70, 55]
+    c.power = True
+    c.anim_clock = animation.Clock()
+    c._black_burst = None
+    c.governor = wc.LoadGovernor()
+    for name in wc.EFFECTS.plugins:
+        c._effect_table[name].reset()
+    return c
+
+
+def run(c, name):
+    """One frame of a plugin effect on the controller; its state."""
+    runner = c._effect_table[name]
+    runner()
+    return runner.effect
+
+
+def test_fade_lut_is_the_old_per_element_fade():
+    from effect_plugins import meteor, trails
+    for factor, lut in ((0.92, meteor.FADE), (0.95, trails.SINELON_FADE),
+                        (0.92, trails.JUGGLE_FADE)):
+        assert lut == bytes(int(v * factor) for v in range(256))
+
+
+def test_trail_state_is_one_plane_in_payload_layout():
+    c = fresh()
+    assert len(run(c, 'meteor').plane) == 40 * 4
+    for name in ('sinelon', 'juggle'):
+        plane = run(c, name).trail.plane
+        assert isinstance(plane, bytearray) and len(plane) == 40 * 4
+
+
+def test_particle_and_trail_effects_keep_no_string_keyed_state():
+    c = fresh()
+    for name in ('sparkle', 'meteor', 'sinelon', 'juggle', 'fire'):
+        effect = run(c, name)
+        assert not hasattr(effect, '__dict__'), name
+    assert c.effect_params == {}, "untouched by the plugins"
+
+
+def test_meteor_spawns_after_the_gap_with_a_bright_head(monkeypatch):
+    from effect_plugins import meteor
+    c = fresh()
+    monkeypatch.setattr(meteor.random, 'random', lambda: 0.0)
+    monkeypatch.setattr(meteor.random, 'randint', lambda a, b: 10)
+    monkeypatch.setattr(meteor.random, 'uniform', lambda a, b: 2.0)
+    for _ in range(meteor.SPAWN_GAP + 1):
+        effect = run(c, 'meteor')
+    assert effect.meteors == [[2.0, 10, 2.0, 30]], "spawned and moved once"
+    payload = c.strip.payloads[-1][0]
+    assert payload[:16] == bytes((229, 63, 49, 0, 242, 66, 52, 0, 255, 70, 55, 0)) + bytes(4)
+
+
+def _at_ticks(c, ticks):
+    """Pin the animation clock: `ticks` nominal frames at the current speed."""
+    now = ticks * animation.frame_period(c.speed)
+    c.anim_clock = animation.Clock(now=0.0, timer=lambda: now)
+    c.anim_clock.advance(c.speed, now=0.0)
+
+
+def test_sinelon_plane_is_the_frame_and_trails_fade():
+    c = fresh()
+    _at_ticks(c, 0)
+    trail = run(c, 'sinelon').trail
+    payload, gain = c.strip.payloads[-1]
+    assert payload == bytes(trail.plane)
+    head = [i for i in range(40) if payload[i * 4] == 255]
+    assert len(head) == 1 and payload[head[0] * 4 + 1] == 70
+    _at_ticks(c, 10)                         # the head has moved on
+    run(c, 'sinelon')
+    old = c.strip.payloads[-1][0]
+    assert 0 < old[head[0] * 4] < 255, "the old head fades through the LUT"
+    assert trail.tick == 10
+
+
+def test_trail_depends_on_time_not_on_call_count():
+    """Sampled every frame or only at the end: the same picture."""
+    c = fresh()
+    for tick in range(30):
+        _at_ticks(c, tick)
+        run(c, 'juggle')
+    every_frame = c.strip.payloads[-1][0]
+    c._effect_table['juggle'].reset()
+    _at_ticks(c, 29)
+    run(c, 'juggle')
+    assert c.strip.payloads[-1][0] == every_frame
+
+
+def test_pulse_and_chase_follow_the_clock():
+    c = fresh()
+    _at_ticks(c, 0)
+    c.effect_pulse()
+    assert c.strip.payloads[-1][0][:4] == bytes((25, 7, 5, 0))   # level 0.1
+    _at_ticks(c, 7)
+    c.effect_chase()
+    payload = c.strip.payloads[-1][0]
+    lit = [i for i in range(40) if payload[i * 4]]
+    assert lit == [7, 8]                      # 5 % of 40 LEDs, from tick 7
+
+
+def test_plane_resizes_with_the_strip():
+    c = fresh()
+    run(c, 'juggle')
+    c.strip = PayloadStrip(n=12)
+    assert len(run(c, 'juggle').trail.plane) == 12 * 4
+
+
+def test_plane_output_folds_master_and_driver_brightness():
+    c = fresh(PayloadStrip(brightness=100))
+    c.brightness = 128
+    run(c, 'sinelon')
+    assert c.strip.payloads[-1][1] == 100 * 128 // 255
+
+
+def test_fire_writes_the_engine_payload():
+    c = fresh()
+    for _ in range(5):
+        engine = run(c, 'fire').engine
+    assert c.strip.payloads[-1][0] == engine.payload()
+
+
+def test_sparkle_writes_the_pool_payload_in_the_current_colour():
+    c = fresh()
+    c.speed = 100
+    for _ in range(3):
+        pool = run(c, 'sparkle').pool
+    payload, _ = c.strip.payloads[-1]
+    assert 1 <= pool.count <= 3 * pool.slots, "full rate: one per slot and frame"
+    assert payload == pool.render(wc.level_luts(c.color))
+    lit = [payload[i:i + 4] for i in range(0, len(payload), 4) if any(payload[i:i + 4])]
+    assert lit and all(px[3] == 0 for px in lit)
+
+
+def _loop_theater(n, j, q, rainbow, color):
+    """The old per-call theater frame, unscaled."""
+    out = bytearray(n * 4)
+    for i in range(0, n, 3):
+        idx = i + q
+        if idx < n:
+            rgb = wc.controller.hsv_to_rgb(((i + j) % 255) / 255.0, 1.0, 1.0) if rainbow else color
+            out[idx * 4:idx * 4 + 3] = bytes(rgb)
+    return bytes(out)
+
+
+def test_theater_period_is_the_old_frame_sequence():
+    c = fresh()
+    for rainbow in (True, False):
+        c.theater_rainbow = rainbow
+        frames = c._theater_frames(40, c.color)
+        assert len(frames) == (768 if rainbow else 3)
+        for j, q in ((0, 0), (0, 2), (5, 1), (255, 2)):
+            if rainbow or j == 0:
+                assert frames[j * 3 + q] == _loop_theater(40, j, q, rainbow, c.color)
+
+
+def test_gradient_first_sweep_fills_from_red_to_green():
+    c = fresh()
+    _at_ticks(c, 3)
+    c.effect_gradient_fill()
+    payload = c.strip.payloads[-1][0]
+    pos = 3 * 5                                # speed 50 -> 5 LEDs per frame
+    assert payload[:4] == bytes((255, 0, 0, 0))
+    assert payload[pos * 4:pos * 4 + 4] == bytes((0, 255, 0, 0))
+    assert payload[(pos + 1) * 4:] == bytes((40 - pos - 1) * 4)
+
+
+def test_periodic_playback_hits_the_cache():
+    c = fresh()
+    c.frame_cache.clear()
+    misses = c.frame_cache.misses
+    for tick in range(20):
+        _at_ticks(c, tick)
+        c.effect_pulse()
+        c.effect_theater_chase_rainbow()
+    assert c.frame_cache.misses == misses + 2
+    c.brightness = 40                          # output gain, not a cache key
+    c.effect_pulse()
+    assert c.frame_cache.misses == misses + 2
+    c.color = [0, 0, 255]
+    c.effect_pulse()
+    assert c.frame_cache.misses == misses + 3
+
+
+def test_effect_switch_crossfades_through_one_write(monkeypatch):
+    c = fresh(PayloadStrip(brightness=100))
+    c.transition_s = 0.5
+    c.current_effect = 'pulse'
+    c.begin_transition('pulse', 'theater')
+    c.current_effect = 'theater'
+    tr = c._transition
+    monkeypatch.setattr(tr, 'gain', lambda now=None: 128)
+    c.run_effect()
+    assert len(c.strip.payloads) == 1, "both effects render into captures"
+    payload, gain = c.strip.payloads[-1]
+    assert gain == 100, "the blend goes out through the driver LUT only"
+    assert payload == transitions.crossfade(tr.old.payload, tr.new.payload, 128)
+    assert c.strip is not tr.old and c.strip is not tr.new
+    monkeypatch.setattr(tr, 'gain', lambda now=None: 255)
+    c.run_effect()
+    assert c._transition is None
+
+
+def test_no_crossfade_into_or_out_of_iris_or_when_off():
+    c = fresh()
+    c.transition_s = 0.5
+    c.begin_transition('iris_warn', 'fire')
+    assert c._transition is None
+    c.begin_transition('fire', 'iris_warn')
+    assert c._transition is None
+    c.power = False
+    c.begin_transition('fire', 'rainbow')
+    assert c._transition is None
+
+
+def test_sparkle_overlay_composites_over_the_running_effect():
+    c = fresh()
+    c.current_effect = 'theater'
+    c._transition = None
+    c.set_overlay('sparkle', 'add')
+    c.speed = 100
+    try:
+        for _ in range(3):
+            c.run_effect()
+        payload, gain = c.strip.payloads[-1]
+        base = c._layers()[1].payload
+        layer = c._layers()[0].layers['overlay']
+        assert len(c.strip.payloads) == 3 and gain == 255
+        spans = layer.spans()
+        plane = c._overlay_sparkle.plane
+        lit = [i for i, v in enumerate(plane) if v]
+        assert spans == [[lit[0], lit[-1] + 1]], "only the lit extent is blended"
+        lo, hi = spans[0]
+        assert payload[lo * 4:hi * 4] == bytes(
+            min(255, a + b) for a, b in zip(base[lo * 4:hi * 4], layer.plane[lo * 4:hi * 4]))
+    finally:
+        c.set_overlay(None)
+
+
+def test_zones_run_their_own_effects_into_their_slices():
+    import zones
+    c = fresh()
+    c.zones = zones.ZoneMap.from_config([
+        {'name': 'bar', 'start': 0, 'end': 20, 'effect': 'fire'},
+        {'name': 'door', 'start': 30, 'end': 40, 'effect': 'solid', 'color': [0, 0, 200]},
+    ], 40)
+    c.current_effect = 'zones'
+    c._transition = None
+    try:
+        c.run_effect()
+        payload, gain = c.strip.payloads[-1]
+        assert len(payload) == 160 and gain == 255
+        assert payload[30 * 4:40 * 4] == bytes((0, 0, 200, 0)) * 10
+        assert payload[20 * 4:30 * 4] == bytes(40)
+        engine = c.zones.get('bar').params['runner'].effect.engine
+        assert engine.n == 20, "the zone effect sees a 20-LED strip"
+        assert c._effect_table['fire'].effect.n == -1, "zone state stays in the zone"
+    finally:
+        c.zones = None
+        c.current_effect = 'solid'
+
+
+def test_frame_interval_takes_the_busiest_effect_and_config_overrides():
+    c = fresh(PayloadStrip(n=600))
+    c._transition = None
+    c.speed = 10
+    c.current_effect = 'breathe'
+    assert c.frame_interval() == pytest.approx(1 / animation.MIN_FPS)
+    c.current_effect = 'solid'
+    assert c.frame_interval() == pytest.approx(1 / animation.KEEPALIVE_FPS)
+    c.set_overlay('fire')
+    try:
+        assert c.frame_interval() == pytest.approx(animation.frame_period(10))
+    finally:
+        c.set_overlay(None)
+    c.current_effect = 'breathe'
+    c.effect_fps = {'breathe': 500.0}
+    try:
+        assert c.frame_interval() == pytest.approx(animation.wire_time_s(600)), "never past the wire"
+    finally:
+        c.effect_fps = {}
+
+
+def test_write_floor_follows_the_device_wire_time():
+    c = fresh(PayloadStrip(n=600))
+    assert c.write_floor() == 0.02, "600 LEDs keep the proven 20 ms gate"
+
+    class Wired(PayloadStrip):
+        wire_time_s = 0.009                   # a 300-LED chain reports its own
+
+    c = fresh(Wired(n=600))
+    assert c.write_floor() == pytest.approx(0.011)
+    c._transition = None
+    c.current_effect = 'breathe'
+    c.effect_fps = {'breathe': 500.0}
+    try:
+        assert c.frame_interval() == pytest.approx(0.009), "the device's wire, not 600 LEDs'"
+    finally:
+        c.effect_fps = {}
+    wire = c.get_status()['wire']
+    assert wire == {'wire_ms': 9.0, 'floor_ms': 11.0, 'fps_ceiling': 90.9}
+
+
+def test_wash_playback_draws_the_highlights_over_the_cached_base():
+    c = fresh(PayloadStrip(n=120))
+    assert not c._wash_shimmer_on, "shimmer is over the overlay budget: opt-in"
+    c._wash_shimmer_on = True
+    try:
+        c._wash_engage()
+        c._wash_release()
+        c._wash_origin = c._wash_fade_t0            # shimmer band 0 sits on LED 0
+        c._paint_wash_fade()
+    finally:
+        c._wash_shimmer_on = False
+        c._wash_fade_t0 = None
+    payload, gain = c.strip.payloads[-1]
+    base = c._wash_frames()[c._wash_fade_from]
+    assert 0 < gain <= 255
+    changed = [i for i in range(120) if payload[i * 4:i * 4 + 4] != base[i * 4:i * 4 + 4]]
+    assert 0 in changed and len(changed) < 120, "only the highlighted LEDs move"
+
+
+def test_sparks_show_during_the_release_fade():
+    c = fresh(PayloadStrip(n=120))
+    c._wash_engage()
+    c._wash_release()
+    c._wash_sparks = [(60, time.monotonic() - wc.iris_wash.SPARK_LIFE_S / 2)]
+    try:
+        c._paint_wash_fade()
+    finally:
+        c._wash_fade_t0 = None
+    payload, _ = c.strip.payloads[-1]
+    base = c._wash_frames()[c._wash_fade_from]
+    changed = [i for i in range(120) if payload[i * 4:i * 4 + 4] != base[i * 4:i * 4 + 4]]
+    assert 60 in changed, "the spark at its peak must reach the strip"
+    assert max(changed) - min(changed) < 8, "sparks only, no shimmer band"
+
+
+def test_wash_keyframes_store_less_and_blend_at_playback():
+    c = fresh(PayloadStrip(n=40))
+    saved = (c._wash_steps, c._wash_interp, c._wash_phase)
+    try:
+        c._wash_steps, c._wash_interp = 8, True
+        c._wash_phase = tuple(wc.iris_wash.ease(s / 7) for s in range(8))
+        frames = c._wash_frames()
+        assert len(frames) == 8
+        c._wash_highlights = None
+        mid = c._wash_payload(frames, 2.5, 0.0)
+        assert mid not in frames
+        assert all(min(a, b) - 1 <= m <= max(a, b)     # crossfade floors each term
+                   for a, b, m in zip(frames[2], frames[3], mid))
+    finally:
+        c._wash_steps, c._wash_interp, c._wash_phase = saved
+
+
+def test_wash_cache_is_sized_for_the_configured_chains():
+    c = wc.controller
+    n = int(c.config['led_config']['led_count'])
+    assert wc.iris_wash.FRAME_CACHE.max_bytes >= c._wash_steps * n * 4
+
+
+def test_wash_ramps_for_different_lengths_coexist():
+    c = fresh(PayloadStrip(n=30))
+    first = c._wash_frames()
+    c.strip = PayloadStrip(n=31)
+    other = c._wash_frames()
+    misses = wc.iris_wash.FRAME_CACHE.misses
+    c.strip = PayloadStrip(n=30)
+    assert c._wash_frames() is first, "switching back is a lookup"
+    c.strip = PayloadStrip(n=31)
+    assert c._wash_frames() is other
+    assert wc.iris_wash.FRAME_CACHE.misses == misses
+
+
+def test_renderer_applies_typed_commands():
+    """render_process: the renderer applies command records, no Flask involved."""
+    c = fresh()
+    wc.apply_command(wc.render_process.encode_command('color', 1, 2, 255))
+    assert c.color == [1, 2, 255]
+    wc.apply_command(wc.render_process.encode_command('speed', 80))
+    assert c.speed == 80
+
+
+class RecordingClient:
+    """RenderClient stand-in: records commands, no renderer snapshot yet."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, op, *fields):
+        self.sent.append((op, fields))
+
+    def snapshot(self):
+        return None
+
+
+def test_api_process_validates_and_sends_but_never_applies():
+    c = fresh()
+    c.color = [9, 9, 9]
+    c.current_effect = 'solid'
+    c._render_client = client = RecordingClient()
+    try:
+        with wc.app.test_client() as http:
+            r = http.post('/api/color', json={'r': 1, 'g': 2, 'b': 300})
+            assert r.get_json()['color'] == {'r': 1, 'g': 2, 'b': 255}
+            r = http.post('/api/effect', json={'effect': 'iris_warn'})
+            assert r.get_json() == {'status': 'ok', 'effect': 'iris_warn', 'power': True}
+            assert http.post('/api/effect', json={'effect': 'nope'}).status_code == 400
+    finally:
+        c._render_client = None
+    assert client.sent == [('color', (1, 2, 255)), ('effect', ('iris_warn',))]
+    assert c.color == [9, 9, 9] and c.current_effect == 'solid', "route body ran here"
+    assert c.strip.payloads == [], "no in-request paint in the API process"
+
+
+class ClosingStrip(PayloadStrip):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_chain_attach_is_refused_once_the_renderer_owns_the_strip():
+    c = fresh()
+    strip = c.strip
+    c._render_client = RecordingClient()
+    late = ClosingStrip()
+    try:
+        with pytest.raises(RuntimeError):
+            c._attach_chain(late)
+    finally:
+        c._render_client = None
+    assert late.closed and c.strip is strip
+
+
+def test_stopping_the_loop_stops_the_supervisor_thread():
+    c = fresh()
+    c.chain_supervisor = wc.ChainSupervisor([], lambda pin: None, None, c._attach_chain)
+    try:
+        c.running = True
+        c.start_effect_loop()
+        assert c.supervisor_thread.is_alive()
+        c._stop_effect_loop()
+        assert not c.supervisor_thread.is_alive(), "woken and joined, not left polling"
+        assert not c.effect_thread.is_alive()
+    finally:
+        c.chain_supervisor = None
+        c.running = False
+
+
+class WireStrip(PayloadStrip):
+    """Holds back (does not show) a frame handed in while the wire is busy."""
+
+    def __init__(self, n=40, busy_s=0.03):
+        super().__init__(n)
+        self.busy_until = time.monotonic() + busy_s
+        self.held = 0
+        self.shown = 0
+
+    def fill(self, c):
+        pass
+
+    def setPixelColor(self, i, c):
+        pass
+
+    def show(self):
+        return self.show_payload(b'')
+
+    def show_payload(self, payload, gain=255):
+        if time.monotonic() < self.busy_until:
+            self.held += 1
+            return False
+        self.shown += 1
+        return True
+
+
+@pytest.mark.parametrize("path,body", [('/api/solid', {'r': 10}),
+                                       ('/api/effect', {'effect': 'iris_warn'}),
+                                       ('/api/warn_gate', {'over': True})])
+def test_in_request_first_frame_waits_out_the_wire(path, body):
+    c = fresh(WireStrip())
+    c.strip_warn_mode = False
+    try:
+        with wc.app.test_client() as client:
+            client.post(path, json=body)
+        assert c.strip.shown >= 1 and c.strip.held == 0, "first frame held and lost"
+    finally:
+        c.strip_warn_mode = False
+        c.strip_warn_over = False
+        c.power = False
+
+
+def test_status_is_a_published_snapshot():
+    c = fresh()
+    c.color = [1, 2, 3]
+    c.publish_status()
+    blob = c.status_json()
+    assert json.loads(blob)['color'] == {'r': 1, 'g': 2, 'b': 3}
+    c.color = [9, 9, 9]
+    assert c.status_json() is blob, "reads never rebuild"
+    c.wake_effect()
+    assert c._status_dirty
+    c.publish_status()
+    assert json.loads(c.status_json())['color'] == {'r': 9, 'g': 9, 'b': 9}
+    with wc.app.test_client() as client:
+        assert client.get('/api/status').data == c.status_json()
+
+
+
+@pytest.mark.parametrize("path,body", [('/api/speed', {'speed': 77}),
+                                       ('/api/theater_mode', {'rainbow': False})])
+def test_setting_endpoints_mark_the_status_dirty(path, body):
+    c = fresh()
+    c._status_dirty = False
+    with wc.app.test_client() as client:
+        client.post(path, json=body)
+    assert c._status_dirty, f"{path} must re-publish /api/status"
+    c.theater_rainbow = True
+
+class BlackStrip(PayloadStrip):
+    """Counts show() calls; `ok` is what the driver reports."""
+
+    def __init__(self, n=40):
+        super().__init__(n)
+        self.shows = 0
+        self.ok = True
+
+    def fill(self, c):
+        pass
+
+    def show(self):
+        self.shows += 1
+        return self.ok
+
+
+def test_clear_is_a_two_frame_burst_finished_by_the_loop():
+    strip = BlackStrip()
+    c = fresh(strip)
+    c.power = False
+    c._cleared = False
+    c.clear(force=True)
+    assert strip.shows == 1 and c._black_burst is not None and not c._cleared
+    c.run_effect()                       # before the deadline: hold, no re-clear
+    assert strip.shows == 1
+    c._black_burst = (0.0, strip)        # deadline passed
+    c.run_effect()
+    assert strip.shows == 2 and c._black_burst is None and c._cleared
+    # a dropped second frame does not latch: the next tick clears again
+    c._cleared = False
+    strip.ok = False
+    c.clear(force=True)
+    c._black_burst = (0.0, strip)
+    c.run_effect()
+    assert not c._cleared
+    c.run_effect()
+    assert strip.shows == 5 and c._black_burst is not None
+
+
+def test_a_paint_supersedes_the_pending_black_frame():
+    strip = BlackStrip()
+    c = fresh(strip)
+    c.current_effect = 'solid'
+    c.clear(force=True)
+    c.effect_solid()                     # in-request paint (e.g. /api/solid)
+    assert c._black_burst is None
+    c.run_effect()
+    assert strip.shows == 3, "solid painted twice, no black frame in between"
+
+
+def test_effect_table_is_built_once_and_dispatch_is_cached():
+    c = fresh()
+    c._transition = None
+    table = c._effect_table
+    c.current_effect = 'breathe'
+    assert c._render == c.effect_breathe
+    c.run_effect()
+    c.run_effect()
+    assert c._effect_table is table, "no per-frame dict of bound methods"
+    c.current_effect = 'rainbow'
+    assert c._render is table['rainbow'] and c._render.host is c
+    c.current_effect = 'nonsense'
+    assert c._render is None
+    c.run_effect()                                   # unknown effect: no frame
+    c.current_effect = 'solid'
+
+
+def test_select_effect_runs_the_reset_hooks():
+    c = fresh()
+    c._transition = None
+    c.power = False                                  # no crossfade
+    c.effect_params['gradient_salt'] = 1
+    c.select_effect('gradient')
+    assert c.effect_params['gradient_salt'] != 1 and c.current_effect == 'gradient'
+    meteor = run(c, 'meteor')
+    c.select_effect('meteor')
+    assert c._render.effect is not meteor and c._render.effect.n == -1
+    c.power = True
+    c.select_effect('rainbow')
+    c.run_effect()
+    c.run_effect()
+    assert c._render.effect.offset == 2
+    c._transition = None
+    c.select_effect('rainbow')
+    assert c._render.effect.offset == 0, "switching to a plugin starts it fresh"
+    c.current_effect = 'solid'
+
+
+def test_color_and_speed_endpoints_push_into_the_plugin_runners():
+    c = fresh()
+    runner = c._effect_table['sparkle']
+    runner.sync(c)
+    with wc.app.test_client() as client:
+        client.post('/api/color', json={'r': 1, 'g': 2, 'b': 3})
+        client.post('/api/speed', json={'speed': 90})
+    assert list(runner.effect.color) == [1, 2, 3] and runner.effect.speed == 90
+
+
+def test_plugin_effects_run_in_zones_with_their_own_state():
+    import zones
+    c = fresh()
+    c.zones = zones.ZoneMap.from_config([
+        {'name': 'a', 'start': 0, 'end': 10, 'effect': 'rainbow'},
+        {'name': 'b', 'start': 10, 'end': 40, 'effect': 'rainbow'},
+    ], 40)
+    c.current_effect = 'zones'
+    c._transition = None
+    try:
+        c.run_effect()
+        a, b = c.zones.get('a').params['runner'], c.zones.get('b').params['runner']
+        assert a is not b and (a.effect.n, b.effect.n) == (10, 30)
+        payload, _ = c.strip.payloads[-1]
+        assert payload[:4] == payload[40:44] == bytes((0, 255, 0, 0)), "both start at hue 0"
+    finally:
+        c.zones = None
+        c.current_effect = 'solid'
+
+
+def test_zone_effect_switch_runs_the_reset_hook_on_the_zone():
+    import zones
+    c = fresh()
+    c.zones = zones.ZoneMap.from_config([
+        {'name': 'a', 'start': 0, 'end': 40, 'effect': 'meteor'},
+    ], 40)
+    c.current_effect = 'zones'
+    c._transition = None
+    hits = []
+    wc.EFFECTS.on_reset('solid', hits.append)
+    try:
+        c.run_effect()
+        with wc.app.test_client() as client:
+            client.post('/api/zone/a/effect', json={'effect': 'gradient'})
+            zone = c.zones.get('a')
+            assert 'runner' not in zone.params and 'gradient_salt' in zone.params
+            assert 'gradient_salt' not in c.effect_params, "the hook ran on the zone"
+            client.post('/api/zone/a/effect', json={'effect': 'solid'})
+        assert len(hits) == 1 and hits[0].effect_params is zone.params is not c.effect_params
+    finally:
+        wc.EFFECTS._resets.pop('solid', None)
+        c.zones = None
+        c.current_effect = 'solid'
+
+
+def test_gradient_does_not_fill_the_period_cache():
+    c = fresh()
+    c.frame_cache.clear()
+    misses = c.frame_cache.misses
+    for tick in range(0, 40, 3):                  # several sweeps, new hues each
+        _at_ticks(c, tick)
+        c.effect_gradient_fill()
+    assert c.frame_cache.misses == misses and c.frame_cache.stats()['entries'] == 0
+
+
+def test_capture_overrides_the_clock_only_on_the_render_thread():
+    import threading
+    c = fresh()
+    own, outgoing, installed = c.anim_clock, animation.Clock(), animation.Clock()
+    seen = {}
+
+    def render():
+        seen['render'] = c.anim_clock
+
+        def handler():                       # /api/effect landing mid-frame
+            seen['request'] = c.anim_clock
+            c.anim_clock = installed
+        t = threading.Thread(target=handler)
+        t.start()
+        t.join()
+
+    c._capture(transitions.FrameCapture(40), render, outgoing)
+    assert seen == {'render': outgoing, 'request': own}
+    assert c.anim_clock is installed, "the request's new clock survives the capture"
+
+
+def test_switch_mid_frame_keeps_the_frame_on_its_own_clock():
+    import threading
+    c = fresh()
+    c.transition_s = 0.5
+    c._transition = None
+    c.current_effect = 'pulse'
+    clock = c.anim_clock
+    seen = []
+
+    def render():                            # /api/effect lands mid-frame
+        seen.append(c.anim_clock)
+        t = threading.Thread(target=c.select_effect, args=('theater',))
+        t.start()
+        t.join()
+        seen.append(c.anim_clock)
+    c._render = render
+    try:
+        c.run_effect()
+        assert seen == [clock, clock], "the running frame never sees the new clock"
+        tr = c._transition
+        assert tr is not None and tr.clock is clock and c.anim_clock is not clock
+        assert c.current_effect == 'theater' and c._render == c.effect_theater_chase_rainbow
+        old = wc.Crossfade('pulse', clock, 40, 0.5)
+        c._end_transition(old)
+        assert c._transition is tr, "a finished fade never clears a newer one"
+    finally:
+        c._transition = None
+        c.current_effect = 'solid'
+
+
+@pytest.mark.parametrize("effect", wc.OVERLAY_EFFECTS)
+def test_every_zone_effect_renders_from_fresh_zone_state(effect):
+    import zones
+    c = fresh()
+    c.zones = zones.ZoneMap.from_config([
+        {'name': 'z', 'start': 0, 'end': 40, 'effect': effect},
+    ], 40)
+    c.current_effect = 'zones'
+    c._transition = None
+    try:
+        for _ in range(3):
+            c.run_effect()
+        assert c.strip.payloads, f"zone running {effect} wrote nothing"
+        assert len(c.strip.payloads[-1][0]) == 160
+    finally:
+        c.zones = None
+        c.current_effect = 'solid'
+
+
+def test_governor_slows_only_the_time_based_effects():
+    c = fresh(PayloadStrip(n=600))
+    c._transition = None
+    c.speed = 50
+    c.governor.level = 3
+    scale = c.governor.knob('fps_scale')
+    try:
+        c.current_effect = 'chase'
+        nominal = animation.target_fps('chase', 50, 600, c.wire_time())
+        assert c.frame_interval() == pytest.approx(max(c.wire_time(), 1 / (nominal * scale)))
+        for effect in ('rainbow', 'sparkle', 'meteor', 'fire', 'strobe'):
+            c.current_effect = effect
+            fps = animation.target_fps(effect, 50, 600, c.wire_time())
+            assert c.frame_interval() == pytest.approx(max(c.wire_time(), 1 / fps)), effect
+    finally:
+        c.governor.level = 0
+        c.current_effect = 'solid'
+
+
+def test_clear_waits_for_the_wire_outside_the_strip_lock(monkeypatch):
+    strip = BlackStrip()
+    c = fresh(strip)
+    now = [100.0]
+    strip.busy_until = 100.015                 # previous frame still shifting out
+    slept = []
+
+    def sleep(s):
+        slept.append((round(s, 4), c._strip_lock.locked()))
+        now[0] += s
+    monkeypatch.setattr(wc.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(wc.time, "sleep", sleep)
+    c._cleared = False
+    c.clear(force=True)
+    assert slept == [(0.015, False)] and strip.shows == 1
+    strip.busy_until = now[0] + 0.05           # burst due, but the wire is busy
+    now[0] = c._black_burst[0]
+    assert c._finish_clear() is True and strip.shows == 1
+    now[0] = strip.busy_until
+    c._finish_clear()
+    assert strip.shows == 2 and c._black_burst is None
@@ -0,0 +1,71 @@
+"""fire.FireEngine — the table-driven stages must equal the Fire2012 loops."""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import fire  # noqa: E402
+
+
+def _loop_diffuse(heat):
+    """The original loop: k walks down, so every cell reads old neighbours."""
+    heat = list(heat)
+    for k in range(len(heat) - 1, 1, -1):
+        heat[k] = (heat[k - 1] + heat[k - 2] + heat[k - 2]) // 3
+    return heat
+
+
+def test_diffusion_is_the_fire2012_loop():
+    rng = random.Random(7)
+    e = fire.FireEngine(50, rng=rng)
+    e.heat[:] = bytes(rng.randrange(256) for _ in range(50))
+    expected = _loop_diffuse(e.heat)
+    e.diffuse()
+    assert list(e.heat) == expected
+
+
+def test_cooling_saturates_at_zero_and_stays_in_range():
+    e = fire.FireEngine(600, rng=random.Random(1))
+    e.heat[:] = bytes([1]) * 600
+    e.cool()
+    assert min(e.heat) == 0 and max(e.heat) <= 1
+    e.heat[:] = bytes([200]) * 600
+    e.cool()
+    top = (fire.COOLING * 10) // 600 + 2
+    assert all(200 - top <= h <= 200 for h in e.heat)
+
+
+def test_palette_matches_the_branchy_conversion():
+    for h in (0, 42, 84, 85, 120, 169, 170, 200, 255):
+        assert fire.PALETTE[h][:3] == bytes(fire.heat_rgb(h))
+        assert fire.PALETTE[h][3] == 0
+
+
+def test_payload_is_mirrored():
+    e = fire.FireEngine(4, rng=random.Random(0))
+    e.heat[:] = bytes([255, 0, 0, 100])
+    p = e.payload()
+    assert len(p) == 16
+    assert p[12:16] == fire.PALETTE[255], "heat[0] lands on the last LED"
+    assert p[0:4] == fire.PALETTE[100]
+
+
+def test_sparks_ignite_near_the_bottom():
+    e = fire.FireEngine(60, rng=random.Random(3))
+    for _ in range(50):
+        e.step()
+    assert max(e.heat) > 0
+    assert max(e.heat[:fire.SPARK_ZONE]) > 0
+
+
+def test_tiny_strips_do_not_break():
+    for n in (0, 1, 2):
+        e = fire.FireEngine(n, rng=random.Random(0))
+        e.step()
+        assert len(e.payload()) == n * 4
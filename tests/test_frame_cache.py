@@ -0,0 +1,56 @@
+"""frame_cache.FrameCache — LRU order, byte cap, build-once."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from frame_cache import FrameCache  # noqa: E402
+
+
+def _period(tag, frames=4, size=100):
+    return lambda: [bytes([tag]) * size for _ in range(frames)]
+
+
+def test_builds_once_per_key():
+    calls = []
+    c = FrameCache()
+    build = lambda: calls.append(1) or [b"ab", b"cd"]
+    assert c.get("k", build) == (b"ab", b"cd")
+    assert c.get("k", build) == (b"ab", b"cd")
+    assert len(calls) == 1
+    assert c.stats() == {'entries': 1, 'bytes': 4, 'hits': 1, 'misses': 1}
+
+
+def test_byte_cap_evicts_least_recently_used():
+    c = FrameCache(max_bytes=1000)            # 400 bytes per period
+    c.get("a", _period(1))
+    c.get("b", _period(2))
+    c.get("a", _period(1))                    # a is now the freshest
+    c.get("c", _period(3))
+    assert "a" in c and "c" in c and "b" not in c
+    assert c.bytes == 800
+
+
+def test_oversized_periods_are_served_outside_the_lru():
+    c = FrameCache(max_bytes=300)
+    c.get("a", _period(1, frames=1))
+    calls = []
+    build = lambda: calls.append(1) or _period(2)()
+    frames = c.get("big", build)
+    assert len(frames) == 4 and "a" in c and c.bytes == 100
+    assert c.get("big", build) is frames and len(calls) == 1, "played back, not rebuilt"
+    c.get("bigger", _period(3, frames=5))
+    assert "big" not in c and "bigger" in c, "only the last one is kept aside"
+
+
+def test_fit_only_raises_the_cap():
+    c = FrameCache(max_bytes=300)
+    c.fit(1000)
+    assert c.max_bytes == 1000
+    c.fit(10)
+    assert c.max_bytes == 1000
@@ -0,0 +1,74 @@
+"""governor.LoadGovernor — step down on slow frames, back up on headroom."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import governor  # noqa: E402
+from governor import LoadGovernor  # noqa: E402
+
+
+def _feed(g, render_s, frames, now=0.0, dt=0.02):
+    for _ in range(frames):
+        g.record(render_s, now)
+        now += dt
+    return now
+
+
+def test_level_zero_is_full_quality():
+    g = LoadGovernor()
+    for name, table in governor.QUALITY.items():
+        assert g.knob(name) == table[0]
+    assert g.knob('glow_block') == 4 and g.knob('wave_step') == 1
+
+
+def test_fast_frames_never_step_down():
+    g = LoadGovernor(budget_s=0.010)
+    _feed(g, 0.004, 500)
+    assert g.level == 0
+
+
+def test_percentile_over_budget_steps_down_one_level_at_a_time():
+    g = LoadGovernor(budget_s=0.010)
+    _feed(g, 0.020, governor.WINDOW)
+    assert g.level == 1
+    # the new level is judged on a full window of its own frames
+    _feed(g, 0.020, governor.WINDOW - 1)
+    assert g.level == 1
+    _feed(g, 0.020, 1)
+    assert g.level == 2
+    _feed(g, 0.020, 1000)
+    assert g.level == governor.MAX_LEVEL
+
+
+def test_rare_spikes_below_the_percentile_are_ignored():
+    g = LoadGovernor(budget_s=0.010)
+    for i in range(500):
+        g.record(0.050 if i % 20 == 0 else 0.003, i * 0.02)
+    assert g.level == 0
+
+
+def test_recovery_needs_sustained_headroom():
+    g = LoadGovernor(budget_s=0.010)
+    now = _feed(g, 0.020, governor.WINDOW)
+    assert g.level == 1
+    # in budget but not below the headroom mark: stays degraded
+    now = _feed(g, 0.008, 400, now)
+    assert g.level == 1
+    # clearly idle, but shorter than RECOVER_S: still degraded
+    now = _feed(g, 0.002, governor.WINDOW, now)
+    assert g.level == 1
+    _feed(g, 0.002, int(governor.RECOVER_S / 0.02) + 1, now)
+    assert g.level == 0
+    assert g.steps_down == 1 and g.steps_up == 1
+
+
+def test_status_reports_level_and_percentile():
+    g = LoadGovernor(budget_s=0.012)
+    _feed(g, 0.005, 10)
+    assert g.status() == {'level': 0, 'p90_ms': 5.0, 'budget_ms': 12.0}
@@ -304,14 +304,18 @@ def test_clear_writes_twice_and_only_latches_on_success():
     """WS2812 is GRB-serialised: one slipped bit shifts crimson's 255 into the
     green or blue slot — the standstill artifacts ARE our own red. Standard
     practice: write the blank frame twice (wire errors are per-transmission);
-    and _cleared may only latch when the write actually landed."""
+    and _cleared may only latch when the write actually landed. The second
+    frame is a scheduled black burst — no sleep under the strip lock."""
     src = _src()
     blk = src[src.index("def clear(self, force=False):"):]
-    blk = blk[:blk.index("\n    def ")]
-    assert "for versuch in range(2):" in blk
+    blk = blk[:blk.index("\n    def _finish_clear")]
+    assert "self._black_burst = (" in blk
+    assert "time.sleep" not in blk, "clear() must never block a request"
     assert "self.strip.show() is not False" in blk
-    assert "self._cleared = ok" in blk
-    assert "self._cleared = True" not in blk, "unconditional latch is the old bug"
+    fin = src[src.index("def _finish_clear(self"):]
+    fin = fin[:fin.index("\n    def ")]
+    assert "self._cleared = ok" in fin
+    assert "self._cleared = True" not in blk + fin, "unconditional latch is the old bug"
 
 
 def test_idle_reclear_heals_stuck_pixels():
@@ -380,12 +384,13 @@ def test_strip_drop_blinder_mirrors_the_page_bomb():
 
 
 def test_one_write_clock_for_all_paths():
-    """Every paint path shares one 20 ms floor (= the 18 ms wire time).
-    Racing the wire only produces EBUSY drops, and a dropped frame is a
-    20 ms window in which a slip fragment stands."""
+    """Every paint path shares one floor: the device's wire time + 2 ms
+    (20 ms on a 600-LED chain). Racing the wire only produces EBUSY drops,
+    and a dropped frame is a window in which a slip fragment stands."""
     src = _src()
     assert "iris_last_write" in src
-    assert "< 0.02:" in src
+    assert "< self.write_floor():" in src
+    assert "return round(self.wire_time() + WIRE_SLACK_S, 4)" in src
 
 
 def test_sparks_are_ember_not_white():
@@ -68,6 +68,10 @@ def fresh(strip=None):
     c.strip_lut_default = 100
     c._cleared = False
     c.power = True
+    c._black_burst = None
+    # Governor auf Stufe 0 festnageln (Budget unerreichbar): der Effekt-Loop
+    # laeuft hier mit und soll die volle Qualitaet nicht herunterregeln
+    c.governor = wc.LoadGovernor(budget_s=60.0)
     return c
 
 
@@ -192,18 +196,17 @@ def test_shadow_zombies_are_pruned_and_fresh_cohort_is_visible_immediately():
     assert visible, "Initial-Kohorte muss ohne 1-s-Wartezeit sichtbar sein"
 
 
-GOLDEN_FRAME_HASH = "a38f6cdb0b2100c4fb11090ecba036ef745f80c31fb0fc6490df238564f6f446"
+# Neu gepinnt (user-044): der Schreibtakt folgt der Drahtzeit des Geraets.
+# Die 60-LED-Attrappe hat 3,8 ms Boden statt der festen 20 ms, bei dt=0.02
+# faellt also kein Frame mehr auf die Grenze. Mit wire_time_s = 0.018 (600er-
+# Kette) ergibt sich bitgenau der alte Hash (siehe test_600_led_wire_…).
+GOLDEN_FRAME_HASH = "24c71495b6cec905067ccc68be62b072f2d56d770bdf12ca24f01910a90778ed"
 
 
-def test_golden_frames_with_seed_and_fake_clock():
-    """L1-Waechter (Phase 3): Seed + injizierte Fake-Uhr => bitgenau
-    reproduzierbare Frames. Der Hash ist der Verhaltens-Fingerabdruck der
-    Baseline — JEDE unbeabsichtigte Verhaltensaenderung (auch durch kuenftige
-    Feature-Schalter im AUS-Zustand) aendert ihn und faellt hier auf.
-    Absichtliche Aenderungen pinnen einen neuen Hash MIT Begruendung."""
+def _golden_hash(strip=None):
     import hashlib
     state = {"t": 100.0}
-    c = fresh()
+    c = fresh(strip)
     c.iris_clock = lambda: state["t"]
     wc.apply_iris_config({"seed": 1234})
     try:
@@ -222,8 +225,54 @@ def test_golden_frames_with_seed_and_fake_clock():
         c.effect_params.setdefault("iris_events", []).append(
             {"kind": "double", "gap": 0.12, "n": 2})      # Sparkle-Blinder
         frames(40)
-        assert h.hexdigest() == GOLDEN_FRAME_HASH
+        return h.hexdigest()
+    finally:
+        wc.apply_iris_config(None)
+        if hasattr(c, "iris_clock"):
+            del c.iris_clock
+
+
+def test_golden_frames_with_seed_and_fake_clock():
+    """L1-Waechter (Phase 3): Seed + injizierte Fake-Uhr => bitgenau
+    reproduzierbare Frames. Der Hash ist der Verhaltens-Fingerabdruck der
+    Baseline — JEDE unbeabsichtigte Verhaltensaenderung (auch durch kuenftige
+    Feature-Schalter im AUS-Zustand) aendert ihn und faellt hier auf.
+    Absichtliche Aenderungen pinnen einen neuen Hash MIT Begruendung."""
+    assert _golden_hash() == GOLDEN_FRAME_HASH
+
+
+def test_600_led_wire_keeps_the_baseline_frames():
+    """Eine Attrappe mit der Drahtzeit der 600er-Kette malt bitgenau die
+    Baseline von vor dem geraeteabhaengigen Schreibtakt."""
+    strip = FakeStrip()
+    strip.wire_time_s = 0.018
+    assert _golden_hash(strip) == \
+        "a38f6cdb0b2100c4fb11090ecba036ef745f80c31fb0fc6490df238564f6f446"
+
+
+def test_every_governor_level_renders_the_same_scene():
+    """Unter Last regelt der Governor Glut-Raster, Wellen-Schritt, Funken und
+    Schatten herunter — jede Stufe muss dieselbe Szene fehlerfrei malen."""
+    state = {"t": 100.0}
+    scenes = []
+    wc.apply_iris_config({"seed": 1234})
+    try:
+        for level in range(4):
+            c = fresh(FakeStrip(n=240))
+            c.governor.level = level
+            c.iris_clock = lambda: state["t"]
+            state["t"] = 100.0
+            for i in range(60):
+                state["t"] += 0.02
+                if i == 30:
+                    c.effect_params.setdefault("iris_kicks", []).append(
+                        {"s": 0.8, "bpm": 128.0})
+                c.effect_iris_warn()
+            assert any(c.strip._px), f"Stufe {level} malt schwarz"
+            scenes.append(list(c.strip._px))
     finally:
         wc.apply_iris_config(None)
+        c.governor.level = 0
         if hasattr(c, "iris_clock"):
             del c.iris_clock
+    assert scenes[0] != scenes[-1], "die hoechste Stufe muss wirklich sparen"
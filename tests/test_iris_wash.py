@@ -302,3 +302,146 @@ def test_blend_endpoints():
     base = (214, 15, 10)
     assert w.white_target(0.0, base) == base
     assert w.white_target(1.0, base) == w.WHITE_POINT
+
+
+# ---- playback overlay ------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def tables():
+    return w.HighlightTables()
+
+
+def _reference_shimmer(base, n, e, elapsed):
+    out = []
+    centres = [w.shimmer_centre(elapsed, n, b) for b in range(w.SHIMMER_COUNT)]
+    for i in range(n):
+        m = max(w.shimmer_amp(min(abs(i - c), n - abs(i - c)), e) for c in centres)
+        out.append(w.white_target(m, base[i * 4:i * 4 + 3]))
+    return out
+
+
+@pytest.mark.parametrize("e,elapsed", [(1.0, 3.3), (0.5, 1.01), (0.25, 6.77)])
+def test_shimmer_tables_match_the_maths(tables, e, elapsed):
+    base = w.build_frames(N, steps=2)[-1]
+    out = tables.apply(base, tables.touched(N, e, elapsed))
+    ref = _reference_shimmer(base, N, e, elapsed)
+    worst = max(abs(a - b) for i in range(N)
+                for a, b in zip(out[i * 4:i * 4 + 3], ref[i]))
+    assert worst <= 6, "sub-LED and mix quantisation only"
+
+
+def test_overlay_touches_only_the_highlighted_leds(tables):
+    base = w.build_frames(N, steps=2)[-1]
+    spans, levels = tables.touched(N, 1.0, 0.0, [(100, 0.0)], w.SPARK_LIFE_S / 2,
+                                   shimmer=False)
+    assert not spans and sorted(levels) == list(range(98, 103))
+    assert levels[100] == w.MIX_LEVELS, "a spark at its peak is full white"
+    out = tables.apply(base, (spans, levels))
+    assert out[400:412] == bytes(w.WHITE_POINT) + b"\x00" + out[404:412]
+    assert out[:392] == base[:392] and out[412:] == base[412:]
+
+
+def test_shimmer_core_wraps_around_the_strip_end(tables):
+    spans, _ = tables.touched(N, 1.0, (N - 2) / w.SHIMMER_SPEED)
+    assert (0, spans[1][1]) == spans[1] and spans[0][1] == N
+
+
+def test_memoised_blend_matches_the_luts(monkeypatch):
+    monkeypatch.setattr(w, "MEMO_MAX", 8)            # forces the clear path too
+    tables = w.HighlightTables()
+    frames = w.build_frames(N, steps=4)
+    for k, base in enumerate(frames * 2):
+        touched = tables.touched(N, 0.6, 0.37 * k, [(0, 0.0), (300, 0.1)], 0.3)
+        out = tables.apply(base, touched)
+        want = bytearray(base)
+        for i, lvl in touched[1].items():
+            for c, lut in enumerate(tables.blend[lvl]):
+                want[i * 4 + c] = lut[want[i * 4 + c]]
+        for lo, hi in touched[0]:
+            want[lo * 4:hi * 4] = tables.white_px * (hi - lo)
+        assert out == bytes(want), k
+    assert max(len(m) for m in tables._memo) <= 8
+
+
+def test_spark_at_the_strip_start_is_clipped(tables):
+    _, levels = tables.touched(N, 1.0, 0.0, [(0, 0.0)], w.SPARK_LIFE_S / 2,
+                               shimmer=False)
+    assert sorted(levels) == [0, 1, 2] and levels[0] == w.MIX_LEVELS
+
+
+def test_bands_on_a_short_strip_take_the_max(tables):
+    n = 40                                           # the bands overlap here
+    base = w.build_frames(n, steps=2)[-1]
+    out = tables.apply(base, tables.touched(n, 0.3, 0.0))
+    ref = _reference_shimmer(base, n, 0.3, 0.0)
+    worst = max(abs(a - b) for i in range(n)
+                for a, b in zip(out[i * 4:i * 4 + 3], ref[i]))
+    assert worst <= 6
+
+
+def test_expired_or_unborn_sparks_draw_nothing(tables):
+    assert tables.touched(N, 1.0, 0.0, [(5, 0.0)], w.SPARK_LIFE_S, shimmer=False) == ([], {})
+    assert tables.touched(N, 1.0, 0.0, [(5, 1.0)], 0.5, shimmer=False) == ([], {})
+
+
+# ---- keyframes -------------------------------------------------------------
+
+def test_frame_position_rounds_to_frame_index():
+    for x in range(0, 400):
+        t = x * 0.01
+        assert w.frame_index(t, 64) == int(round(w.frame_position(t, 64)))
+    assert w.frame_position(w.BREATHE_PERIOD_S, 16) == pytest.approx(15.0)
+
+
+def test_keyframes_blend_back_to_the_full_ramp():
+    full = w.build_frames(N, 64)
+    keys = w.build_frames(N, 16)
+    assert sum(map(len, keys)) * 4 == sum(map(len, full))
+    worst = 0
+    for s in range(64):
+        got = w.interpolated_frame(keys, s / 63 * 15)
+        worst = max(worst, max(abs(a - b) for a, b in zip(got, full[s])))
+    assert worst <= 3
+
+
+def test_interpolation_hits_the_keyframes_exactly():
+    keys = w.build_frames(40, 8)
+    assert w.interpolated_frame(keys, 0.0) == keys[0]
+    assert w.interpolated_frame(keys, 3.0) == keys[3]
+    assert w.interpolated_frame(keys, 7.0) == keys[7]
+    assert w.interpolated_frame(keys, 99.0) == keys[7]
+
+
+# ---- shared ramp cache -----------------------------------------------------
+
+def test_cached_frames_build_once_per_key_and_lengths_coexist():
+    from frame_cache import FrameCache
+    cache = FrameCache(max_bytes=1 << 20)
+    a = w.cached_frames(40, 8, cache=cache)
+    b = w.cached_frames(60, 8, cache=cache)
+    assert w.cached_frames(40, 8, cache=cache) is a
+    assert w.cached_frames(60, 8, cache=cache) is b
+    assert cache.misses == 2 and cache.hits == 2
+    assert a == w.build_frames(40, 8)
+    w.cached_frames(40, 8, exposure=1.0, cache=cache)
+    w.cached_frames(40, 8, max_current_a=1.0, cache=cache)
+    assert cache.misses == 4, "exposure and budget are part of the key"
+
+
+def test_cached_frames_respect_the_byte_cap():
+    from frame_cache import FrameCache
+    cache = FrameCache(max_bytes=2 * 8 * 40 * 4)          # two 40-LED ramps
+    for n in (40, 41, 42):
+        w.cached_frames(n, 8, cache=cache)
+    assert cache.bytes <= cache.max_bytes
+    assert w.cache_key(40, 8) not in cache, "least recently used goes first"
+    assert w.cache_key(42, 8) in cache
+
+
+def test_a_ramp_over_the_cap_is_built_once_not_per_frame():
+    from frame_cache import FrameCache
+    cache = FrameCache(max_bytes=8 * 40 * 4 - 1)          # one 40-LED ramp won't fit
+    ramp = w.cached_frames(40, 8, cache=cache)
+    for _ in range(5):
+        assert w.cached_frames(40, 8, cache=cache) is ramp
+    assert cache.misses == 1 and w.cache_key(40, 8) in cache
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import errno
 import pathlib
 import sys
 
@@ -11,6 +12,7 @@ _ROOT = pathlib.Path(__file__).parent.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
+import pio_strip  # noqa: E402
 from pio_strip import Color, PixelStrip  # noqa: E402
 
 
@@ -96,9 +98,21 @@ def _fake_dev(monkeypatch):
     monkeypatch.setattr("os.write",
                         lambda fd, data: log["writes"].append((fd, bytes(data))) or len(data))
     monkeypatch.setattr("os.close", lambda fd: log["closes"].append(fd))
+    _spaced_clock(monkeypatch)
     return log
 
 
+def _spaced_clock(monkeypatch, step=0.1):
+    """Every clock read 100 ms later: back-to-back frames find the wire free."""
+    now = [0.0]
+
+    def tick():
+        now[0] += step
+        return now[0]
+    monkeypatch.setattr(pio_strip.time, "monotonic", tick)
+    return now
+
+
 def test_begin_uses_its_own_open_for_the_brightness_byte(tmp_path, monkeypatch):
     """The brightness byte counts against the frame buffer.
 
@@ -186,7 +200,75 @@ def test_write_failure_is_counted_not_raised(tmp_path, monkeypatch):
     monkeypatch.setattr("os.write", enospc)
     s.show()
     assert s.dropped_frames == 1
+    assert s.write_stats['errors'] == 1 and s.write_stats['collisions'] == 0
+
+
+def test_an_early_frame_is_held_not_slept_on(tmp_path, monkeypatch):
+    """300 LEDs × 24 bit at 800 kHz = 9 ms on the wire. The driver may run
+    under the controller's strip lock, so it never sleeps: a frame inside
+    that window is held back and the caller paces on busy_until."""
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    log = _fake_dev(monkeypatch)
+    monkeypatch.setattr("time.sleep", lambda s: pytest.fail("driver slept"))
+    now = [0.0]
+    monkeypatch.setattr(pio_strip.time, "monotonic", lambda: now[0])
+    s = PixelStrip(300, device=str(dev))
+    s.begin()
+    writes = len(log["writes"])
+    assert s.show() is True
+    assert 0.009 <= s.busy_until <= 0.009 + pio_strip.GUARD_MIN_S + 1e-9
+    now[0] = 0.005
+    assert s.show() is False and len(log["writes"]) == writes + 1
+    assert s.write_stats['held'] == 1 and s.dropped_frames == 0
+    now[0] = s.busy_until
+    assert s.show() is True and len(log["writes"]) == writes + 2
+
+
+def test_ebusy_is_a_collision_that_widens_the_guard(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    log = _fake_dev(monkeypatch)
+    s = PixelStrip(1, device=str(dev))
+    s.begin()
+    busy = [1]
 
+    def write(fd, data):
+        if busy[0]:
+            busy[0] -= 1
+            raise OSError(errno.EBUSY, "Device or resource busy")
+        log["writes"].append((fd, bytes(data)))
+        return len(data)
+
+    monkeypatch.setattr("os.write", write)
+    assert s.show() is False
+    st = s.write_stats
+    assert st['collisions'] == 1 and st['errors'] == 0 and s.dropped_frames == 1
+    assert st['guard_ms'] > pio_strip.GUARD_MIN_S * 1000.0    # guard widened
+    assert s.show() is True and s.write_stats['collisions'] == 1
+
+
+def test_multistrip_holds_a_busy_chain_without_counting_it_sick(monkeypatch):
+    from pio_strip import MultiStrip
+
+    class Fake:
+        def __init__(self, busy):
+            self._buf = bytearray(4); self._brightness = 255
+            self.busy_until = busy; self.writes = 0; self._held = 0
+        def getBrightness(self): return self._brightness
+        def hold(self): self._held += 1
+        def show_payload(self, payload, gain=255, duty=None):
+            self.writes += 1
+            return True
+
+    monkeypatch.setattr(pio_strip.time, "monotonic", lambda: 1.0)
+    free, busy = Fake(0.0), Fake(2.0)
+    m = MultiStrip([free, busy])
+    assert m.busy_until == 2.0
+    for _ in range(2 * pio_strip.HEALTH_MIN):
+        assert m.show() is False
+    assert busy.writes == 0 and busy._held == 2 * pio_strip.HEALTH_MIN
+    assert not m.chain_status()[1]['quarantined'] and m.chain_status()[1]['drop_rate'] == 0.0
 
 
 # ---- MultiStrip: second chain, mirrored ("analog") — 2026-08-06 -------------
@@ -203,7 +285,7 @@ def test_multistrip_mirrors_one_render_to_all_devices():
         def numPixels(self): return 2
         def setPixelColor(self, n, c):
             self._buf[n*4:n*4+3] = bytes([(c>>16)&255, (c>>8)&255, c&255])
-        def show_payload(self, payload, gain=255):
+        def show_payload(self, payload, gain=255, duty=None):
             self.payloads.append(bytes(payload)); return True
 
     a, b = Fake(), Fake()
@@ -223,7 +305,7 @@ def test_multistrip_show_is_false_if_any_chain_dropped():
         def __init__(self, ok):
             self._buf = bytearray(4); self._brightness = 255
             self.ok = ok; self.dropped_frames = 0
-        def show_payload(self, payload, gain=255):
+        def show_payload(self, payload, gain=255, duty=None):
             if not self.ok: self.dropped_frames += 1; return False
             return True
 
@@ -271,3 +353,175 @@ def test_pin_without_overlay_is_skipped_not_misassigned():
     assert "if m:\n            return m.get(int(pin))" in body or "return m.get(int(pin))" in body
     assert "if dev in belegt:" in src
     assert "if not dev or not os.path.exists(dev):" in src
+
+
+def test_multistrip_quarantines_a_failing_chain_and_reprobes_it(monkeypatch):
+    """A chain that drops most frames is parked: the healthy one keeps
+    proving black (show() True again) and the sick one gets a probe frame
+    every PROBE_S — one landed probe brings it back."""
+    import pio_strip
+    from pio_strip import MultiStrip
+
+    class Fake:
+        def __init__(self, ok):
+            self._buf = bytearray(4); self._brightness = 255
+            self.ok = ok; self.writes = 0
+        def getBrightness(self): return self._brightness
+        def setBrightness(self, b): self._brightness = b
+        def show_payload(self, payload, gain=255, duty=None):
+            self.writes += 1
+            return self.ok
+
+    clock = [0.0]
+    monkeypatch.setattr(pio_strip.time, "monotonic", lambda: clock[0])
+    good, bad = Fake(True), Fake(False)
+    m = MultiStrip([good, bad])
+    results = [m.show() for _ in range(pio_strip.HEALTH_MIN)]
+    assert results[-1] is False and m.chain_status()[1]['quarantined']
+    assert m.show() is True and bad.writes == pio_strip.HEALTH_MIN
+    clock[0] = pio_strip.PROBE_S
+    bad.ok = True
+    assert m.show() is True and bad.writes == pio_strip.HEALTH_MIN + 1
+    assert not m.chain_status()[1]['quarantined']
+
+
+def test_multistrip_never_parks_its_last_chain_and_hot_adds():
+    from pio_strip import MultiStrip
+
+    class Fake:
+        def __init__(self, ok):
+            self._buf = bytearray(4); self._brightness = 200
+            self.ok = ok; self.writes = 0
+        def getBrightness(self): return self._brightness
+        def setBrightness(self, b): self._brightness = b
+        def show_payload(self, payload, gain=255, duty=None):
+            self.writes += 1
+            return self.ok
+
+    only = Fake(False)
+    m = MultiStrip([only])
+    for _ in range(100):
+        assert m.show_payload(b"\0" * 4) is False
+    assert only.writes == 100, "the last chain keeps getting frames"
+    late = Fake(True)
+    late._brightness = 255
+    m.add(late)
+    assert late._brightness == 200, "a joining chain takes the group brightness"
+    m.show_payload(b"\0" * 4)
+    assert late.writes == 1
+
+
+def test_wire_time_comes_from_led_count_and_frequency():
+    assert PixelStrip(600).wire_time_s == pytest.approx(0.018)
+    assert PixelStrip(300, freq_hz=400000).wire_time_s == pytest.approx(0.018)
+    group = pio_strip.MultiStrip([PixelStrip(300), PixelStrip(900)])
+    assert group.wire_time_s == pytest.approx(0.027), "the slowest chain sets the pace"
+    assert [c['wire_ms'] for c in group.chain_status()] == [9.0, 27.0]
+
+
+def test_byte_sum_is_exact_across_chunks():
+    import random
+    rng = random.Random(7)
+    for size in (0, 1, 255, 256, 257, 2400, 3601):
+        data = bytes(rng.randrange(256) for _ in range(size))
+        assert pio_strip.byte_sum(data) == sum(data)
+    assert pio_strip.byte_sum(b"\xff" * 4096) == 255 * 4096
+
+
+def test_payload_current_counts_rgb_not_w():
+    frame = bytes((255, 0, 0, 255)) * 10             # W byte is not on the wire
+    assert pio_strip.payload_duty(frame) == 255 * 10
+    assert pio_strip.payload_current_a(frame) == pytest.approx(10 * (0.020 + 0.001))
+    assert pio_strip.payload_current_a(frame, gain=0) == pytest.approx(10 * 0.001)
+
+
+def test_written_frames_feed_the_rolling_current(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    _fake_dev(monkeypatch)
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    s = PixelStrip(10, device=str(dev))
+    s.begin()
+    assert s.current_stats == {'avg_a': 0.0, 'peak_a': 0.0}
+    white = bytes((255, 255, 255, 0)) * 10
+    s.show_payload(white)                           # 10 × 3 × 20 mA + 10 mA
+    s.show_payload(white, gain=0)                   # idle only
+    assert s.current_stats == {'avg_a': 0.31, 'peak_a': 0.61}
+
+    calls = []
+    monkeypatch.setattr(pio_strip, "payload_duty",
+                        lambda p: calls.append(p) or 0)
+    s.show_payload(white)
+    assert not calls, "a precomputed payload is summed once"
+
+
+def test_refused_frames_draw_no_current(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    _fake_dev(monkeypatch)
+    s = PixelStrip(10, device=str(dev))
+    s.begin()
+
+    def enospc(fd, data):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr("os.write", enospc)
+    s.show_payload(bytes((255, 255, 255, 0)) * 10)
+    assert s.current_stats['peak_a'] == 0.0
+
+
+def test_duty_is_summed_once_per_landed_frame(tmp_path, monkeypatch):
+    """A held frame pays nothing; a mirrored frame is summed once, not per chain."""
+    from pio_strip import MultiStrip
+    _fake_dev(monkeypatch)
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    strips = []
+    for k in range(2):
+        dev = tmp_path / f"leds{k}"
+        dev.write_bytes(b"")
+        strips.append(PixelStrip(10, device=str(dev)))
+        strips[-1].begin()
+    calls = []
+    real = pio_strip.payload_duty
+    monkeypatch.setattr(pio_strip, "payload_duty", lambda p: calls.append(1) or real(p))
+    m = MultiStrip(strips)
+    m.fill(0xFFFFFF)
+    assert m.show() is True
+    assert len(calls) == 1 and all(s.current_stats['peak_a'] > 0.5 for s in strips)
+    calls.clear()
+    strips[0]._busy_until = strips[1]._busy_until = pio_strip.time.monotonic() + 60.0
+    m.show()
+    strips[0].show()
+    assert not calls, "held frames must not be summed"
+
+
+def test_multistrip_hands_a_lost_chain_to_on_lost(monkeypatch):
+    """With a supervisor behind it the sick chain is detached, not parked —
+    even the primary, whose pixel buffer moves to the next chain."""
+    import pio_strip
+    from pio_strip import MultiStrip
+
+    class Fake:
+        def __init__(self, ok):
+            self._buf = bytearray(4); self._brightness = 255
+            self.ok = ok; self.writes = 0
+        def getBrightness(self): return self._brightness
+        def setBrightness(self, b): self._brightness = b
+        def show_payload(self, payload, gain=255, duty=None):
+            self.writes += 1
+            return self.ok
+
+    monkeypatch.setattr(pio_strip.time, "monotonic", lambda: 0.0)
+    bad, good = Fake(False), Fake(True)
+    lost = []
+    m = MultiStrip([bad, good], on_lost=lost.append)
+    bad._buf[:] = b"\x01\x02\x03\x04"
+    for _ in range(pio_strip.HEALTH_MIN):
+        m.show()
+    assert lost == [bad] and m._strips == [good] and m._p is good
+    assert good._buf == bytearray(b"\x01\x02\x03\x04")
+    assert m.show() is True and len(m.chain_status()) == 1
+    good.ok = False
+    for _ in range(2 * pio_strip.HEALTH_MIN):
+        m.show()
+    assert lost == [bad], "the last chain is never given up"
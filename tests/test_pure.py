@@ -83,7 +83,7 @@ def fade_toward_color(current, target, fade_amount: int):
 
 
 def fire_palette(colorindex: int):
-    """Copy of the heat→colour conversion in effect_fire."""
+    """Copy of the heat→colour conversion of the fire effect."""
     colorindex = min(255, max(0, colorindex))
     if colorindex < 85:
         return colorindex * 3, 0, 0
@@ -0,0 +1,55 @@
+"""realtime — render-thread pinning and the wake-up jitter meter."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import threading
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from realtime import JitterMeter, apply_realtime  # noqa: E402
+
+
+def test_jitter_percentiles_and_worst_case():
+    m = JitterMeter(window=100)
+    for i in range(100):
+        m.record(i / 1000.0)
+    m.record(-0.5)                      # early wake-ups count as on time
+    s = m.status()
+    assert s['p50_ms'] == 50.0 and s['p99_ms'] == 99.0
+    assert s['max_ms'] == 99.0 and s['samples'] == 100
+
+
+def test_empty_meter_reports_zero():
+    assert JitterMeter().status() == {'p50_ms': 0.0, 'p99_ms': 0.0,
+                                      'max_ms': 0.0, 'samples': 0}
+
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="Linux only")
+def test_pinning_applies_to_the_given_thread_only():
+    before = os.sched_getaffinity(0)
+    cpu = min(before)
+    seen = {}
+
+    def worker():
+        tid = threading.get_native_id()
+        seen['applied'] = apply_realtime(cpu=cpu, tid=tid)
+        seen['mask'] = os.sched_getaffinity(tid)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen['applied'] == {'cpu': cpu, 'priority': None, 'errors': []}
+    assert seen['mask'] == {cpu}
+    assert os.sched_getaffinity(0) == before, "the caller keeps its CPU set"
+
+
+def test_refusals_are_reported_not_raised():
+    applied = apply_realtime(cpu=10 ** 6)
+    assert applied['cpu'] is None and applied['errors']
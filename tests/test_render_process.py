@@ -0,0 +1,149 @@
+"""render_process — shared-memory command ring and status seqlock."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import time
+import uuid
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import render_process as rp  # noqa: E402
+from render_process import CommandRing, RenderClient, StateBlock  # noqa: E402
+
+
+@pytest.fixture
+def names():
+    tag = uuid.uuid4().hex[:8]
+    ring_name, state_name = rp.block_names(tag)
+    yield ring_name, state_name
+    for cls, name in ((CommandRing, ring_name), (StateBlock, state_name)):
+        try:
+            cls(name).close(unlink=True)
+        except FileNotFoundError:
+            pass
+
+
+def test_records_come_out_in_order_with_sequence_numbers(names):
+    ring = CommandRing(names[0])
+    assert [ring.push(p) for p in (b"a", b"bb", b"ccc")] == [1, 2, 3]
+    assert ring.pop_all() == [(1, b"a"), (2, b"bb"), (3, b"ccc")]
+    assert ring.pop_all() == [] and ring.pending() == 0
+    ring.close()
+
+
+def test_ring_wraps_around_without_splitting_a_record(names):
+    ring = CommandRing(names[0], size=32 + 100)       # 100 bytes of ring
+    seen = []
+    for i in range(40):
+        payload = bytes([i]) * (5 + i % 17)
+        assert ring.push(payload) is not None
+        seen.append(payload)
+        if i % 2:
+            assert [p for _, p in ring.pop_all()] == seen
+            seen = []
+    ring.close()
+
+
+def test_full_ring_drops_instead_of_blocking(names):
+    ring = CommandRing(names[0], size=32 + 64)
+    assert ring.push(b"x" * 40) == 1
+    assert ring.push(b"y" * 40) is None
+    assert ring.dropped == 1
+    assert ring.pop_all() == [(1, b"x" * 40)]
+    assert ring.push(b"y" * 40) == 2
+    ring.close()
+
+
+def test_a_record_not_yet_numbered_waits_for_the_next_poll(names):
+    ring = CommandRing(names[0])
+    ring.push(b"first")
+    ring.push(b"second")
+    # Simulate a head that became visible before the second record's bytes
+    at = rp._RING_HDR.size + rp._REC.size + len(b"first")
+    rp._REC.pack_into(ring.buf, at, 6, 0)
+    assert ring.pop_all() == [(1, b"first")]
+    rp._REC.pack_into(ring.buf, at, 6, 2)
+    assert ring.pop_all() == [(2, b"second")]
+    ring.close()
+
+
+def test_a_second_attach_sees_the_same_ring(names):
+    producer = CommandRing(names[0])
+    consumer = CommandRing(names[0])
+    producer.push(b"hello")
+    assert consumer.pop_all() == [(1, b"hello")]
+    # a restarted producer continues the numbering
+    producer.close()
+    producer = CommandRing(names[0])
+    assert producer.push(b"again") == 2
+    assert consumer.pop_all() == [(2, b"again")]
+    producer.close()
+    consumer.close()
+
+
+def test_commands_are_compact_typed_records():
+    for op, fields in (('power', (True, False)), ('warn_kick', (0.75, 0.0)),
+                       ('warn_event', ('roll', 0.18, 4)), ('solid', (True, 1, 2, 3, 255)),
+                       ('overlay', ('', 'add', False, 255, 255, 255)),
+                       ('zone_brightness', ('bar', -1))):
+        assert rp.decode_command(rp.encode_command(op, *fields)) == (op, fields)
+    assert rp.encode_command('color', 1, 2, 3) == bytes((9, 1, 2, 3))
+    with pytest.raises(ValueError):
+        rp.encode_command('color', 1, 2)
+    with pytest.raises(ValueError):
+        rp.decode_command(bytes((200,)))
+
+
+def test_state_block_publishes_whole_snapshots(names):
+    state = StateBlock(names[1])
+    assert state.read() is None
+    assert state.publish(b'{"a":1}')
+    assert state.publish(b'{"b":22}')
+    assert state.read() == b'{"b":22}'
+    assert not state.publish(b"x" * rp.STATE_BYTES)
+    rp._STATE_HDR.pack_into(state.buf, 0, 5, 0)          # writer mid-update
+    assert state.read() is None
+    state.close()
+
+
+def test_client_ignores_a_stale_snapshot(names):
+    client = RenderClient(CommandRing(names[0]), StateBlock(names[1]), 0)
+    client.state.publish(b'{"power":true,"published":100.0}')
+    assert client.snapshot(now=101.0)['power'] is True
+    assert client.snapshot(now=100.0 + rp.STALE_S + 1) is None
+    client.ring.close()
+    client.state.close()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="fork only")
+def test_commands_cross_the_process_boundary(names):
+    ring = CommandRing(names[0])
+    state = StateBlock(names[1])
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            got = []
+            deadline = time.monotonic() + 5.0
+            while len(got) < 3 and time.monotonic() < deadline:
+                got += [rp.decode_command(p) for _, p in ring.pop_all()]
+                time.sleep(0.001)
+            state.publish(repr(got).encode())
+            code = 0
+        finally:
+            os._exit(code)
+    client = RenderClient(ring, state, pid)
+    for i in range(3):
+        client.send('brightness', i)
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+    assert state.read() == repr([('brightness', (i,)) for i in range(3)]).encode()
+    ring.close()
+    state.close()
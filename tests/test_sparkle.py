@@ -0,0 +1,95 @@
+"""sparkle.SparklePool — ring semantics, LUT fade and the single-draw spawn."""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import sparkle  # noqa: E402
+
+
+class CountingRng(random.Random):
+    def __init__(self, seed):
+        super().__init__(seed)
+        self.draws = 0
+
+    def getrandbits(self, k):
+        self.draws += 1
+        return super().getrandbits(k)
+
+
+def test_fade_lut_is_the_old_factor_on_byte_levels():
+    assert sparkle.LEVEL_FADE == bytes(int(v * 0.9) for v in range(256))
+    level = 255
+    for _ in range(sparkle.LIFE):
+        assert level >= sparkle.LEVEL_MIN
+        level = sparkle.LEVEL_FADE[level]
+    assert level < sparkle.LEVEL_MIN
+
+
+def test_spawn_is_one_draw_and_bounded_by_the_slots():
+    rng = CountingRng(5)
+    pool = sparkle.SparklePool(300, 6, rng=rng)
+    for _ in range(50):
+        before = rng.draws
+        k = pool.spawn(0.5)
+        assert rng.draws == before + 1
+        assert 0 <= k <= 6
+    assert pool.spawn(0.0) == 0 and rng.draws == 50
+
+
+def test_spawn_rate_matches_the_per_slot_probability():
+    pool = sparkle.SparklePool(1000, 10, rng=random.Random(9))
+    total = sum(pool.spawn(0.3) for _ in range(2000))
+    assert abs(total / 2000 - 3.0) < 0.15
+
+
+def test_particles_retire_after_their_life():
+    pool = sparkle.SparklePool(2000, 4, rng=random.Random(1))
+    for _ in range(500):
+        pool.step(1.0)
+    assert pool.count <= 4 * sparkle.LIFE     # full rate: at most slots × LIFE alive
+    assert pool.count >= 4 * sparkle.LIFE - 10, "collisions only"
+    for _ in range(sparkle.LIFE - 1):
+        pool.step(0.0)
+    assert pool.count and min(v for v in pool.plane if v) >= sparkle.LEVEL_MIN
+    pool.step(0.0)
+    assert pool.count == 0 and not any(pool.plane)
+
+
+def test_plane_fade_is_the_old_fade_with_the_cut_off():
+    for v in range(256):
+        old = sparkle.LEVEL_FADE[v]
+        assert sparkle.PLANE_FADE[v] == (old if old >= sparkle.LEVEL_MIN else 0)
+    level, frames = 255, 0
+    while level:
+        level = sparkle.PLANE_FADE[level]
+        frames += 1
+    assert frames == sparkle.LIFE, "zeroed exactly when the ring used to retire it"
+
+
+def test_render_newest_wins_and_levels_index_the_luts():
+    pool = sparkle.SparklePool(8, 1, rng=random.Random(0))
+    pool.plane[3] = 100
+    pool.plane[3] = 255                        # a newer particle on the same LED
+    pool.plane[6] = 40
+    luts = sparkle.level_luts((255, 128, 0))
+    out = pool.render(luts)
+    assert out[12:16] == bytes((255, 128, 0, 0))
+    assert out[24:28] == bytes((40, 20, 0, 0))
+    assert out[0:12] == bytes(12) and out[28:] == bytes(4)
+
+
+def test_render_cost_does_not_depend_on_live_particles():
+    """Same number of byte passes whether 1 or every LED is lit."""
+    luts = sparkle.level_luts((255, 255, 255))
+    sparse, full = sparkle.SparklePool(600, 1), sparkle.SparklePool(600, 1)
+    sparse.plane[10] = 255
+    full.plane[:] = bytes([200]) * 600
+    assert sparse.render(luts)[40:44] == bytes((255, 255, 255, 0))
+    assert full.render(luts) == bytes((200, 200, 200, 0)) * 600
@@ -0,0 +1,81 @@
+"""Startup path: one dmesg parse per process, boot frame before Flask."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import subprocess
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+if 'flask_cors' not in sys.modules:
+    try:
+        import flask_cors  # noqa: F401
+    except ImportError:
+        import types
+        sys.modules['flask_cors'] = types.SimpleNamespace(CORS=lambda app: None)
+
+import web_controller as wc  # noqa: E402
+
+DMESG = ("a ws2812-pio-rp1 x: Instantiated 600 LEDs on GPIO 18 as /dev/leds0\n"
+         "b ws2812-pio-rp1 y: Instantiated 600 LEDs on GPIO 21 as /dev/leds1\n")
+
+
+def test_dmesg_is_read_once_for_all_chains(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=DMESG)
+
+    monkeypatch.setattr(subprocess, 'run', fake_run)
+    monkeypatch.setattr(wc, '_PIO_MAP', None)
+    assert wc.resolve_pio_device(21, [18, 21]) == "/dev/leds1"
+    assert wc.resolve_pio_device(18, [18, 21]) == "/dev/leds0"
+    assert wc.resolve_pio_device(12, [12, 18, 21]) is None
+    assert len(calls) == 1
+
+
+def test_unreadable_dmesg_falls_back_to_pin_rank(monkeypatch):
+    def broken(cmd, **kw):
+        raise OSError("no dmesg")
+
+    monkeypatch.setattr(subprocess, 'run', broken)
+    monkeypatch.setattr(wc, '_PIO_MAP', None)
+    assert wc.resolve_pio_device(21, [21, 18]) == "/dev/leds1"
+
+
+def _config(tmp_path, dev, **led):
+    led_cfg = {'pin': 21, 'led_count': 3}
+    led_cfg.update(led)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({'led_config': led_cfg}))
+    return str(path)
+
+
+def test_boot_frame_lights_every_resolved_chain(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    monkeypatch.setattr(wc, '_PIO_MAP', {21: str(dev)})
+    ms = wc.light_boot_frame(_config(tmp_path, dev, boot_frame=[10, 20, 30]))
+    assert ms is not None and ms >= 0
+    assert dev.read_bytes() == bytes((10, 20, 30, 0)) * 3
+
+
+def test_boot_frame_can_be_switched_off(tmp_path, monkeypatch):
+    dev = tmp_path / "leds0"
+    dev.write_bytes(b"")
+    monkeypatch.setattr(wc, '_PIO_MAP', {21: str(dev)})
+    assert wc.light_boot_frame(_config(tmp_path, dev, boot_frame=[])) is None
+    assert dev.read_bytes() == b""
+    monkeypatch.setattr(wc, '_PIO_MAP', {})
+    assert wc.light_boot_frame(str(tmp_path / "missing.json")) is None
+
+
+def test_boot_frame_runs_before_flask_is_imported():
+    src = (_ROOT / "web_controller.py").read_text()
+    assert src.index("BOOT_FRAME_MS = light_boot_frame()") < src.index("from flask import")
+    assert 'startup' in wc.controller.get_status()
@@ -0,0 +1,61 @@
+"""transitions — LUT-pair crossfade and the capture strip, no hardware."""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import transitions  # noqa: E402
+from pio_strip import Color  # noqa: E402
+
+
+def test_blend_is_the_per_byte_mix():
+    rng = random.Random(4)
+    a = bytes(rng.randrange(256) for _ in range(2400))
+    b = bytes(rng.randrange(256) for _ in range(2400))
+    for g in (1, 64, 128, 200, 254):
+        expected = bytes(x * (255 - g) // 255 + y * g // 255 for x, y in zip(a, b))
+        assert transitions.crossfade(a, b, g) == expected
+
+
+def test_blend_endpoints_and_saturated_inputs():
+    a, b = bytes([255]) * 40, bytes([255]) * 40
+    for g in range(256):
+        out = transitions.crossfade(a, b, g)
+        assert len(out) == 40 and max(out) <= 255
+    assert transitions.crossfade(b"\x01\x02", b"\x03\x04", 0) == b"\x01\x02"
+    assert transitions.crossfade(b"\x01\x02", b"\x03\x04", 255) == b"\x03\x04"
+    assert transitions.crossfade(bytes(4), bytes(4), 100) == bytes(4)
+
+
+def test_capture_keeps_frames_in_payload_layout():
+    cap = transitions.FrameCapture(3)
+    cap.setPixelColor(1, Color(10, 20, 30))
+    cap.setPixelColor(7, Color(1, 1, 1))            # out of range: ignored
+    assert cap.show() is True
+    assert cap.payload == bytes([0, 0, 0, 0, 10, 20, 30, 0, 0, 0, 0, 0])
+    assert cap.getPixelColor(1) == Color(10, 20, 30)
+    cap.show_payload(bytes([200, 100, 0, 0]) * 3, 128)
+    assert cap.payload[:4] == bytes([200 * 128 // 255, 100 * 128 // 255, 0, 0])
+    assert cap.getBrightness() == 255, "the real driver applies its LUT once, on the blend"
+
+
+def test_gain_ramps_over_the_duration():
+    tr = transitions.Crossfade('fire', None, 10, 0.5, now=100.0)
+    assert tr.gain(100.0) == 0
+    assert tr.gain(100.25) == 127
+    assert tr.gain(101.0) == 255
+    assert transitions.Crossfade('fire', None, 10, 0.0, now=0.0).gain(0.0) == 255
+
+
+def test_gain_follows_an_easing_curve():
+    import easing
+    tr = transitions.Crossfade('fire', None, 10, 0.5, now=100.0,
+                               curve=easing.table('ease-in'))
+    assert tr.gain(100.0) == 0 and tr.gain(101.0) == 255
+    assert tr.gain(100.25) == int(255 * easing.solve(0.5, easing.NAMED['ease-in'])) < 127
@@ -0,0 +1,98 @@
+"""zones — zone map validation, due-only rendering, one-pass assembly."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+_ROOT = pathlib.Path(__file__).parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+import zones  # noqa: E402
+
+
+def _map():
+    return zones.ZoneMap.from_config([
+        {'name': 'bar', 'start': 0, 'end': 4, 'effect': 'fire', 'speed': 91},   # 10 ms
+        {'name': 'door', 'start': 6, 'end': 8, 'effect': 'solid'},
+    ], 10)
+
+
+def _painter(log):
+    def render(zone):
+        log.append(zone.name)
+        zone.capture.fill(0x00FF0000 if zone.name == 'bar' else 0x000000FF)
+        zone.capture.show()
+    return render
+
+
+def test_bad_maps_are_rejected():
+    with pytest.raises(ValueError):
+        zones.ZoneMap([zones.Zone('a', 0, 5), zones.Zone('b', 4, 8)], 10)
+    with pytest.raises(ValueError):
+        zones.ZoneMap([zones.Zone('a', 0, 12)], 10)
+    with pytest.raises(ValueError):
+        zones.ZoneMap([zones.Zone('a', 0, 2), zones.Zone('a', 2, 4)], 10)
+
+
+def test_payload_is_assembled_with_black_gaps():
+    zm, log = _map(), []
+    out = zm.render(_painter(log), 255, True, now=0.0)
+    assert len(out) == 40
+    assert out[:16] == bytes((255, 0, 0, 0)) * 4
+    assert out[16:24] == bytes(8) and out[32:] == bytes(8)
+    assert out[24:32] == bytes((0, 0, 255, 0)) * 2
+
+
+def test_only_due_zones_rerender_and_static_zones_cost_nothing():
+    zm, log = _map(), []
+    render = _painter(log)
+    zm.render(render, 255, True, now=0.0)
+    assert log == ['bar', 'door']
+    del log[:]
+    assert zm.render(render, 255, True, now=0.005) is None    # nothing due
+    zm.render(render, 255, True, now=0.011)
+    assert log == ['bar'], "the solid zone is never re-run"
+    del log[:]
+    zm.render(render, 100, True, now=0.012)                   # master brightness moved
+    assert 'door' in log
+
+
+def test_unchanged_frame_is_resent_for_healing():
+    zm = zones.ZoneMap.from_config([{'name': 'a', 'start': 0, 'end': 2}], 2)
+    render = _painter([])
+    assert zm.render(render, 255, True, now=0.0) is not None
+    assert zm.render(render, 255, True, now=1.0) is None
+    assert zm.render(render, 255, True, now=0.0 + zones.HEAL_S + 0.1) is not None
+
+
+def test_sleep_hint_follows_the_next_moving_zone():
+    zm = _map()
+    zm.render(_painter([]), 255, True, now=0.0)
+    assert zm.sleep_hint(now=0.004) == pytest.approx(0.006)
+    still = zones.ZoneMap([zones.Zone('a', 0, 2)], 2)
+    assert still.sleep_hint(now=0.0) == 0.1
+
+
+def test_zone_view_is_an_explicit_host_not_a_proxy():
+    zone = zones.Zone('a', 0, 4, color=(200, 100, 0), brightness=128)
+    asked = []
+
+    def ramp(n, rgb, lo):
+        asked.append((n, rgb, lo))
+        return [bytes((k * 50, 0, 0, 0)) * n for k in range(5)]
+    view = zones.ZoneView(zone, 255, ramp)
+    assert view.strip is zone.capture and view.anim_clock is zone.clock
+    assert view.effect_params is zone.params and view.brightness == 128
+    for name in ('clear', 'set_pixel', '_strip_lock', 'frame_cache'):
+        assert not hasattr(view, name), f"{name} must not leak in from the controller"
+    with pytest.raises(AttributeError):
+        view.anything = 1
+    view._show_plane(bytes((255, 2, 0, 0)) * 4)
+    assert zone.capture.payload == bytes((128, 1, 0, 0)) * 4, "zone brightness is the gain"
+    view._show_level(0.55, 0.1)
+    assert asked == [(4, (200, 100, 0), 0.1)]
+    assert zone.capture.payload == bytes((50, 0, 0, 0)) * 4, "middle step, zone gain"
@@ -1,20 +1,136 @@
 #!/usr/bin/env python3
 
+import time
+_T_START = time.monotonic()     # Startzeit-Log: Boot-Frame, bereit, erster Frame
 import os
 import threading
-import time
+import glob
 import json
 import signal
 import sys
-from flask import Flask, render_template, request, jsonify
-from flask_cors import CORS
 try:
     from pio_strip import MultiStrip, PixelStrip, Color  # Pi 5: ws2812-pio /dev/leds0
+    _PIO = True
 except ImportError:
     from rpi_ws281x import PixelStrip, Color
+    _PIO = False
+
+BOOT_RGB = (24, 6, 0)           # led_config.boot_frame; [] = kein Boot-Frame
+
+
+def parse_pio_map(dmesg_text):
+    """GPIO -> /dev/ledsN aus den Kernel-Meldungen des ws2812-pio-Treibers.
+
+    Der Kernel nummeriert die Devices nach DT-Unit-Adresse (aufsteigender
+    GPIO), NICHT nach Overlay-Reihenfolge in der config.txt. Beobachtet
+    2026-08-06: gpio=18 zusaetzlich zu gpio=21 machte GPIO 18 zu leds0 und
+    schob die BESTEHENDE Kette auf leds1 — der Dienst schrieb weiter auf
+    leds0, also auf den falschen Pin. Genau das war die "Farbverschiebung"
+    vom 05.08. Deshalb: nie Namen aus der Config glauben, immer aufloesen.
+    Bei mehreren Eintraegen pro GPIO (Re-Bind) gewinnt der letzte.
+    """
+    import re
+    m = {}
+    for g, d in re.findall(r"ws2812[^\n]*?GPIO (\d+) as (/dev/leds\d+)", dmesg_text):
+        m[int(g)] = d
+    return m
+
+
+_PIO_MAP = None
+
+
+def pio_device_map(refresh=False):
+    """parse_pio_map ueber dmesg — EINMAL pro Prozess (Boot-Frame und alle
+    Ketten teilen sich den Aufruf; vorher ein dmesg mit 3-s-Timeout je Kette).
+    refresh: neu lesen (Hot-Plug-Supervisor, wenn /dev/leds* sich aendert).
+    """
+    global _PIO_MAP
+    if _PIO_MAP is None or refresh:
+        try:
+            import subprocess
+            out = subprocess.run(["dmesg"], capture_output=True, text=True, timeout=3).stdout
+            _PIO_MAP = parse_pio_map(out)
+        except Exception:
+            _PIO_MAP = {}
+    return _PIO_MAP
+
+
+def resolve_pio_device(pin, pins_sorted):
+    """Device fuer einen GPIO: dmesg-Wahrheit, sonst Rang in sortierter Pin-Liste.
+
+    Kennt dmesg den Treiber, ist seine Karte VOLLSTAENDIG: ein Pin ohne
+    Eintrag hat KEIN Device (Overlay aus) und liefert None — Kette wird
+    uebersprungen. Der Rang-Fallback gilt nur, wenn dmesg gar nicht lesbar
+    ist. Vorher fiel ein overlay-loser Pin in den Fallback und landete auf
+    Rang 0 = dem Device der ERSTEN Kette: zwei Ketten auf einem Device,
+    jeder zweite Write EBUSY, und der bewiesene Clear konnte nie latchen.
+    """
+    m = pio_device_map()
+    if m:
+        return m.get(int(pin))
+    # Fallback = dieselbe Ordnung, nach der der Kernel nummeriert.
+    return "/dev/leds%d" % sorted(pins_sorted).index(int(pin))
+
+
+def light_boot_frame(config_file='config.json'):
+    """Dimmer "Booting"-Frame auf jede Kette, BEVOR Flask & Co. importiert sind.
+
+    Ein Deploy-Neustart liess den Strip sekundenlang dunkel (Importe, dmesg je
+    Kette); jetzt zeigt er nach wenigen ms, dass der Dienst hochfaehrt. Der
+    Controller uebernimmt danach wie gewohnt. Liefert ms seit Prozessstart
+    oder None (kein Frame: aus, keine Hardware, fremder Treiber).
+    """
+    if not _PIO:
+        return None
+    try:
+        with open(config_file, 'r') as f:
+            cfg = json.load(f)
+        led_cfg = cfg['led_config']
+    except (OSError, ValueError, KeyError):
+        return None
+    rgb = led_cfg.get('boot_frame', BOOT_RGB)
+    if not rgb:
+        return None
+    chains = cfg.get('strips') or [{'pin': led_cfg['pin'], 'led_count': led_cfg['led_count']}]
+    pins = [int(c.get('pin', led_cfg['pin'])) for c in chains]
+    lit = False
+    for c in chains:
+        dev = resolve_pio_device(int(c.get('pin', led_cfg['pin'])), pins)
+        if not dev or not os.path.exists(dev):
+            continue
+        st = PixelStrip(int(c.get('led_count', led_cfg['led_count'])), device=dev)
+        try:
+            st.begin()
+        except (RuntimeError, OSError):
+            continue
+        st.fill(Color(*rgb[:3]))
+        lit = st.show() is not False or lit
+    return round((time.monotonic() - _T_START) * 1000.0, 1) if lit else None
+
+
+# Boot-Frame vor den schweren Importen (Flask, Effekt-Module, Tabellen)
+BOOT_FRAME_MS = light_boot_frame()
+
+from flask import Flask, render_template, request, jsonify
+from flask_cors import CORS
+import easing
+import effect_registry
 import iris_wash
+import render_process
+import animation
+from fire import FireEngine
+from frame_cache import FrameCache
+from chain_supervisor import ChainSupervisor
+from governor import LoadGovernor
+from realtime import JitterMeter, apply_realtime
+from transitions import Crossfade, FrameCapture
+from compositor import MODES as COMPOSITE_MODES, Compositor
+from zones import ZoneMap, ZoneView
+from sparkle import SparklePool, level_luts
 import math
 import random
+from concurrent.futures import ThreadPoolExecutor
+import colorsys
 
 # Strip-Warn pacing. The WS2812 shift-out for 600 LEDs is 18 ms (55.6 fps
 # ceiling); a 1.8 s breathe ramp is perfectly smooth at 30 fps, and the extra
@@ -115,52 +231,68 @@ def iris_red_envelope(u):
     return floor + (1.0 - floor) * g * g
 
 
-app = Flask(__name__)
-CORS(app)
+def _hsv_chunk(h):
+    r, g, b = colorsys.hsv_to_rgb(h, 1.0, 1.0)
+    return bytes((int(r * 255), int(g * 255), int(b * 255), 0))
 
 
-def parse_pio_map(dmesg_text):
-    """GPIO -> /dev/ledsN aus den Kernel-Meldungen des ws2812-pio-Treibers.
+# Periodic effects render whole periods into the frame cache from these.
+RAMP_STEPS = 256                      # pulse/breathe level resolution
+CLEAR_GAP_S = 0.025                   # black burst: EBUSY window is the 18 ms shift-out
+STATUS_S = 0.1                        # /api/status re-publish while nothing changes
+WIRE_SLACK_S = 0.002                  # write floor = device shift-out + reset/latch slack
+THEATER_HUES = tuple(_hsv_chunk(k / 255.0) for k in range(255))
+HUE_STEPS = 1536                      # 6 sextants x 256: every 8-bit hue
+HUE_CHUNKS = tuple(_hsv_chunk(k / HUE_STEPS) for k in range(HUE_STEPS))
 
-    Der Kernel nummeriert die Devices nach DT-Unit-Adresse (aufsteigender
-    GPIO), NICHT nach Overlay-Reihenfolge in der config.txt. Beobachtet
-    2026-08-06: gpio=18 zusaetzlich zu gpio=21 machte GPIO 18 zu leds0 und
-    schob die BESTEHENDE Kette auf leds1 — der Dienst schrieb weiter auf
-    leds0, also auf den falschen Pin. Genau das war die "Farbverschiebung"
-    vom 05.08. Deshalb: nie Namen aus der Config glauben, immer aufloesen.
-    Bei mehreren Eintraegen pro GPIO (Re-Bind) gewinnt der letzte.
-    """
-    import re
-    m = {}
-    for g, d in re.findall(r"ws2812[^\n]*?GPIO (\d+) as (/dev/leds\d+)", dmesg_text):
-        m[int(g)] = d
-    return m
 
+# Effect registry (effect_registry.py): what /api/effect resets on a switch,
+# plus the drop-in plugins from effect_plugins/
+def _fresh(*keys, clock=False):
+    """Reset hook: `keys` of effect_params back to None, optionally a new clock."""
+    def reset(c):
+        if clock:
+            c.anim_clock.reset()
+        for k in keys:
+            c.effect_params[k] = None
+    return reset
 
-def resolve_pio_device(pin, pins_sorted):
-    """Device fuer einen GPIO: dmesg-Wahrheit, sonst Rang in sortierter Pin-Liste.
 
-    Kennt dmesg den Treiber, ist seine Karte VOLLSTAENDIG: ein Pin ohne
-    Eintrag hat KEIN Device (Overlay aus) und liefert None — Kette wird
-    uebersprungen. Der Rang-Fallback gilt nur, wenn dmesg gar nicht lesbar
-    ist. Vorher fiel ein overlay-loser Pin in den Fallback und landete auf
-    Rang 0 = dem Device der ERSTEN Kette: zwei Ketten auf einem Device,
-    jeder zweite Write EBUSY, und der bewiesene Clear konnte nie latchen.
-    """
+def _reset_gradient(c):
+    c.anim_clock.reset()
+    c.effect_params['gradient_salt'] = random.getrandbits(32)
+
+
+def _reset_iris_warn(c):
+    _fresh('iris_t0', 'iris_lit', 'iris_sparking')(c)
+    c.effect_params['iris_spark_until'] = 0.0
+
+
+EFFECTS = effect_registry.Registry()
+for _name in ('breathe', 'pulse', 'chase', 'theater'):
+    EFFECTS.on_reset(_name, _fresh(clock=True))
+EFFECTS.on_reset('gradient', _reset_gradient)
+EFFECTS.on_reset('iris_warn', _reset_iris_warn)
+for _mod, _err in EFFECTS.discover().items():
+    print(f"Effekt-Plugin {_mod} nicht geladen: {_err}")
+
+
+app = Flask(__name__)
+CORS(app)
+
+
+def _begin_strip(st):
     try:
-        import subprocess
-        out = subprocess.run(["dmesg"], capture_output=True, text=True, timeout=3).stdout
-        m = parse_pio_map(out)
-        if m:
-            return m.get(int(pin))
-    except Exception:
-        pass
-    # Fallback = dieselbe Ordnung, nach der der Kernel nummeriert.
-    return "/dev/leds%d" % sorted(pins_sorted).index(int(pin))
+        st.begin()
+        return None
+    except (RuntimeError, OSError) as e:   # OSError: EBUSY hinter dem Boot-Frame
+        return e
 
 
 class LichtwerkWebController:
     def __init__(self, config_file='config.json'):
+        # Render-target override for the effect thread (see `strip`)
+        self._render_local = threading.local()
         with open(config_file, 'r') as f:
             self.config = json.load(f)
         
@@ -178,8 +310,12 @@ class LichtwerkWebController:
             'device': '/dev/leds0',
         }]
         working = []
+        pending = []
+        missing = []                   # -> Hot-Plug-Supervisor
         belegt = set()
         pins = [int(c.get('pin', led_cfg['pin'])) for c in chains]
+        self._chain_pins = pins
+        self._chain_cfg = {}           # device -> chain config, for the rebuild
         for c in chains:
             pin = int(c.get('pin', led_cfg['pin']))
             # config['device'] wird BEWUSST ignoriert: die leds-Nummern haengen
@@ -188,35 +324,47 @@ class LichtwerkWebController:
             dev = resolve_pio_device(pin, pins)
             if not dev or not os.path.exists(dev):
                 print(f"Kette GPIO {pin} ({dev}) nicht vorhanden — uebersprungen")
+                missing.append(dict(c, pin=pin))
                 continue
             if dev in belegt:
                 print(f"Kette GPIO {pin}: {dev} schon belegt — uebersprungen")
                 continue
             belegt.add(dev)
-            st = PixelStrip(
-                c.get('led_count', led_cfg['led_count']),
-                pin,
-                led_cfg['led_freq_hz'],
-                led_cfg['led_dma'],
-                led_cfg['led_invert'],
-                led_cfg['led_brightness'],
-                led_cfg['led_channel'],
-                device=dev,
-            )
-            try:
-                st.begin()
+            pending.append((c, pin, dev, self._make_strip(c, pin, dev)))
+        # begin() oeffnet jedes Device — alle Ketten parallel statt nacheinander
+        with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+            results = list(pool.map(_begin_strip, [st for _, _, _, st in pending]))
+        for (c, pin, dev, st), err in zip(pending, results):
+            if err is None:
                 working.append(st)
                 print(f"Kette aktiv: GPIO {pin} -> {dev}")
-            except RuntimeError as e:
-                print(f"Warning: LED strip init failed ({dev}): {e}")
+            else:
+                print(f"Warning: LED strip init failed ({dev}): {err}")
+                belegt.discard(dev)
+                missing.append(dict(c, pin=pin))
+        # Fehlende Ketten: der Supervisor versucht es mit Backoff weiter und
+        # haengt sie ohne Neustart an (chain_supervisor.py). Er laeuft auch
+        # ohne fehlende Kette: MultiStrip reicht ihm Ketten, die erst im
+        # Betrieb ausfallen (Quarantaene), zum Neu-Aufloesen weiter.
+        self._seen_leds = sorted(glob.glob('/dev/leds*'))
+        self.chain_supervisor = None
+        if led_cfg.get('hotplug', True) and _PIO:
+            self.chain_supervisor = ChainSupervisor(
+                missing, self._resolve_chain, self._build_chain, self._attach_chain,
+                claimed=belegt)
         if not working:
             print("Running in demo mode without hardware...")
             self.strip = None
         elif len(working) == 1:
             self.strip = working[0]
         else:
-            self.strip = MultiStrip(working)
-        
+            self.strip = self._multi_strip(working)
+        # Temporales Dithering in der Ausgabestufe (dither.py): die LUT-Mini-
+        # Duties (G~6) verlieren ihren Nachkommaanteil nicht mehr, sondern
+        # verteilen ihn ueber 4 Frames. Default aus — Schalter in led_config.
+        if self.strip is not None and hasattr(self.strip, 'setDither'):
+            self.strip.setDither(bool(led_cfg.get('dither', False)))
+
         # Konfigurierte Anlagen-Helligkeit der Strip-LUT — der Blinder
         # neutralisiert sie pro Frame und stellt sie danach wieder her.
         self.strip_lut_default = int(led_cfg.get('led_brightness', 255))
@@ -225,12 +373,15 @@ class LichtwerkWebController:
         # State variables
         self.running = True
         self.power = False
+        # Name -> renderer, built once; current_effect caches its entry
+        self._effect_table = self._build_effects()
         self.current_effect = 'solid'
         self.brightness = 100
         self.speed = 50
         self.color = [255, 255, 255]
         self.theater_rainbow = True  # Toggle for theater effect
         self.effect_thread = None
+        self.supervisor_thread = None
         # Strip-Warn: exclusive ownership while disco Strip-Warn is armed
         self.strip_warn_over = False   # mirrors page body.over-iris
         self.strip_warn_mode = False   # True while Strip-Warn owns the strip
@@ -241,10 +392,18 @@ class LichtwerkWebController:
         # the exposure; leave it null to render at full exposure.
         wash_cfg = self.config.get('iris_wash') or {}
         self._wash_steps = max(2, int(wash_cfg.get('steps', iris_wash.DEFAULT_STEPS)))
+        # `keyframes`: store only that many frames and blend neighbours at
+        # playback — continuous breathe at a fraction of the memory.
+        keys = int(wash_cfg.get('keyframes') or 0)
+        self._wash_interp = 2 <= keys < self._wash_steps
+        if self._wash_interp:
+            self._wash_steps = keys
+        # The shared ramp LRU holds one ramp per configured chain length
+        lengths = {int(c.get('led_count', led_cfg['led_count'])) for c in chains}
+        lengths.add(int(led_cfg['led_count']))
+        iris_wash.FRAME_CACHE.fit(sum(self._wash_steps * n * 4 for n in lengths))
         self._wash_exposure = float(wash_cfg.get('exposure', iris_wash.DEFAULT_EXPOSURE))
         self._wash_max_current_a = wash_cfg.get('max_current_a') or None
-        self._wash_cache = ()
-        self._wash_n = 0
         self._wash_t0 = None           # breathe origin; None while idle
         self._wash_fade_t0 = None      # release ramp origin; None when not fading
         self._wash_fade_from = 0       # frame the fade started from
@@ -253,30 +412,229 @@ class LichtwerkWebController:
         wp = wash_cfg.get('white_point') or iris_wash.WHITE_POINT
         self._wash_white_point = tuple(max(0, min(255, int(v))) for v in wp)
         self._wash_sparks_on = bool(wash_cfg.get('sparks', True))
-        self._wash_shimmer_on = bool(wash_cfg.get('shimmer', True))
-        self._wash_sparks = []         # [(centre_led, age_s), ...]
+        # Shimmer is opt-in: its band edges blend ~30 LEDs each and miss the
+        # 0.03 ms/frame overlay budget that sparks alone hold
+        self._wash_shimmer_on = bool(wash_cfg.get('shimmer', False))
+        self._wash_sparks = []         # [(centre_led, born_s), ...]
         self._wash_spark_ts = None
         self._wash_kernel = iris_wash.spark_kernel()
+        self._wash_origin = 0.0        # shimmer travel origin (engage time)
+        self._wash_phase = tuple(iris_wash.ease(s / (self._wash_steps - 1))
+                                 for s in range(self._wash_steps))
+        self._wash_highlights = None   # iris_wash.HighlightTables, built on first use
         
         # Effect parameters
-        self.effect_params = {
-            'rainbow_offset': 0,
-            'pulse_direction': 1,
-            'pulse_brightness': 0.1,
-            'chase_position': 0,
-            'sparkle_pixels': [],
-            'meteor_positions': [],
-            'breathe_direction': 1,
-            'breathe_brightness': 0.1
-        }
+        self.effect_params = {}
+        # pulse/breathe/chase/theater/gradient and the sinelon/juggle plugins
+        # are functions of this clock; the periodic ones play back from the
+        # frame cache
+        self.anim_clock = animation.Clock()
+        self.frame_cache = FrameCache()
+        # Crossfade on /api/effect (transitions.py); 0 = hard cut as before
+        self.transition_s = max(0.0, float(led_cfg.get('transition_s', 0.5)))
+        # CSS timing function of the crossfade ('ease-in-out', 'cubic-bezier(…)');
+        # unset = linear
+        curve = led_cfg.get('transition_curve')
+        self.transition_curve = None
+        if curve:
+            try:
+                self.transition_curve = easing.table(curve)
+            except ValueError as e:
+                print(f"transition_curve ignoriert (linear): {e}")
+        self._transition = None
+        # Overlay layer over the running effect (compositor.py), e.g. white
+        # sparkles over a gradient; None = the effect owns the strip alone
+        self.overlay_effect = None
+        self.overlay_mode = 'add'
+        self.overlay_color = [255, 255, 255]
+        self._overlay_sparkle = None   # sparkle.SparklePool of the overlay
+        self._overlay_luts = (None, None)   # (rgb, sparkle.level_luts(rgb))
+        self._layer_stack = None
+        # Load governor (governor.py): render time over budget -> cheaper
+        # quality level (coarser glow, fewer sparks, lower fps), back up on headroom
+        self.governor = LoadGovernor(float(led_cfg.get('render_budget_ms', 12)) / 1000.0)
+        # led_config.realtime {"cpu": 3, "priority": 50}: pin the render
+        # thread and run it SCHED_FIFO (realtime.py); wake-up jitter is always measured
+        self.realtime_cfg = led_cfg.get('realtime') or {}
+        self.realtime = None
+        self.jitter = JitterMeter()
+        # led_config.render_process: the strip belongs to a forked renderer
+        # fed through shared memory (render_process.py); started from __main__
+        self.render_process = bool(led_cfg.get('render_process', False))
+        self._render_client = None
+        self.renderer_info = None
+        # Zone map (zones.py): config['zones'] carves the strip into named
+        # ranges; the 'zones' effect runs them. Bad maps are reported, not fatal.
+        self.zones = None
+        if self.config.get('zones'):
+            n = self.strip.numPixels() if self.strip else int(led_cfg['led_count'])
+            try:
+                self.zones = ZoneMap.from_config(self.config['zones'], n)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Zonen-Konfiguration ignoriert: {e}")
+        # Per-effect frame rate: derived from motion (animation.target_fps),
+        # led_config.effect_fps pins it per effect; both capped by the wire
+        self.effect_fps = {k: float(v) for k, v in (led_cfg.get('effect_fps') or {}).items()}
         self._cleared = False          # skip redundant black show() when already dark
+        self._black_burst = None       # (due, strip): clear()'s second black frame, pending
         self._effect_wake = threading.Event()
+        # /api/status snapshot: (dict, JSON bytes), built by the render thread
+        # and swapped whole — requests read one reference, never render state
+        self._status = None
+        self._status_ts = 0.0
+        self._status_dirty = True
         
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
+
+        # Startzeit (ms seit Prozessstart), erster Frame traegt der Loop nach
+        self.startup = {'boot_frame_ms': BOOT_FRAME_MS,
+                        'ready_ms': round((time.monotonic() - _T_START) * 1000.0, 1),
+                        'first_frame_ms': None}
+        print(f"Startup: Boot-Frame {BOOT_FRAME_MS} ms, Controller bereit {self.startup['ready_ms']} ms")
         
         self.start_effect_loop()
     
+    def _make_strip(self, chain, pin, dev):
+        led_cfg = self.config['led_config']
+        self._chain_cfg[dev] = dict(chain, pin=pin)
+        return PixelStrip(
+            chain.get('led_count', led_cfg['led_count']),
+            pin,
+            led_cfg['led_freq_hz'],
+            led_cfg['led_dma'],
+            led_cfg['led_invert'],
+            led_cfg['led_brightness'],
+            led_cfg['led_channel'],
+            device=dev,
+        )
+
+    def _resolve_chain(self, pin):
+        """Supervisor: resolve by pin; a changed /dev/leds* set re-reads dmesg."""
+        now = sorted(glob.glob('/dev/leds*'))
+        if now != self._seen_leds:
+            self._seen_leds = now
+            pio_device_map(refresh=True)
+        return resolve_pio_device(pin, self._chain_pins)
+
+    def _build_chain(self, chain, dev):
+        st = self._make_strip(chain, int(chain['pin']), dev)
+        st.begin()
+        if hasattr(st, 'setDither'):
+            st.setDither(bool(self.config['led_config'].get('dither', False)))
+        return st
+
+    def _attach_chain(self, st):
+        """Join a recovered chain to the running strip — mirrors from the next frame."""
+        if self._render_client is not None:
+            # The strip belongs to the renderer process now; it attaches its own
+            st.close()
+            raise RuntimeError("Strip gehoert dem Renderer-Prozess")
+        with self._strip_lock:
+            cur = self._strip
+            if cur is None:
+                self._strip = st
+            elif isinstance(cur, MultiStrip):
+                cur.add(st)
+            else:
+                self._strip = self._multi_strip([cur, st])
+            self._cleared = False
+        print(f"Kette wieder da: {getattr(st, '_device', st)}")
+
+    def _multi_strip(self, strips):
+        """MultiStrip whose quarantined chains go back to the supervisor."""
+        return MultiStrip(strips, on_lost=self._chain_lost
+                          if self.chain_supervisor is not None else None)
+
+    def _chain_lost(self, st):
+        """A chain failed at runtime: close it and let the supervisor rebuild it.
+
+        Runs on the render thread (inside show()), so it only queues — the
+        supervisor thread re-resolves the pin and attaches a fresh strip.
+        """
+        dev = getattr(st, '_device', None)
+        try:
+            st.close()
+        except Exception:
+            pass
+        chain = self._chain_cfg.get(dev)
+        if chain is None:
+            return
+        print(f"Kette ausgefallen: GPIO {chain['pin']} ({dev}) — wird neu aufgeloest")
+        self.chain_supervisor.readd(chain, dev)
+
+    @property
+    def strip(self):
+        """The strip effects draw on — a FrameCapture while crossfading.
+
+        The override is thread-local: only the effect thread renders into a
+        capture, API handlers running meanwhile still reach the real strip.
+        """
+        target = getattr(self._render_local, 'strip', None)
+        return self._strip if target is None else target
+
+    @strip.setter
+    def strip(self, value):
+        self._strip = value
+
+    @property
+    def anim_clock(self):
+        """The effect clock — the outgoing effect's own while crossfading.
+
+        Thread-local like `strip`, so the render thread never swaps the
+        controller attribute a request handler is about to reset.
+        """
+        clock = getattr(self._render_local, 'clock', None)
+        return self._anim_clock if clock is None else clock
+
+    @anim_clock.setter
+    def anim_clock(self, value):
+        self._anim_clock = value
+
+    @property
+    def current_effect(self):
+        return self._current_effect
+
+    @current_effect.setter
+    def current_effect(self, name):
+        # The renderer is looked up here, once per switch — not per frame
+        self._current_effect = name
+        self._render = self._effect_table.get(name)
+
+    def select_effect(self, name):
+        """Switch to `name` with a crossfade and fresh effect state.
+
+        Runs on a request thread: transition, clock and renderer change
+        together under `_strip_lock`, where run_effect takes its snapshot.
+        """
+        with self._strip_lock:
+            self.begin_transition(self.current_effect, name)
+            self.current_effect = name
+            EFFECTS.reset(self, name, self._effect_table)
+
+    def select_zone_effect(self, zone, effect):
+        """select_effect for one zone: fresh zone state, then the reset hook."""
+        zone.set_effect(effect)
+        EFFECTS.reset(self._zone_view(zone), effect)
+
+    def _zone_view(self, zone):
+        return ZoneView(zone, self.brightness, self._ramp_frames)
+
+    def push_params(self, zone=None):
+        """Colour or speed changed: hand them to the plugin runners now.
+
+        Runners copy their declared params on change, not per frame — the
+        strip's runners from this controller, a zone's from its view.
+        """
+        if zone is not None:
+            runner = zone.params.get('runner')
+            if runner is not None:
+                runner.sync(self._zone_view(zone))
+            return
+        for fn in self._effect_table.values():
+            if isinstance(fn, effect_registry.Runner):
+                fn.sync(self)
+
     def signal_handler(self, sig, frame):
         print('\nShutting down...')
         self.running = False
@@ -292,6 +650,7 @@ class LichtwerkWebController:
             except Exception:
                 pass
         self.clear(force=True)
+        self._finish_clear(wait=True)
         if self.strip and hasattr(self.strip, 'close'):
             try:
                 self.strip.close()
@@ -300,7 +659,7 @@ class LichtwerkWebController:
         sys.exit(0)
     
     def clear(self, force=False):
-        """Blank the strip — and PROVE it, twice.
+        """Blank the strip — and PROVE it, twice, without blocking anyone.
 
         WS2812 serialises GRB, so one slipped bit in a 600-LED chain shifts
         crimson's 255 into the green or blue slot: the classic "LEDs stay
@@ -313,29 +672,75 @@ class LichtwerkWebController:
         _cleared only latches when the LAST write really landed — a dropped
         one retries on the next effect-loop tick. The maintenance re-clear in
         run_effect heals anything that still slips through.
+
+        The two frames are a scheduled "black burst": the first goes out now,
+        the second on the effect loop's next deadline past the EBUSY window
+        (`_finish_clear`). Sleeping 25 ms between them under `_strip_lock`
+        stalled every request and the painter on each clear and heartbeat.
         """
         if not self.strip:
             return
         if self._cleared and not force:
             return
+        self._await_wire()
         with self._strip_lock:
             if self._cleared and not force:
                 return
-            ok = False
-            for versuch in range(2):
-                if versuch:
-                    time.sleep(0.025)   # EBUSY window is the 18 ms shift-out
-                if hasattr(self.strip, 'fill'):
-                    self.strip.fill(Color(0, 0, 0))
-                else:
-                    for i in range(self.strip.numPixels()):
-                        self.strip.setPixelColor(i, Color(0, 0, 0))
-                ok = self.strip.show() is not False   # None (fremde Treiber) = ok
+            self._write_black()
+            self._last_clear_ts = time.monotonic()
+            self._black_burst = (self._last_clear_ts + CLEAR_GAP_S, self.strip)
+
+    def _write_black(self):
+        if hasattr(self.strip, 'fill'):
+            self.strip.fill(Color(0, 0, 0))
+        else:
+            for i in range(self.strip.numPixels()):
+                self.strip.setPixelColor(i, Color(0, 0, 0))
+        return self.strip.show() is not False   # None (fremde Treiber) = ok
+
+    def _finish_clear(self, wait=False):
+        """Second frame of a pending black burst, once due; latches _cleared.
+
+        True while a burst is pending (the loop holds its effect until black
+        is proven). `wait=True` completes it inline — shutdown only.
+        """
+        burst = self._black_burst
+        if burst is None:
+            return False
+        due, strip = burst
+        due = max(due, self._wire_free())
+        now = time.monotonic()
+        if now < due:
+            if not wait:
+                return True
+            time.sleep(due - now)
+        with self._strip_lock:
+            if self._black_burst is not burst:
+                return self._black_burst is not None   # superseded meanwhile
+            ok = strip is self.strip and self._write_black()
+            self._black_burst = None
             self._cleared = ok
             self._last_clear_ts = time.monotonic()
-    
+        return True
+
+    def _wire_free(self):
+        """When the strip has shifted out its last frame (driver's busy_until)."""
+        busy = getattr(self._strip, 'busy_until', None)
+        return busy if isinstance(busy, float) else 0.0
+
+    def _await_wire(self):
+        """Wait out the frame on the wire — before `_strip_lock`, never under it.
+
+        The driver holds back an early frame instead of sleeping (it may run
+        under the lock); a writer that must not lose its frame waits here.
+        """
+        wait = self._wire_free() - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
     def wake_effect(self):
         """Interrupt effect-loop sleep so the next frame paints ASAP."""
+        self._status_dirty = True     # API change: re-publish after that frame
         self._effect_wake.set()
     
     def set_pixel(self, index, r, g, b, brightness=1.0):
@@ -365,182 +770,82 @@ class LichtwerkWebController:
             b = 255 - pos * 3
         return r, g, b
     
-    def effect_solid(self):
-        if not self.strip:
+    # Zone-capable effects take their host explicitly: the controller itself
+    # (host=None) or a zones.ZoneView with strip, clock, speed, colour,
+    # brightness, effect_params, _show_plane and _show_level — nothing else.
+    def effect_solid(self, host=None):
+        host = self if host is None else host
+        strip = host.strip
+        if not strip:
             return
-        scale = max(0.0, min(1.0, self.brightness / 255.0))
-        c = Color(int(self.color[0] * scale), int(self.color[1] * scale), int(self.color[2] * scale))
-        if hasattr(self.strip, 'fill'):
-            self.strip.fill(c)
+        scale = max(0.0, min(1.0, host.brightness / 255.0))
+        c = Color(int(host.color[0] * scale), int(host.color[1] * scale), int(host.color[2] * scale))
+        if hasattr(strip, 'fill'):
+            strip.fill(c)
         else:
-            for i in range(self.strip.numPixels()):
-                self.strip.setPixelColor(i, c)
-        self.strip.show()
-        self._cleared = False
-    
-    def effect_rainbow(self):
-        if not self.strip:
-            return
-        for i in range(self.strip.numPixels()):
-            pixel_hue = (i + self.effect_params['rainbow_offset']) % 256
-            r, g, b = self.wheel(pixel_hue)
-            self.set_pixel(i, r, g, b)
-        self.strip.show()
-        self.effect_params['rainbow_offset'] = (self.effect_params['rainbow_offset'] + 1) % 256
+            for i in range(strip.numPixels()):
+                strip.setPixelColor(i, c)
+        strip.show()
+        if host is self:
+            self._cleared = False
+            self._black_burst = None       # painted over: no late black frame
     
-    def effect_pulse(self):
-        if not self.strip:
+    def _ramp_frames(self, n, rgb, lo):
+        """Colour `rgb` from `lo` to full as RAMP_STEPS cached payloads."""
+        def build():
+            for step in range(RAMP_STEPS):
+                level = lo + (1.0 - lo) * step / (RAMP_STEPS - 1)
+                r, g, b = (int(c * level) for c in rgb)
+                yield bytes((r, g, b, 0)) * n
+        return self.frame_cache.get(('ramp', n, lo, rgb), build)
+
+    def _show_level(self, level, lo):
+        frames = self._ramp_frames(self.strip.numPixels(), tuple(self.color[:3]), lo)
+        self._show_plane(frames[animation.ramp_index(level, lo, len(frames))])
+
+    def effect_pulse(self, host=None):
+        host = self if host is None else host
+        if not host.strip:
             return
-        brightness = self.effect_params['pulse_brightness']
-        direction = self.effect_params['pulse_direction']
-        
-        for i in range(self.strip.numPixels()):
-            self.set_pixel(i, self.color[0], self.color[1], self.color[2], brightness)
-        self.strip.show()
-        
-        brightness += direction * (self.speed / 1000.0)
-        if brightness >= 1.0:
-            brightness = 1.0
-            direction = -1
-        elif brightness <= 0.1:
-            brightness = 0.1
-            direction = 1
-        
-        self.effect_params['pulse_brightness'] = brightness
-        self.effect_params['pulse_direction'] = direction
+        clock = host.anim_clock.advance(host.speed)
+        host._show_level(animation.pulse_level(clock.sweep), 0.1)
     
-    def effect_chase(self):
-        if not self.strip:
+    def effect_chase(self, host=None):
+        host = self if host is None else host
+        if not host.strip:
             return
-        self.clear()
-        segment_size = max(1, int(self.strip.numPixels() * 0.05))
-        position = self.effect_params['chase_position']
-        
-        for i in range(segment_size):
-            pixel_index = (position + i) % self.strip.numPixels()
-            self.set_pixel(pixel_index, self.color[0], self.color[1], self.color[2])
-        
-        self.strip.show()
-        self.effect_params['chase_position'] = (position + 1) % self.strip.numPixels()
+        n = host.strip.numPixels()
+        segment_size = max(1, int(n * 0.05))
+        position = animation.chase_position(host.anim_clock.advance(host.speed).ticks, n)
+        # Segment at 0, rotated into place — the wrap comes for free
+        base = (bytes(host.color[:3]) + b'\x00') * segment_size + bytes((n - segment_size) * 4)
+        cut = len(base) - position * 4
+        host._show_plane(base[cut:] + base[:cut])
     
-    def effect_sparkle(self):
-        if not self.strip:
+    def effect_strobe(self, host=None):
+        host = self if host is None else host
+        if not host.strip:
             return
-        # Fade existing sparkles
-        for pixel_data in self.effect_params['sparkle_pixels']:
-            pixel_data['brightness'] *= 0.9
-            if pixel_data['brightness'] > 0.01:
-                self.set_pixel(pixel_data['index'], 
-                             self.color[0], self.color[1], self.color[2], 
-                             pixel_data['brightness'])
-        
-        # Remove dim sparkles
-        self.effect_params['sparkle_pixels'] = [
-            p for p in self.effect_params['sparkle_pixels'] 
-            if p['brightness'] > 0.01
-        ]
-        
-        # Add new sparkles
-        density = max(1, int(self.strip.numPixels() * 0.02))
-        for _ in range(density):
-            if random.random() < (self.speed / 100.0):
-                self.effect_params['sparkle_pixels'].append({
-                    'index': random.randint(0, self.strip.numPixels() - 1),
-                    'brightness': 1.0
-                })
-        
-        self.strip.show()
-    
-    def effect_strobe(self):
-        if not self.strip:
-            return
-        if time.time() * 1000 % (200 - self.speed * 2) < 50:
-            for i in range(self.strip.numPixels()):
-                self.set_pixel(i, self.color[0], self.color[1], self.color[2])
+        n = host.strip.numPixels()
+        # 50 ms flash per period, dark the rest — whole planes, no per-pixel loop
+        if time.time() * 1000 % (200 - host.speed * 2) < 50:
+            host._show_plane((bytes(host.color[:3]) + b'\x00') * n)
         else:
-            self.clear()
-        self.strip.show()
-    
-    def effect_meteor(self):
-        if not self.strip:
-            return
-        
-        # Enhanced fade effect - store pixel states for proper fading
-        if 'pixel_states' not in self.effect_params:
-            self.effect_params['pixel_states'] = [[0, 0, 0] for _ in range(self.strip.numPixels())]
-            self.effect_params['last_meteor_spawn'] = 0
-        
-        # Fade all pixels more gradually and visibly
-        for i in range(self.strip.numPixels()):
-            # Fade factor for smoother, more visible trail
-            fade_factor = 0.92  # Slower fade for more visible trail
-            self.effect_params['pixel_states'][i][0] = int(self.effect_params['pixel_states'][i][0] * fade_factor)
-            self.effect_params['pixel_states'][i][1] = int(self.effect_params['pixel_states'][i][1] * fade_factor)
-            self.effect_params['pixel_states'][i][2] = int(self.effect_params['pixel_states'][i][2] * fade_factor)
-            
-            # Apply faded color
-            self.strip.setPixelColor(i, Color(
-                self.effect_params['pixel_states'][i][0],
-                self.effect_params['pixel_states'][i][1],
-                self.effect_params['pixel_states'][i][2]
-            ))
-        
-        # Create new meteors MUCH less frequently with minimum spacing
-        self.effect_params['last_meteor_spawn'] = self.effect_params.get('last_meteor_spawn', 0) + 1
-        min_spawn_distance = 100  # Minimum frames between spawns
-        spawn_chance = (self.speed / 5000.0)  # Drastically reduced spawn rate
-        
-        # Only spawn if enough time has passed AND random chance succeeds AND not too many meteors
-        if (self.effect_params['last_meteor_spawn'] > min_spawn_distance and 
-            random.random() < spawn_chance and 
-            len(self.effect_params.get('meteor_positions', [])) < 2):  # Max 2 meteors at once
-            
-            meteor_size = random.randint(10, 20)  # Larger meteors
-            self.effect_params['meteor_positions'].append({
-                'position': 0,
-                'size': meteor_size,
-                'speed': random.uniform(1.5, 2.5),  # More consistent speed
-                'trail_length': meteor_size * 3  # Longer trail for better visibility
-            })
-            self.effect_params['last_meteor_spawn'] = 0  # Reset spawn timer
-        
-        # Update existing meteors
-        active_meteors = []
-        for meteor in self.effect_params['meteor_positions']:
-            meteor['position'] += meteor['speed']
-            
-            # Draw meteor with enhanced trail
-            for i in range(meteor['trail_length']):
-                pixel_pos = int(meteor['position'] - i)
-                if 0 <= pixel_pos < self.strip.numPixels():
-                    # Enhanced brightness calculation for better trail visibility
-                    if i < meteor['size']:
-                        # Bright head of meteor
-                        brightness = 1.0 - (i * 0.05)  # Gradual dimming at head
-                    else:
-                        # Fading tail
-                        tail_position = i - meteor['size']
-                        tail_length = meteor['trail_length'] - meteor['size']
-                        brightness = max(0.05, 0.8 * (1.0 - (tail_position / tail_length)))
-                    
-                    # Update pixel state for proper fading
-                    self.effect_params['pixel_states'][pixel_pos][0] = int(self.color[0] * brightness)
-                    self.effect_params['pixel_states'][pixel_pos][1] = int(self.color[1] * brightness)
-                    self.effect_params['pixel_states'][pixel_pos][2] = int(self.color[2] * brightness)
-                    
-                    self.strip.setPixelColor(pixel_pos, Color(
-                        self.effect_params['pixel_states'][pixel_pos][0],
-                        self.effect_params['pixel_states'][pixel_pos][1],
-                        self.effect_params['pixel_states'][pixel_pos][2]
-                    ))
-            
-            # Keep meteor if still visible (including tail)
-            if meteor['position'] < self.strip.numPixels() + meteor['trail_length']:
-                active_meteors.append(meteor)
-        
-        self.effect_params['meteor_positions'] = active_meteors
-        self.strip.show()
+            host._show_plane(bytes(n * 4))
     
+    def _show_plane(self, plane):
+        """Write an effect plane with the same scaling show() would apply.
+
+        Master brightness plus the driver's own LUT — the plane holds
+        unscaled colour, so trails fade in full 8-bit resolution.
+        """
+        strip = self.strip
+        lut = 255
+        # Legacy drivers go through show(), which applies their LUT itself
+        if getattr(strip, 'show_payload', None) is not None and hasattr(strip, 'getBrightness'):
+            lut = strip.getBrightness()
+        self._show_payload(plane, lut)
+
     def fade_toward_color(self, current_color, target_color, fade_amount):
         """FastLED-style fadeTowardColor function"""
         def fade_component(current, target, amount):
@@ -563,299 +868,98 @@ class LichtwerkWebController:
         r, g, b = colorsys.hsv_to_rgb(h, s, v)
         return int(r * 255), int(g * 255), int(b * 255)
     
-    def effect_sinelon(self):
-        """Sinelon - a sinusoidal wave with fading trail"""
-        if not self.strip:
-            return
-        
-        import math
-        
-        # Initialize effect parameters
-        if 'sinelon_phase' not in self.effect_params:
-            self.effect_params['sinelon_phase'] = 0
-            self.effect_params['sinelon_pixels'] = [[0, 0, 0] for _ in range(self.strip.numPixels())]
-        
-        pixels = self.effect_params['sinelon_pixels']
-        
-        # Fade all pixels
-        fade_rate = 0.95
-        for i in range(len(pixels)):
-            pixels[i][0] = int(pixels[i][0] * fade_rate)
-            pixels[i][1] = int(pixels[i][1] * fade_rate)
-            pixels[i][2] = int(pixels[i][2] * fade_rate)
-        
-        # Calculate position using sine wave
-        self.effect_params['sinelon_phase'] += self.speed / 500.0
-        pos = int((math.sin(self.effect_params['sinelon_phase']) + 1.0) * 0.5 * (len(pixels) - 1))
-        
-        # Set pixel at position
-        # Use the configured color
-        color = self.color
-        
-        if 0 <= pos < len(pixels):
-            pixels[pos] = [color[0], color[1], color[2]]
-        
-        # Apply brightness and update strip
-        brightness_factor = self.brightness / 255.0
-        for i in range(len(pixels)):
-            self.strip.setPixelColor(i, Color(
-                int(pixels[i][0] * brightness_factor),
-                int(pixels[i][1] * brightness_factor),
-                int(pixels[i][2] * brightness_factor)
-            ))
-        
-        self.strip.show()
-    
-    def effect_juggle(self):
-        """Juggle - eight colored dots weaving in and out"""
-        if not self.strip:
-            return
-        
-        import math
-        
-        # Initialize effect parameters
-        if 'juggle_phase' not in self.effect_params:
-            self.effect_params['juggle_phase'] = 0
-            self.effect_params['juggle_pixels'] = [[0, 0, 0] for _ in range(self.strip.numPixels())]
-        
-        pixels = self.effect_params['juggle_pixels']
-        
-        # Fade all pixels
-        fade_rate = 0.92
-        for i in range(len(pixels)):
-            pixels[i][0] = int(pixels[i][0] * fade_rate)
-            pixels[i][1] = int(pixels[i][1] * fade_rate)
-            pixels[i][2] = int(pixels[i][2] * fade_rate)
-        
-        # Update phase
-        self.effect_params['juggle_phase'] += self.speed / 300.0
-        phase = self.effect_params['juggle_phase']
-        
-        # Draw 8 dots
-        for dot in range(8):
-            pos = int((math.sin((dot + 7) * phase * 1.2) + 1.0) * 0.5 * (len(pixels) - 1))
-            if 0 <= pos < len(pixels):
-                # Each dot gets a different color
-                hue = (dot * 32) / 255.0
-                color = self.hsv_to_rgb(hue, 0.8, 1.0)
-                # Add to existing pixel value
-                pixels[pos][0] = min(255, pixels[pos][0] + color[0])
-                pixels[pos][1] = min(255, pixels[pos][1] + color[1])
-                pixels[pos][2] = min(255, pixels[pos][2] + color[2])
-        
-        # Apply brightness and update strip
-        brightness_factor = self.brightness / 255.0
-        for i in range(len(pixels)):
-            self.strip.setPixelColor(i, Color(
-                int(pixels[i][0] * brightness_factor),
-                int(pixels[i][1] * brightness_factor),
-                int(pixels[i][2] * brightness_factor)
-            ))
-        
-        self.strip.show()
-    
-    def effect_theater_chase_rainbow(self):
-        """Theater chase with rainbow or single color"""
-        if not self.strip:
-            return
-        
-        # Initialize effect parameters
-        if 'theater_j' not in self.effect_params:
-            self.effect_params['theater_j'] = 0
-            self.effect_params['theater_q'] = 0
-        
-        # Clear strip
-        for i in range(self.strip.numPixels()):
-            self.strip.setPixelColor(i, Color(0, 0, 0))
-        
-        # Draw pattern
-        j = self.effect_params['theater_j']
-        q = self.effect_params['theater_q']
-        
-        for i in range(0, self.strip.numPixels(), 3):
-            idx = i + q
-            if idx < self.strip.numPixels():
-                if self.theater_rainbow:
+    def _theater_frames(self, n, color):
+        """One theater period: frame j*3 + q lights every third LED from q."""
+        rgb = None if self.theater_rainbow else tuple(color[:3])
+
+        def build():
+            gap = bytes(8)
+            for j in range(256 if rgb is None else 1):
+                if rgb is None:
                     # Rainbow color based on position and time
-                    hue = ((i + j) % 255) / 255.0
-                    color = self.hsv_to_rgb(hue, 1.0, 1.0)
+                    base = b''.join(THEATER_HUES[(i + j) % 255] + gap for i in range(0, n, 3))
                 else:
-                    # Use single color
-                    color = (self.color[0], self.color[1], self.color[2])
-                
-                brightness_factor = self.brightness / 255.0
-                self.strip.setPixelColor(idx, Color(
-                    int(color[0] * brightness_factor),
-                    int(color[1] * brightness_factor),
-                    int(color[2] * brightness_factor)
-                ))
-        
-        self.strip.show()
-        
-        # Update counters
-        self.effect_params['theater_q'] = (q + 1) % 3
-        if q == 2:
-            self.effect_params['theater_j'] = (j + 1) % 256
-    
-    def effect_gradient_fill(self):
-        """Gradient fill effect - fills strip with gradient colors"""
-        if not self.strip:
+                    base = (bytes(rgb) + b'\x00' + gap) * ((n + 2) // 3)
+                for q in range(3):
+                    yield (bytes(q * 4) + base)[:n * 4]
+        return self.frame_cache.get(('theater', n, rgb), build)
+
+    def effect_theater_chase_rainbow(self, host=None):
+        """Theater chase with rainbow or single color"""
+        host = self if host is None else host
+        if not host.strip:
             return
-        
-        # Initialize effect parameters
-        if 'gradient_pos' not in self.effect_params:
-            self.effect_params['gradient_pos'] = 0
-            self.effect_params['gradient_hue1'] = 0
-            self.effect_params['gradient_hue2'] = 120
-        
-        pos = self.effect_params['gradient_pos']
-        hue1 = self.effect_params['gradient_hue1'] / 360.0
-        hue2 = self.effect_params['gradient_hue2'] / 360.0
-        
-        # Fill with gradient up to current position
-        for i in range(self.strip.numPixels()):
-            if i <= pos:
-                # Interpolate between two hues
-                t = i / max(1, pos)
-                hue = hue1 + (hue2 - hue1) * t
-                if hue < 0:
-                    hue += 1.0
-                if hue > 1.0:
-                    hue -= 1.0
-                color = self.hsv_to_rgb(hue, 1.0, 1.0)
-            else:
-                color = (0, 0, 0)
-            
-            brightness_factor = self.brightness / 255.0
-            self.strip.setPixelColor(i, Color(
-                int(color[0] * brightness_factor),
-                int(color[1] * brightness_factor),
-                int(color[2] * brightness_factor)
-            ))
-        
-        self.strip.show()
-        
-        # Update position
-        self.effect_params['gradient_pos'] += max(1, int(self.speed / 10))
-        if self.effect_params['gradient_pos'] >= self.strip.numPixels():
-            self.effect_params['gradient_pos'] = 0
-            # New random colors
-            import random
-            self.effect_params['gradient_hue1'] = random.randint(0, 360)
-            self.effect_params['gradient_hue2'] = (self.effect_params['gradient_hue1'] + random.randint(60, 180)) % 360
+        frames = self._theater_frames(host.strip.numPixels(), host.color)
+        tick = int(host.anim_clock.advance(host.speed).ticks)
+        host._show_plane(frames[tick % len(frames)])
     
-    def effect_fire(self):
-        """Fire effect - 1D heat simulation"""
-        if not self.strip:
+    def _gradient_frame(self, n, pos, hue1, hue2):
+        """LEDs 0..pos from hue1 to hue2, the rest dark.
+
+        Rendered per tick, not cached: the hues change every sweep, so a
+        cached period would be built once, played once and evict the
+        periods that do repeat.
+        """
+        h1, h2 = hue1 / 360.0, hue2 / 360.0
+        span = max(1, pos)
+        lit = b''.join(HUE_CHUNKS[int((h1 + (h2 - h1) * i / span) * HUE_STEPS) % HUE_STEPS]
+                       for i in range(pos + 1))
+        return lit + bytes((n - pos - 1) * 4)
+
+    def effect_gradient_fill(self, host=None):
+        """Gradient fill effect - fills strip with gradient colors"""
+        host = self if host is None else host
+        if not host.strip:
             return
-        
-        import random
-        
-        # Initialize heat array
-        if 'fire_heat' not in self.effect_params:
-            self.effect_params['fire_heat'] = [0] * self.strip.numPixels()
-        
-        heat = self.effect_params['fire_heat']
-        num_leds = len(heat)
-        
-        # Cooling: How much does each cell cool down every step
-        cooling = 55
-        
-        # Sparking: What chance (out of 255) is there that a new spark will be lit
-        sparking = 120
-        
-        # Step 1: Cool down every cell a little
-        for i in range(num_leds):
-            cooldown = random.randint(0, ((cooling * 10) // num_leds) + 2)
-            heat[i] = max(0, heat[i] - cooldown)
-        
-        # Step 2: Heat from each cell drifts up and diffuses slightly
-        for k in range(num_leds - 1, 1, -1):
-            heat[k] = (heat[k - 1] + heat[k - 2] + heat[k - 2]) // 3
-        
-        # Step 3: Randomly ignite new sparks near the bottom
-        if random.randint(0, 255) < sparking:
-            y = random.randint(0, min(7, num_leds - 1))
-            heat[y] = min(255, heat[y] + random.randint(160, 255))
-        
-        # Step 4: Convert heat to LED colors
-        for j in range(num_leds):
-            # Scale heat value to 0-255
-            colorindex = min(255, heat[j])
-            
-            # Calculate color - heat palette (black -> red -> yellow -> white)
-            if colorindex < 85:
-                # Black to red
-                r = (colorindex * 3)
-                g = 0
-                b = 0
-            elif colorindex < 170:
-                # Red to yellow
-                r = 255
-                g = ((colorindex - 85) * 3)
-                b = 0
-            else:
-                # Yellow to white
-                r = 255
-                g = 255
-                b = ((colorindex - 170) * 3)
-            
-            brightness_factor = self.brightness / 255.0
-            # Mirror to make fire rise from bottom
-            self.strip.setPixelColor(num_leds - 1 - j, Color(
-                int(r * brightness_factor),
-                int(g * brightness_factor),
-                int(b * brightness_factor)
-            ))
-        
-        self.strip.show()
+        n = host.strip.numPixels()
+        step = max(1, int(host.speed / 10))
+        sweep = (n + step - 1) // step
+        tick = int(host.anim_clock.advance(host.speed).ticks)
+        cycle = tick // sweep
+        if cycle == 0:
+            hue1, hue2 = 0, 120
+        else:
+            # New random colors per sweep — seeded by the sweep number, so
+            # the frame is a function of time like every other periodic effect
+            rng = random.Random(host.effect_params.setdefault('gradient_salt', random.getrandbits(32)) + cycle)
+            hue1 = rng.randint(0, 360)
+            hue2 = (hue1 + rng.randint(60, 180)) % 360
+        host._show_plane(self._gradient_frame(n, (tick % sweep) * step, hue1, hue2))
     
-    def effect_breathe(self):
-        if not self.strip:
+    def effect_breathe(self, host=None):
+        host = self if host is None else host
+        if not host.strip:
             return
-        
-        brightness = self.effect_params['breathe_brightness']
-        direction = self.effect_params['breathe_direction']
-        
-        # Set all pixels to same brightness
-        for i in range(self.strip.numPixels()):
-            self.set_pixel(i, self.color[0], self.color[1], self.color[2], brightness)
-        self.strip.show()
-        
-        # Update breathing pattern
-        speed_factor = self.speed / 2000.0
-        brightness += direction * speed_factor
-        
-        if brightness >= 1.0:
-            brightness = 1.0
-            direction = -1
-        elif brightness <= 0.05:
-            brightness = 0.05
-            direction = 1
-        
-        self.effect_params['breathe_brightness'] = brightness
-        self.effect_params['breathe_direction'] = direction
+        clock = host.anim_clock.advance(host.speed)
+        host._show_level(animation.breathe_level(clock.sweep), 0.05)
     
 
     def _wash_frames(self):
-        """Precomputed breathe ramp — rebuilt only when the LED count changes."""
+        """Precomputed breathe ramp from the shared iris_wash LRU.
+
+        Chains and zones of different lengths each keep their ramp; a layout
+        switch back to a known length is a lookup, not a rebuild.
+        """
         n = self.strip.numPixels() if self.strip else 0
         if n <= 0:
             return ()
-        if self._wash_n != n or not self._wash_cache:
-            self._wash_cache = iris_wash.build_frames(
-                n, self._wash_steps, self._wash_exposure, self._wash_max_current_a)
-            self._wash_n = n
+        key = iris_wash.cache_key(n, self._wash_steps, self._wash_exposure,
+                                  self._wash_max_current_a)
+        built = key in iris_wash.FRAME_CACHE
+        frames = iris_wash.cached_frames(n, self._wash_steps, self._wash_exposure,
+                                         self._wash_max_current_a)
+        if not built:
             exposure = (iris_wash.fit_exposure(n, self._wash_max_current_a, self._wash_exposure)
                         if self._wash_max_current_a else self._wash_exposure)
             peak = iris_wash.estimate_current_a(n, 1.0, exposure)
             spark = iris_wash.spark_current_a() if self._wash_sparks_on else 0.0
             shim = iris_wash.shimmer_current_a() if self._wash_shimmer_on else 0.0
-            print(f"iris wash: {len(self._wash_cache)} frames x {n} LEDs, "
+            kind = "keyframes (interpolated)" if self._wash_interp else "frames"
+            print(f"iris wash: {len(frames)} {kind} x {n} LEDs, "
                   f"exposure {exposure:.2f}, peak ~{peak:.1f} A"
                   f" (+{spark:.1f} sparks +{shim:.1f} shimmer)"
                   f" = worst case ~{peak + spark + shim:.1f} A")
-        return self._wash_cache
+        return frames
 
     def _wash_engage(self):
         """Threshold crossed — start the wash at the breathe peak.
@@ -865,10 +969,14 @@ class LichtwerkWebController:
         full intensity and breathes down from there.
         """
         self._wash_t0 = time.monotonic() - iris_wash.BREATHE_PERIOD_S
+        self._wash_origin = time.monotonic()
         self._wash_fade_t0 = None
         self._wash_sparks = []
         self._wash_spark_ts = None
         self._wash_frames()
+        if self._wash_highlights is None and (self._wash_sparks_on or self._wash_shimmer_on):
+            self._wash_highlights = iris_wash.HighlightTables(
+                self._wash_white_point, kernel=self._wash_kernel)
 
     def _wash_release(self):
         """Back under threshold — fade out like the page's .55 s transition."""
@@ -882,8 +990,45 @@ class LichtwerkWebController:
     def _wash_index(self):
         if self._wash_t0 is None:
             return self._wash_steps - 1
+        if self._wash_interp:
+            return iris_wash.frame_position(time.monotonic() - self._wash_t0, self._wash_steps)
         return iris_wash.frame_index(time.monotonic() - self._wash_t0, self._wash_steps)
 
+    def _wash_step_sparks(self, now, e, n):
+        """Age out finished sparks and spawn new ones at spark_rate(e)."""
+        last = self._wash_spark_ts
+        self._wash_spark_ts = now
+        life = iris_wash.SPARK_LIFE_S
+        sparks = [sp for sp in self._wash_sparks if now - sp[1] < life]
+        if last is not None and n > 0:
+            expected = iris_wash.spark_rate(e) * max(0.0, now - last)
+            while expected > 0.0 and len(sparks) < iris_wash.SPARK_MAX:
+                if random.random() < expected:
+                    sparks.append((random.randrange(n), now))
+                expected -= 1.0
+        self._wash_sparks = sparks
+        return sparks
+
+    def _wash_payload(self, frames, pos, now):
+        """Frame at breathe position `pos` with the white highlights on top.
+
+        The base stays the cached payload (or the blend of two keyframes);
+        sparks and shimmer come from the precomputed HighlightTables and
+        touch only the LEDs they cover.
+        """
+        if self._wash_interp:
+            base = iris_wash.interpolated_frame(frames, pos)
+        else:
+            base = frames[pos]
+        tables = self._wash_highlights
+        if tables is None or not (self._wash_sparks_on or self._wash_shimmer_on):
+            return base
+        n = len(base) // 4
+        e = self._wash_phase[min(int(round(pos)), len(self._wash_phase) - 1)]
+        sparks = self._wash_step_sparks(now, e, n) if self._wash_sparks_on else ()
+        return tables.apply(base, tables.touched(
+            n, e, now - self._wash_origin, sparks, now, self._wash_shimmer_on))
+
     def _iris_abort(self):
         """Hard-stop the wash — black at once, no fade (disarm / explicit off)."""
         self._wash_t0 = None
@@ -917,13 +1062,16 @@ class LichtwerkWebController:
         if not frames or self._wash_fade_t0 is None:
             self._wash_fade_t0 = None
             return
-        gain = iris_wash.release_gain(time.monotonic() - self._wash_fade_t0)
+        now = time.monotonic()
+        gain = iris_wash.release_gain(now - self._wash_fade_t0)
         if gain <= 0:
             self._wash_fade_t0 = None
             self.clear(force=True)
             return
+        payload = self._wash_payload(frames, min(self._wash_fade_from, len(frames) - 1), now)
+        self._await_wire()
         with self._strip_lock:
-            self._show_payload(frames[min(self._wash_fade_from, len(frames) - 1)], gain)
+            self._show_payload(payload, gain)
         self._cleared = False
 
     def effect_iris_warn(self):
@@ -1215,7 +1363,7 @@ class LichtwerkWebController:
             if waves and now_m < self.effect_params.get('iris_next_paint', 0.0) \
                     and last is lit and last_spark is spark:
                 return
-            self.effect_params['iris_next_paint'] = now_m + 0.02
+            self.effect_params['iris_next_paint'] = now_m + self.write_floor()
         elif self.effect_params.get('iris_blinder') is not None:
             # Blinder-Plan aktiv: KONTINUIERLICH neu senden — der 20-ms-
             # Schreibtakt unten paced (Dunkelfenster laufen ueber clear(),
@@ -1251,11 +1399,12 @@ class LichtwerkWebController:
         self.effect_params['iris_lit'] = lit
         self.effect_params['iris_sparking'] = spark
 
-        # EIN Schreibtakt fuer alle Pfade: 20 ms Boden (= die 18-ms-Drahtzeit).
+        # EIN Schreibtakt fuer alle Pfade: Boden = Drahtzeit des Geraets + 2 ms
+        # (600 LEDs: 18 ms -> die bewaehrten 20 ms; 300: 11 ms; 900: 29 ms).
         # Schneller zu wollen erzeugt nur EBUSY-Drops — und ein verworfener
-        # Frame ist ein 20-ms-Fenster, in dem ein Slip-Fragment stehen bleibt.
+        # Frame ist ein Fenster, in dem ein Slip-Fragment stehen bleibt.
         now_w = mono()
-        if now_w - self.effect_params.get('iris_last_write', 0.0) < 0.02:
+        if now_w - self.effect_params.get('iris_last_write', 0.0) < self.write_floor():
             return
         self.effect_params['iris_last_write'] = now_w
 
@@ -1306,9 +1455,24 @@ class LichtwerkWebController:
                     'born': born,
                 })
             # Wander-Glut (feine Grundtextur) x Schattenzonen, in 4er-Bloecken
-            glow_tbl = [iris_glow_factor(b + 1.5, t)
-                        * iris_shadow_field(b + 1.5, pockets, t)
-                        for b in range(0, n, 4)]
+            blk = self.governor.knob('glow_block')
+            keep = int(round(len(pockets) * self.governor.knob('shadow_scale')))
+            if blk == 4 and keep >= len(pockets):
+                glow_tbl = [iris_glow_factor(b + 1.5, t)
+                            * iris_shadow_field(b + 1.5, pockets, t)
+                            for b in range(0, n, 4)]
+            else:
+                # Governor unter Last: groebere Stuetzstellen und nur die
+                # aeltesten `keep` Schatten im Feld (der Bestand lebt weiter,
+                # zurueck auf Stufe 0 ist alles sofort wieder da). Auf 4er-
+                # Bloecke gespreizt, damit glow_tbl[i >> 2] unveraendert liest.
+                live = pockets[:keep]
+                mid = (blk - 1) / 2.0
+                coarse = [iris_glow_factor(b + mid, t)
+                          * iris_shadow_field(b + mid, live, t)
+                          for b in range(0, n, blk)]
+                spread = max(1, blk >> 2)
+                glow_tbl = [coarse[j // spread] for j in range((n + 3) >> 2)]
         c = Color(int(hr * scale * red_env), int(hg * scale * red_env), int(hb * scale * red_env))
         dark = Color(0, 0, 0)
         # SPARKLE-Blinder (Nutzerentscheid 2026-08-10, ersetzt das
@@ -1361,7 +1525,8 @@ class LichtwerkWebController:
                 lo = max(0, int(centre - dist - width * 3))
                 hi = min(n - 1, int(centre + dist + width * 3))
                 cw = width * 0.45
-                for i in range(lo, hi + 1):
+                wstep = self.governor.knob('wave_step')
+                for i in range(lo, hi + 1, wstep):
                     d = abs(abs(i - centre) - dist)
                     if d > width * 3:
                         continue
@@ -1378,10 +1543,15 @@ class LichtwerkWebController:
                         r_ += (wr - r_) * core
                         g_ += (wg - g_) * core
                         b_ += (wb - b_) * core
-                    self.strip.setPixelColor(i, Color(
-                        int(min(255, r_) * scale),
-                        int(min(255, g_) * scale),
-                        int(min(255, b_) * scale)))
+                    col = Color(int(min(255, r_) * scale),
+                                int(min(255, g_) * scale),
+                                int(min(255, b_) * scale))
+                    if wstep == 1:
+                        self.strip.setPixelColor(i, col)
+                    else:
+                        # Governor: eine Stuetzstelle malt ihren ganzen Schritt
+                        for j in range(i, min(i + wstep, hi + 1)):
+                            self.strip.setPixelColor(j, col)
 
         if spark and n > 0 and not blind_on:
             # Glut statt Weiss (2026-08-09, Nutzerentscheid): Weiss gehoert
@@ -1400,6 +1570,9 @@ class LichtwerkWebController:
             # Kick strength scales the shower; the tagged density is the floor.
             boost = float(self.effect_params.get('iris_kick_boost', 0.0) or 0.0)
             k = min(max(1, int(k * (1.0 + 0.6 * boost))), max(1, (n * 2) // 5))
+            thin = self.governor.knob('spark_scale')
+            if thin < 1.0:
+                k = max(1, int(k * thin))
             rng = random.Random(int(t0 * 1000) ^ int(t * 200))
             for i in rng.sample(range(n), k):
                 self.strip.setPixelColor(i, w)
@@ -1426,7 +1599,150 @@ class LichtwerkWebController:
         self.strip.show()
         self._cleared = False
 
+    def effect_zones(self):
+        """Zone map mode: every zone runs its own effect at its own rate.
+
+        Only zones that are due (or whose settings changed) re-render; the
+        payload is assembled once and skipped entirely when nothing moved.
+        """
+        if not self.strip or self.zones is None:
+            return
+        table = self._effect_table
+
+        def render_zone(zone):
+            fn = table.get(zone.effect)
+            if fn is None or zone.effect in ('zones', 'iris_warn'):
+                zone.capture.fill(0)
+                zone.capture.show()
+                return
+            if isinstance(fn, effect_registry.Runner):
+                # Plugins keep their state per zone; set_effect drops it
+                runner = zone.params.get('runner')
+                if runner is None:
+                    runner = zone.params['runner'] = fn.fork()
+            else:
+                runner = fn
+            runner(self._zone_view(zone))
+
+        payload = self.zones.render(render_zone, self.brightness, self.theater_rainbow)
+        if payload is None:
+            return
+        size = self.strip.numPixels() * 4
+        if len(payload) != size:
+            payload = payload[:size].ljust(size, b'\x00')
+        self._write_blend(payload, self.strip)
+
+    def begin_transition(self, outgoing, incoming):
+        """Keep `outgoing` running and fade it out under `incoming`.
+
+        The outgoing effect keeps its own animation clock; the incoming one
+        starts on a fresh clock, which the caller resets as usual.
+        """
+        self._transition = None
+        if (self._strip is None or not self.power or self.transition_s <= 0.0
+                or 'iris_warn' in (outgoing, incoming) or outgoing == incoming):
+            return
+        self._transition = Crossfade(outgoing, self.anim_clock, self._strip.numPixels(),
+                                     self.transition_s, curve=self.transition_curve)
+        self.anim_clock = animation.Clock()
+
+    def _capture(self, target, render, clock=None):
+        """Run one effect into a FrameCapture instead of the strip.
+
+        Strip and clock are overridden thread-locally: a request switching
+        effects meanwhile still sees (and resets) the controller's own clock.
+        """
+        local = self._render_local
+        prev = getattr(local, 'clock', None)
+        try:
+            local.strip = target
+            local.clock = clock or prev
+            render()
+        finally:
+            local.strip = None
+            local.clock = prev
+        return target.payload
+
+    def _transition_frame(self, effects, tr, name, render):
+        """One crossfade frame: both effects into captures, blended.
+
+        `tr`, `name` and `render` are run_effect's snapshot. None once the
+        fade is over (or impossible) — the caller then renders the incoming
+        effect straight to the strip again.
+        """
+        if (name == 'iris_warn' or tr.outgoing not in effects or self._strip is None
+                or tr.old.numPixels() != self._strip.numPixels()):
+            self._end_transition(tr)
+            return None
+        gain = tr.gain()
+        if gain >= 255:
+            self._end_transition(tr)
+            return None
+        self._capture(tr.old, effects[tr.outgoing], tr.clock)
+        self._capture(tr.new, render)
+        return tr.blend(gain)
+
+    def _end_transition(self, tr):
+        # Only this fade — a switch meanwhile has already installed its own
+        with self._strip_lock:
+            if self._transition is tr:
+                self._transition = None
+
+    def set_overlay(self, effect, mode='add', color=None):
+        """Stack `effect` over whatever runs (None removes the overlay)."""
+        if mode not in COMPOSITE_MODES:
+            raise ValueError(f"unknown blend mode {mode!r}")
+        self.overlay_effect = effect
+        self.overlay_mode = mode
+        if color is not None:
+            self.overlay_color = [max(0, min(255, int(c))) for c in color[:3]]
+        self._overlay_sparkle = None
+
+    def _layers(self):
+        """Compositor + base/overlay captures, rebuilt when the LED count changes."""
+        n = self._strip.numPixels()
+        stack = self._layer_stack
+        if stack is None or stack[0].n != n:
+            stack = (Compositor(n), FrameCapture(n), FrameCapture(n))
+            self._layer_stack = stack
+        return stack
+
+    def _overlay_frame(self, base, effects):
+        """Composite the overlay effect over `base` (a captured frame)."""
+        comp, _, top = self._layers()
+        layer = comp.layer('overlay', self.overlay_mode)
+        layer.reset()
+        if self.overlay_effect == 'sparkle':
+            # Own pool, no capture: the level plane goes straight into the layer
+            n = comp.n
+            pool = self._overlay_sparkle
+            if pool is None or pool.n != n:
+                pool = self._overlay_sparkle = SparklePool(n, max(1, int(n * 0.02)))
+            pool.step(self.speed / 100.0)
+            bri = max(0, min(255, self.brightness))
+            rgb = tuple(c * bri // 255 for c in self.overlay_color)
+            if self._overlay_luts[0] != rgb:
+                self._overlay_luts = (rgb, level_luts(rgb))
+            pool.render_into(layer, self._overlay_luts[1])
+        else:
+            layer.fill(self._capture(top, effects[self.overlay_effect]))
+        return comp.composite(base)
+
+    def _write_blend(self, payload, strip=None):
+        """Write a captured frame through the driver's own brightness LUT."""
+        strip = strip or self._strip
+        show_payload = getattr(strip, 'show_payload', None)
+        if show_payload is not None:
+            show_payload(payload, strip.getBrightness() if hasattr(strip, 'getBrightness') else 255)
+            return
+        for i in range(strip.numPixels()):
+            j = i * 4
+            strip.setPixelColor(i, Color(payload[j], payload[j + 1], payload[j + 2]))
+        strip.show()
+
     def run_effect(self):
+        if self._finish_clear():
+            return      # black burst in flight: its second frame comes first
         if self._wash_fade_t0 is not None:
             # The release ramp outlives power=False so it can run down to black
             self._paint_wash_fade()
@@ -1443,41 +1759,139 @@ class LichtwerkWebController:
             elif time.monotonic() - getattr(self, '_last_clear_ts', 0.0) > 2.0:
                 self.clear(force=True)
             return
-        
+
+        # One consistent view of a switch: select_effect swaps renderer,
+        # transition and clock together under the same lock
+        with self._strip_lock:
+            render, name = self._render, self._current_effect
+            tr, clock = self._transition, self._anim_clock
+        if render is not None:
+            local = self._render_local
+            local.clock = clock          # a switch mid-frame keeps its fresh clock
+            try:
+                effects = self._effect_table
+                frame = None
+                if tr is not None:
+                    frame = self._transition_frame(effects, tr, name, render)
+                overlay = self.overlay_effect
+                if (overlay is not None and self._strip is not None
+                        and name != 'iris_warn'
+                        and overlay != name
+                        and (overlay == 'sparkle' or overlay in effects)):
+                    if frame is None:
+                        frame = self._capture(self._layers()[1], render)
+                    frame = self._overlay_frame(frame, effects)
+                if frame is not None:
+                    self._write_blend(frame)
+                else:
+                    render()
+            finally:
+                local.clock = None
+            # Non-iris effects always leave the strip potentially lit
+            if name != 'iris_warn':
+                self._cleared = False
+
+    def _build_effects(self):
+        """Name -> renderer: the method effects plus one runner per plugin.
+
+        Built once in __init__ (run_effect used to rebuild this dict every
+        frame). Rainbow and the particle/trail effects (sparkle, meteor,
+        sinelon, juggle, fire) live in effect_plugins/.
+        """
         effects = {
             'solid': self.effect_solid,
-            'rainbow': self.effect_rainbow,
             'pulse': self.effect_pulse,
             'chase': self.effect_chase,
-            'sparkle': self.effect_sparkle,
             'strobe': self.effect_strobe,
-            'meteor': self.effect_meteor,
             'breathe': self.effect_breathe,
-            'sinelon': self.effect_sinelon,
-            'juggle': self.effect_juggle,
             'theater': self.effect_theater_chase_rainbow,
             'gradient': self.effect_gradient_fill,
-            'fire': self.effect_fire,
+            'zones': self.effect_zones,
             'iris_warn': self.effect_iris_warn
         }
-        
-        if self.current_effect in effects:
-            effects[self.current_effect]()
-            # Non-iris effects always leave the strip potentially lit
-            if self.current_effect != 'iris_warn':
-                self._cleared = False
+        return EFFECTS.bind(self, effects)
+
+    def wire_time(self):
+        """Shift-out time of the physical strip, as the device reports it.
+
+        MultiStrip reports its slowest chain; strips without their own model
+        (rpi_ws281x fallback, test fakes) get the 800-kHz one.
+        """
+        strip = self._strip
+        if strip is None:
+            return 0.0
+        wire = getattr(strip, 'wire_time_s', None)
+        return animation.wire_time_s(strip.numPixels()) if wire is None else wire
+
+    def write_floor(self):
+        """Shortest gap between two writes: shift-out plus latch slack.
+
+        Rounded to 0.1 ms so a 600-LED chain keeps exactly the proven 20 ms.
+        """
+        return round(self.wire_time() + WIRE_SLACK_S, 4)
+
+    def frame_interval(self):
+        """Seconds between frames for what is on the strip right now.
+
+        The busiest layer sets the pace: a crossfade or overlay runs at the
+        faster of its effects. Never shorter than the strip's shift-out.
+        Under load the governor slows only the time-based effects; the ones
+        that advance per call would visibly slow down with their frame rate.
+        """
+        n = self._strip.numPixels() if self._strip is not None else 0
+        wire = self.wire_time()
+        names = [self.current_effect]
+        if self._transition is not None:
+            names.append(self._transition.outgoing)
+        if self.overlay_effect is not None:
+            names.append(self.overlay_effect)
+        scale = self.governor.knob('fps_scale')
+        fps = max((self.effect_fps.get(e) or animation.target_fps(e, self.speed, n, wire))
+                  * (scale if e in animation.LEVEL_EFFECTS or e in animation.TICK_EFFECTS else 1.0)
+                  for e in names)
+        return max(wire, 1.0 / max(0.1, fps))
 
     def start_effect_loop(self):
         def effect_loop():
+            if self.realtime_cfg:
+                self.realtime = apply_realtime(self.realtime_cfg.get('cpu'),
+                                               self.realtime_cfg.get('priority'),
+                                               threading.get_native_id())
+                for err in self.realtime['errors']:
+                    print(f"Realtime-Einstellung nicht moeglich: {err}")
             while self.running:
                 try:
+                    # Pace on the wire here, outside any lock — the driver
+                    # holds back an early frame rather than wait for it
+                    self._await_wire()
+                    t0 = time.monotonic()
+                    wrote = self.effect_params.get('iris_last_write')
                     self.run_effect()
+                    if self.startup['first_frame_ms'] is None:
+                        self.startup['first_frame_ms'] = round((time.monotonic() - _T_START) * 1000.0, 1)
+                        print(f"Startup: erster Frame nach {self.startup['first_frame_ms']} ms")
+                    if self._status_dirty or t0 - self._status_ts >= STATUS_S:
+                        self.publish_status(t0)
+                    # Governor sees rendered frames only — iris polls at
+                    # 125 Hz and most polls return at the 20 ms write gate
+                    if self.power and (self.current_effect != 'iris_warn'
+                                       or self.effect_params.get('iris_last_write') != wrote):
+                        self.governor.record(time.monotonic() - t0)
                     if self.current_effect == 'iris_warn':
                         sleep_time = 0.008  # ~125 Hz poll — edges land within ~8 ms
+                    elif self.current_effect == 'zones' and self.zones is not None:
+                        sleep_time = self.zones.sleep_hint()  # next zone due
                     else:
-                        sleep_time = max(0.01, (101 - self.speed) / 1000.0)
+                        # Deadline from the frame start: render time is part
+                        # of the interval, nothing renders between ticks
+                        sleep_time = max(0.0, t0 + self.frame_interval() - time.monotonic())
+                    if self._black_burst is not None:
+                        # the burst's second frame is due on its own deadline
+                        sleep_time = min(sleep_time, max(0.0, self._black_burst[0] - time.monotonic()))
                     # Interruptible sleep: API changes paint on the next wake
-                    self._effect_wake.wait(timeout=sleep_time)
+                    deadline = time.monotonic() + sleep_time
+                    if not self._effect_wake.wait(timeout=sleep_time):
+                        self.jitter.record(time.monotonic() - deadline)
                     self._effect_wake.clear()
                 except Exception as e:
                     print(f"Effect error: {e}")
@@ -1488,8 +1902,129 @@ class LichtwerkWebController:
 
         self.effect_thread = threading.Thread(target=effect_loop, daemon=True)
         self.effect_thread.start()
+        if self.chain_supervisor is not None:
+            self.supervisor_thread = threading.Thread(target=self._supervise_chains, daemon=True)
+            self.supervisor_thread.start()
+
+    def _supervise_chains(self):
+        """Retry missing or lost chains on their backoff until shutdown."""
+        sup = self.chain_supervisor
+        while self.running:
+            try:
+                sup.poll()
+            except Exception as e:
+                print(f"Ketten-Supervisor: {e}")
+            # Idle until a chain is due — or one is lost at runtime (readd)
+            sup.wake.wait(max(0.05, min(1.0, sup.sleep_hint())))
+            sup.wake.clear()
+
+    def _stop_effect_loop(self):
+        self.running = False
+        self._effect_wake.set()
+        if self.chain_supervisor is not None:
+            self.chain_supervisor.wake.set()
+        for thread in (self.effect_thread, self.supervisor_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=1.0)
+
+    def start_render_process(self, dispatch):
+        """Hand the strip to a renderer process (render_process.py).
+
+        `dispatch(payload)` applies one command record there. A
+        renderer still alive from an earlier API worker is re-attached, and
+        this process adopts its state instead of starting a second painter.
+        """
+        ring_name, state_name = render_process.block_names(self.config['led_config']['pin'])
+        ring = render_process.CommandRing(ring_name)
+        state = render_process.StateBlock(state_name)
+        client = render_process.RenderClient(ring, state, 0)
+        snap = client.snapshot()
+        pid = ((snap or {}).get('renderer') or {}).get('pid')
+        alive = False
+        if pid:
+            try:
+                os.kill(pid, 0)
+                alive = True
+            except OSError:
+                pass
+        # Stop painting (and hot-attaching) here BEFORE the fork: exactly one
+        # process owns the strip, and no supervisor thread is mid-attach
+        self._stop_effect_loop()
+        if alive:
+            self.power = snap['power']
+            self.current_effect = snap['effect']
+            self.brightness = snap['brightness']
+            self.speed = snap['speed']
+            self.color = [snap['color']['r'], snap['color']['g'], snap['color']['b']]
+            self.push_params()
+            self.theater_rainbow = snap['theater_rainbow']
+            self.strip_warn_mode = snap.get('strip_warn_mode', False)
+        else:
+            pid = os.fork()
+            if pid == 0:
+                code = 0
+                try:
+                    self._renderer_main(ring, state, dispatch)
+                except SystemExit:
+                    pass
+                except BaseException as e:
+                    print(f"Renderer beendet: {e}")
+                    code = 1
+                os._exit(code)
+            threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+        client.pid = pid
+        self._strip = None
+        self._render_client = client
+        self.renderer_info = {'pid': pid, 'stale': True}
+        print(f"Renderer-Prozess {pid} ({'uebernommen' if alive else 'gestartet'})")
+
+    def _renderer_main(self, ring, state, dispatch):
+        """Renderer process: effect loop + API commands + status snapshots."""
+        self._render_client = None
+        self.renderer_info = {'pid': os.getpid(), 'commands': 0}
+        self.running = True
+        self.start_effect_loop()
+        last_pub = 0.0
+        while self.running:
+            for _, payload in ring.pop_all():
+                try:
+                    dispatch(payload)
+                except Exception as e:
+                    print(f"Renderer-Kommando: {e}")
+                self.renderer_info['commands'] += 1
+            now = time.monotonic()
+            if now - last_pub >= render_process.PUBLISH_S:
+                snap = dict((self._status or self.publish_status())[0])
+                snap['published'] = now
+                state.publish(json.dumps(snap, separators=(',', ':')).encode())
+                last_pub = now
+            time.sleep(render_process.POLL_S)
+
+    def publish_status(self, now=None):
+        """Render thread: build and encode the status once, swap it in."""
+        self._status_dirty = False
+        status = self.get_status()
+        snap = (status, json.dumps(status, separators=(',', ':')).encode())
+        self._status = snap
+        self._status_ts = time.monotonic() if now is None else now
+        return snap
+
+    def status_json(self) -> bytes:
+        """Pre-encoded /api/status body — O(1) once the render loop publishes."""
+        if self._render_client is not None:
+            return json.dumps(self.get_status(), separators=(',', ':')).encode()
+        snap = self._status
+        if snap is None:
+            snap = self.publish_status()   # before the first frame only
+        return snap[1]
 
     def get_status(self):
+        if self._render_client is not None:
+            # The renderer's own view (frames, jitter, quality are measured there)
+            snap = self._render_client.snapshot()
+            if snap is not None:
+                snap['renderer']['dropped_commands'] = self._render_client.ring.dropped
+                return snap
         return {
             'power': self.power,
             'effect': self.current_effect,
@@ -1503,10 +2038,30 @@ class LichtwerkWebController:
             # Frames the kernel refused. Non-zero means we are writing into an
             # in-flight DMA transfer — the pacing is off, not the paint.
             'dropped_frames': getattr(self.strip, 'dropped_frames', 0) if self.strip else 0,
+            # EBUSY collisions (pacing) vs. hard write errors (device/driver)
+            'write_stats': getattr(self.strip, 'write_stats', None) if self.strip else None,
+            # 5 V estimate of the frames actually written (per chain: 'chains')
+            'current': getattr(self.strip, 'current_stats', None) if self.strip else None,
             'iris_beat_s': (round(self.effect_params['iris_period_eff'], 3)
                             if self.current_effect == 'iris_warn'
                             and self.effect_params.get('iris_period_eff') else None),
             'theater_rainbow': self.theater_rainbow,
+            'strip_warn_mode': self.strip_warn_mode,
+            'overlay': ({'effect': self.overlay_effect, 'mode': self.overlay_mode}
+                        if self.overlay_effect else None),
+            'zones': self.zones.status() if self.zones is not None else None,
+            'target_fps': round(1.0 / self.frame_interval(), 1),
+            'wire': {'wire_ms': round(self.wire_time() * 1000.0, 2),
+                     'floor_ms': round(self.write_floor() * 1000.0, 1),
+                     'fps_ceiling': round(1.0 / self.write_floor(), 1)},
+            'quality': self.governor.status(),
+            'jitter': self.jitter.status(),
+            'realtime': self.realtime,
+            'renderer': self.renderer_info,
+            'chains': {'health': self.strip.chain_status() if hasattr(self.strip, 'chain_status') else None,
+                       **(self.chain_supervisor.status() if self.chain_supervisor is not None
+                          else {'missing': [], 'recovered': []})},
+            'startup': self.startup,
             'led_count': self.strip.numPixels() if self.strip else 50,
             'pin': self.config['led_config']['pin']
         }
@@ -1520,20 +2075,77 @@ def index():
 
 @app.route('/api/status')
 def get_status():
-    return jsonify(controller.get_status())
+    return app.response_class(controller.status_json(), mimetype='application/json')
+
+# API commands (render_process.COMMANDS): a route validates its request into
+# one typed command and answers; the handler below it changes the controller.
+# With a render process the handler runs there, on the strip's owner, and
+# this process never touches the strip.
+_HANDLERS = {}
+
+def _applies(op):
+    def register(fn):
+        _HANDLERS[op] = fn
+        return fn
+    return register
+
+def _command(op, *fields):
+    """Apply `op` here, or send it to the renderer process."""
+    client = controller._render_client
+    if client is None:
+        _HANDLERS[op](*fields)
+    else:
+        client.send(op, *fields)
+
+def apply_command(payload):
+    """Renderer process: apply one command record from the ring."""
+    op, fields = render_process.decode_command(payload)
+    _HANDLERS[op](*fields)
+
+def _state(key):
+    """A state field for a response: ours, or the renderer's last snapshot.
+
+    The command just sent is not in the snapshot yet — responses take what
+    they set from the request and only the rest from here.
+    """
+    client = controller._render_client
+    snap = client.snapshot() if client is not None else None
+    if snap is None:
+        if key == 'zones':
+            return controller.zones.status() if controller.zones is not None else None
+        value = getattr(controller, {'effect': 'current_effect'}.get(key, key))
+        return list(value) if key == 'color' else value
+    if key == 'color':
+        return [snap['color'][c] for c in 'rgb']
+    return snap[key]
+
+def _zone_state(zone):
+    """zone.status(), from the renderer's snapshot when it owns the zones."""
+    for z in _state('zones') or ():
+        if z['name'] == zone.name:
+            return dict(z)
+    return zone.status()
+
+def _byte(value):
+    return max(0, min(255, int(value)))
 
 @app.route('/api/power', methods=['POST'])
 def set_power():
     data = request.get_json() or {}
-    controller.power = bool(data.get('power', False))
+    power = bool(data.get('power', False))
+    _command('power', power, bool(data.get('clear_warn_mode', False)))
+    return jsonify({'status': 'ok', 'power': power})
+
+@_applies('power')
+def _apply_power(power, clear_warn_mode):
+    controller.power = power
     if not controller.power:
         controller.strip_warn_over = False
         # Explicit power-off also leaves Strip-Warn mode (disco will re-arm if needed)
-        if data.get('clear_warn_mode', False):
+        if clear_warn_mode:
             controller.strip_warn_mode = False
         controller._iris_abort()
     controller.wake_effect()
-    return jsonify({'status': 'ok', 'power': controller.power})
 
 
 @app.route('/api/warn_gate', methods=['POST'])
@@ -1545,6 +2157,17 @@ def warn_gate():
     """
     data = request.get_json() or {}
     over = bool(data.get('over', False))
+    _command('warn_gate', over)
+    return jsonify({
+        'status': 'ok',
+        'over': over,
+        'power': over,
+        'effect': 'iris_warn' if over else _state('effect'),
+        'strip_warn_mode': True,
+    })
+
+@_applies('warn_gate')
+def _apply_warn_gate(over):
     controller.strip_warn_mode = True
     controller.strip_warn_over = over
     if over:
@@ -1552,6 +2175,7 @@ def warn_gate():
         controller.current_effect = 'iris_warn'
         controller.brightness = 255
         controller._wash_engage()
+        controller._await_wire()      # the driver would hold this frame back
         try:
             controller.run_effect()   # first frame in-request, no wake latency
         except Exception as e:
@@ -1564,13 +2188,6 @@ def warn_gate():
         controller._wash_release()
         controller.power = False
     controller.wake_effect()
-    return jsonify({
-        'status': 'ok',
-        'over': over,
-        'power': controller.power,
-        'effect': controller.current_effect,
-        'strip_warn_mode': controller.strip_warn_mode,
-    })
 
 
 @app.route('/api/warn_kick', methods=['POST'])
@@ -1585,19 +2202,23 @@ def warn_kick_evt():
         strength = max(0.0, min(1.0, float(data.get('strength', 0.5))))
     except (TypeError, ValueError):
         strength = 0.5
-    bpm = None
+    bpm = 0.0
     try:
         b = float(data.get('bpm'))
         if 50.0 <= b <= 200.0:
             bpm = b
     except (TypeError, ValueError):
         pass
+    _command('warn_kick', strength, bpm)
+    return jsonify({'status': 'ok'})
+
+@_applies('warn_kick')
+def _apply_warn_kick(strength, bpm):
     if controller.current_effect == 'iris_warn':
         q = controller.effect_params.setdefault('iris_kicks', [])
         if len(q) < 8:
-            q.append({'s': strength, 'bpm': bpm})
+            q.append({'s': strength, 'bpm': bpm or None})
         controller.wake_effect()
-    return jsonify({'status': 'ok'})
 
 
 @app.route('/api/warn_event', methods=['POST'])
@@ -1623,12 +2244,16 @@ def warn_event_evt():
         n = max(2, min(6, int(data.get('n', 2))))
     except (TypeError, ValueError):
         n = 2
+    _command('warn_event', kind, gap, n)
+    return jsonify({'status': 'ok'})
+
+@_applies('warn_event')
+def _apply_warn_event(kind, gap, n):
     if controller.current_effect == 'iris_warn':
         evq = controller.effect_params.setdefault('iris_events', [])
         if len(evq) < 4:
             evq.append({'kind': kind, 'gap': gap, 'n': n})
         controller.wake_effect()
-    return jsonify({'status': 'ok'})
 
 
 @app.route('/api/warn_mode', methods=['POST'])
@@ -1636,165 +2261,302 @@ def warn_mode():
     """Enable/disable Strip-Warn exclusive ownership of the strip."""
     data = request.get_json() or {}
     on = bool(data.get('on', False))
+    _command('warn_mode', on)
+    return jsonify({
+        'status': 'ok',
+        'strip_warn_mode': on,
+        'power': _state('power') if on else False,
+    })
+
+@_applies('warn_mode')
+def _apply_warn_mode(on):
     controller.strip_warn_mode = on
     if not on:
         controller.strip_warn_over = False
         controller.power = False
         controller._iris_abort()
     controller.wake_effect()
-    return jsonify({
-        'status': 'ok',
-        'strip_warn_mode': controller.strip_warn_mode,
-        'power': controller.power,
-    })
 
 
 def _blocked_by_strip_warn():
     """While Strip-Warn owns the strip, ignore UI/disco effect/color writes."""
-    return bool(getattr(controller, 'strip_warn_mode', False))
+    return bool(_state('strip_warn_mode'))
 
 @app.route('/api/brightness', methods=['POST'])
 def set_brightness():
     data = request.get_json() or {}
-    brightness = int(data.get('brightness', 100))
-    controller.brightness = max(0, min(255, brightness))
+    brightness = _byte(data.get('brightness', 100))
+    _command('brightness', brightness)
+    return jsonify({'status': 'ok', 'brightness': brightness})
+
+@_applies('brightness')
+def _apply_brightness(brightness):
+    controller.brightness = brightness
     controller.wake_effect()
-    return jsonify({'status': 'ok', 'brightness': controller.brightness})
 
 @app.route('/api/speed', methods=['POST'])
 def set_speed():
     data = request.get_json() or {}
-    speed = int(data.get('speed', 50))
-    controller.speed = max(1, min(100, speed))
-    return jsonify({'status': 'ok', 'speed': controller.speed})
+    speed = max(1, min(100, int(data.get('speed', 50))))
+    _command('speed', speed)
+    return jsonify({'status': 'ok', 'speed': speed})
+
+@_applies('speed')
+def _apply_speed(speed):
+    controller.speed = speed
+    controller.push_params()
+    controller.wake_effect()
 
 @app.route('/api/effect', methods=['POST'])
 def set_effect():
     data = request.get_json() or {}
     effect = data.get('effect', 'solid')
-    valid_effects = ['solid', 'rainbow', 'pulse', 'chase', 'sparkle', 'strobe', 'meteor', 'breathe', 'sinelon', 'juggle', 'theater', 'gradient', 'fire', 'iris_warn']
-    
-    if effect not in valid_effects:
+    if effect not in controller._effect_table:
         return jsonify({'status': 'error', 'message': 'Invalid effect'}), 400
+    if effect == 'zones' and controller.zones is None:
+        return jsonify({'status': 'error', 'message': 'No zones configured'}), 400
 
     # Strip-Warn exclusive: only iris_warn arm allowed; other effects would flash through
     if _blocked_by_strip_warn() and effect != 'iris_warn':
         return jsonify({
             'status': 'blocked',
             'reason': 'strip-warn',
-            'effect': controller.current_effect,
-            'power': controller.power,
+            'effect': _state('effect'),
+            'power': _state('power'),
         })
 
-    if effect in valid_effects:
-        controller.current_effect = effect
-        # Reset effect parameters when changing effects
-        if effect == 'meteor':
-            controller.effect_params['meteor_positions'] = []
-            controller.effect_params['pixel_states'] = [[0, 0, 0] for _ in range(controller.strip.numPixels() if controller.strip else 600)]
-            controller.effect_params['last_meteor_spawn'] = 0
-        elif effect == 'breathe':
-            controller.effect_params['breathe_brightness'] = 0.1
-            controller.effect_params['breathe_direction'] = 1
-        elif effect == 'sparkle':
-            controller.effect_params['sparkle_pixels'] = []
-        elif effect == 'chase':
-            controller.effect_params['chase_position'] = 0
-        elif effect == 'rainbow':
-            controller.effect_params['rainbow_offset'] = 0
-        elif effect == 'pulse':
-            controller.effect_params['pulse_brightness'] = 0.1
-            controller.effect_params['pulse_direction'] = 1
-        elif effect == 'sinelon':
-            controller.effect_params['sinelon_phase'] = 0
-            controller.effect_params['sinelon_pixels'] = [[0, 0, 0] for _ in range(controller.strip.numPixels() if controller.strip else 600)]
-        elif effect == 'juggle':
-            controller.effect_params['juggle_phase'] = 0
-            controller.effect_params['juggle_pixels'] = [[0, 0, 0] for _ in range(controller.strip.numPixels() if controller.strip else 600)]
-        elif effect == 'theater':
-            controller.effect_params['theater_j'] = 0
-            controller.effect_params['theater_q'] = 0
-        elif effect == 'gradient':
-            controller.effect_params['gradient_pos'] = 0
-            controller.effect_params['gradient_hue1'] = 0
-            controller.effect_params['gradient_hue2'] = 120
-        elif effect == 'fire':
-            controller.effect_params['fire_heat'] = [0] * (controller.strip.numPixels() if controller.strip else 600)
-        elif effect == 'iris_warn':
-            controller.effect_params['iris_t0'] = None
-            controller.effect_params['iris_lit'] = None
-            controller.effect_params['iris_sparking'] = None
-            controller.effect_params['iris_spark_until'] = 0.0
-            # Full punch + auto-power: one POST from disco engages the strip
-            controller.brightness = 255
-            controller.power = True
-            # Paint first frame in-request → LED lights before HTTP returns
-            try:
-                controller.run_effect()
-            except Exception as e:
-                print(f"iris_warn first frame: {e}")
-
-        controller.wake_effect()
-        return jsonify({'status': 'ok', 'effect': controller.current_effect, 'power': controller.power})
+    _command('effect', effect)
+    return jsonify({'status': 'ok', 'effect': effect,
+                    'power': True if effect == 'iris_warn' else _state('power')})
+
+@_applies('effect')
+def _apply_effect(effect):
+    if controller.strip_warn_mode and effect != 'iris_warn':
+        return      # Strip-Warn armed after the route looked
+    controller.select_effect(effect)
+    if effect == 'iris_warn':
+        # Full punch + auto-power: one POST from disco engages the strip
+        controller.brightness = 255
+        controller.power = True
+        # Paint first frame in-request → LED lights before HTTP returns;
+        # wait out the wire first, an early frame would be held, not shown
+        controller._await_wire()
+        try:
+            controller.run_effect()
+        except Exception as e:
+            print(f"iris_warn first frame: {e}")
+    controller.wake_effect()
 
 @app.route('/api/color', methods=['POST'])
 def set_color():
     if _blocked_by_strip_warn():
         return jsonify({'status': 'blocked', 'reason': 'strip-warn'})
     data = request.get_json() or {}
-    r = max(0, min(255, int(data.get('r', 255))))
-    g = max(0, min(255, int(data.get('g', 255))))
-    b = max(0, min(255, int(data.get('b', 255))))
+    r = _byte(data.get('r', 255))
+    g = _byte(data.get('g', 255))
+    b = _byte(data.get('b', 255))
+    _command('color', r, g, b)
+    return jsonify({'status': 'ok', 'color': {'r': r, 'g': g, 'b': b}})
+
+@_applies('color')
+def _apply_color(r, g, b):
+    if controller.strip_warn_mode:
+        return
     controller.color = [r, g, b]
+    controller.push_params()
     controller.wake_effect()
-    return jsonify({'status': 'ok', 'color': {'r': r, 'g': g, 'b': b}})
 
 @app.route('/api/solid', methods=['POST'])
 def set_solid():
     """One-shot disco sync: power + solid effect + RGB + brightness in a single RTT."""
     if _blocked_by_strip_warn():
-        return jsonify({'status': 'blocked', 'reason': 'strip-warn', 'power': controller.power})
+        return jsonify({'status': 'blocked', 'reason': 'strip-warn', 'power': _state('power')})
     data = request.get_json() or {}
-    if 'r' in data or 'g' in data or 'b' in data:
-        r = max(0, min(255, int(data.get('r', controller.color[0]))))
-        g = max(0, min(255, int(data.get('g', controller.color[1]))))
-        b = max(0, min(255, int(data.get('b', controller.color[2]))))
-        controller.color = [r, g, b]
-    if 'brightness' in data:
-        controller.brightness = max(0, min(255, int(data.get('brightness'))))
-    if 'power' in data:
-        controller.power = bool(data.get('power'))
-        if not controller.power:
-            controller.clear(force=True)
-            controller.wake_effect()
-            return jsonify({'status': 'ok', 'power': False})
-    else:
-        controller.power = True
+    color = _state('color')
+    r, g, b = (_byte(data.get(k, color[i])) for i, k in enumerate('rgb'))
+    brightness = _byte(data.get('brightness', _state('brightness')))
+    power = bool(data.get('power', True))
+    _command('solid', power, r, g, b, brightness)
+    if not power:
+        return jsonify({'status': 'ok', 'power': False})
+    return jsonify({
+        'status': 'ok',
+        'power': True,
+        'effect': 'solid',
+        'color': {'r': r, 'g': g, 'b': b},
+        'brightness': brightness,
+    })
+
+@_applies('solid')
+def _apply_solid(power, r, g, b, brightness):
+    if controller.strip_warn_mode:
+        return
+    controller.color = [r, g, b]
+    controller.push_params()           # a plugin overlay may read the colour
+    controller.brightness = brightness
+    controller.power = power
+    if not power:
+        controller.clear(force=True)
+        controller.wake_effect()
+        return
     controller.current_effect = 'solid'
+    controller._await_wire()
     try:
         controller.effect_solid()
     except Exception as e:
         print(f"solid paint: {e}")
     controller.wake_effect()
-    return jsonify({
-        'status': 'ok',
-        'power': controller.power,
-        'effect': 'solid',
-        'color': {'r': controller.color[0], 'g': controller.color[1], 'b': controller.color[2]},
-        'brightness': controller.brightness,
-    })
 
 @app.route('/api/theater_mode', methods=['POST'])
 def set_theater_mode():
     data = request.get_json() or {}
-    rainbow = data.get('rainbow', True)
-    controller.theater_rainbow = bool(rainbow)
-    return jsonify({'status': 'ok', 'theater_rainbow': controller.theater_rainbow})
+    rainbow = bool(data.get('rainbow', True))
+    _command('theater_mode', rainbow)
+    return jsonify({'status': 'ok', 'theater_rainbow': rainbow})
+
+@_applies('theater_mode')
+def _apply_theater_mode(rainbow):
+    controller.theater_rainbow = rainbow
+    controller.wake_effect()
+
+# Every classic effect and every plugin can be stacked; iris_warn owns the
+# strip exclusively
+OVERLAY_EFFECTS = ('solid', 'pulse', 'chase', 'strobe', 'breathe', 'theater',
+                   'gradient') + tuple(EFFECTS.plugins)
+
+@app.route('/api/effects')
+def get_effects():
+    """Every selectable effect, plus the declared parameters of the plugins."""
+    return jsonify({'effects': sorted(controller._effect_table),
+                    'plugins': EFFECTS.describe()})
+
+@app.route('/api/overlay', methods=['POST'])
+def set_overlay():
+    """Stack a second effect over the running one: {effect, mode, r, g, b}.
+
+    `effect` null/"" removes the overlay. Modes: replace, add, screen,
+    multiply. `sparkle` draws only its live particles (sparse layer); other
+    effects are captured whole and trimmed to their lit extent.
+    """
+    if _blocked_by_strip_warn():
+        return jsonify({'status': 'blocked', 'reason': 'strip-warn'})
+    data = request.get_json() or {}
+    effect = data.get('effect') or None
+    mode = data.get('mode', 'add')
+    if effect is not None and effect not in OVERLAY_EFFECTS:
+        return jsonify({'status': 'error', 'message': 'Invalid overlay effect'}), 400
+    if mode not in COMPOSITE_MODES:
+        return jsonify({'status': 'error', 'message': 'Invalid blend mode'}), 400
+    has_color = 'r' in data or 'g' in data or 'b' in data
+    r, g, b = (_byte(data.get(k, 255)) for k in 'rgb')
+    _command('overlay', effect or '', mode, has_color, r, g, b)
+    return jsonify({'status': 'ok', 'overlay': effect, 'mode': mode})
+
+@_applies('overlay')
+def _apply_overlay(effect, mode, has_color, r, g, b):
+    if controller.strip_warn_mode:
+        return
+    controller.set_overlay(effect or None, mode, [r, g, b] if has_color else None)
+    controller.wake_effect()
+
+def _zone_or_404(name):
+    zone = controller.zones.get(name) if controller.zones is not None else None
+    if zone is None:
+        return None, (jsonify({'status': 'error', 'message': f'Unknown zone {name}'}), 404)
+    return zone, None
+
+def _zones_on():
+    """Any zone change shows the zone map — crossfaded like /api/effect."""
+    if controller.current_effect != 'zones':
+        controller.select_effect('zones')
+    controller.wake_effect()
+
+@app.route('/api/zones')
+def get_zones():
+    return jsonify({'zones': _state('zones') or [],
+                    'active': _state('effect') == 'zones'})
+
+@app.route('/api/zone/<name>/effect', methods=['POST'])
+def set_zone_effect(name):
+    if _blocked_by_strip_warn():
+        return jsonify({'status': 'blocked', 'reason': 'strip-warn'})
+    zone, err = _zone_or_404(name)
+    if err:
+        return err
+    effect = (request.get_json() or {}).get('effect', 'solid')
+    if effect not in OVERLAY_EFFECTS:
+        return jsonify({'status': 'error', 'message': 'Invalid effect'}), 400
+    _command('zone_effect', name, effect)
+    return jsonify({'status': 'ok', 'zone': {**_zone_state(zone), 'effect': effect}})
+
+@_applies('zone_effect')
+def _apply_zone_effect(name, effect):
+    if controller.strip_warn_mode:
+        return
+    controller.select_zone_effect(controller.zones.get(name), effect)
+    _zones_on()
+
+@app.route('/api/zone/<name>/color', methods=['POST'])
+def set_zone_color(name):
+    if _blocked_by_strip_warn():
+        return jsonify({'status': 'blocked', 'reason': 'strip-warn'})
+    zone, err = _zone_or_404(name)
+    if err:
+        return err
+    data = request.get_json() or {}
+    state = _zone_state(zone)
+    r, g, b = (_byte(data.get(k, state['color'][k])) for k in 'rgb')
+    _command('zone_color', name, r, g, b)
+    return jsonify({'status': 'ok', 'zone': {**state, 'color': {'r': r, 'g': g, 'b': b}}})
+
+@_applies('zone_color')
+def _apply_zone_color(name, r, g, b):
+    if controller.strip_warn_mode:
+        return
+    zone = controller.zones.get(name)
+    zone.color[:] = [r, g, b]
+    controller.push_params(zone)
+    _zones_on()
+
+@app.route('/api/zone/<name>/speed', methods=['POST'])
+def set_zone_speed(name):
+    zone, err = _zone_or_404(name)
+    if err:
+        return err
+    state = _zone_state(zone)
+    speed = max(1, min(100, int((request.get_json() or {}).get('speed', state['speed']))))
+    _command('zone_speed', name, speed)
+    return jsonify({'status': 'ok', 'zone': {**state, 'speed': speed}})
+
+@_applies('zone_speed')
+def _apply_zone_speed(name, speed):
+    zone = controller.zones.get(name)
+    zone.speed = speed
+    controller.push_params(zone)
+    controller.wake_effect()
+
+@app.route('/api/zone/<name>/brightness', methods=['POST'])
+def set_zone_brightness(name):
+    """{brightness: 0-255} or {brightness: null} to follow the master slider."""
+    zone, err = _zone_or_404(name)
+    if err:
+        return err
+    bri = (request.get_json() or {}).get('brightness')
+    bri = None if bri is None else _byte(bri)
+    _command('zone_brightness', name, -1 if bri is None else bri)
+    return jsonify({'status': 'ok', 'zone': {**_zone_state(zone), 'brightness': bri}})
+
+@_applies('zone_brightness')
+def _apply_zone_brightness(name, brightness):
+    controller.zones.get(name).brightness = None if brightness < 0 else brightness
+    controller.wake_effect()
 
 if __name__ == '__main__':
     print("Lichtwerk Web Controller starting...")
     led_count = controller.strip.numPixels() if controller.strip else 50
     print(f"LEDs: {led_count} on GPIO {controller.config['led_config']['pin']} (Demo Mode: {not controller.strip})")
+    if controller.render_process:
+        controller.start_render_process(apply_command)
     print("Web interface: http://localhost:5006")
     # threaded=True: disco warn_flash + sync don't serialize behind each other
     app.run(host='0.0.0.0', port=5006, debug=False, threaded=True)
\ No newline at end of file
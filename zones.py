@@ -0,0 +1,167 @@
+"""Named zones on one strip, each running its own effect at its own rate.
+
+The strip used to be one canvas. A zone map (`config.json` → `zones`) cuts
+it into ranges — e.g. bar front 0–199, DJ booth 200–399, entrance 400–599.
+Every zone has its own effect, colour, speed, optional brightness, effect
+state and animation clock.
+
+Rendering reuses the classic effects: a `ZoneView` is the host they draw
+on. It has its own strip (a `FrameCapture` the size of the zone), its own
+state and clock, and an explicit, small interface — the zone-capable
+effects take it as their `host`; it is not a proxy for the controller. Per tick, `ZoneMap.render` only
+re-runs zones whose effect is due (at its own target fps) or whose settings
+changed; everything else reuses the last captured slice, and the payload is
+assembled once. A static zone (solid) renders once and then costs nothing.
+"""
+from __future__ import annotations
+
+import time
+
+import animation
+from transitions import FrameCapture
+
+STATIC_EFFECTS = animation.STATIC_EFFECTS
+HEAL_S = 2.0     # re-send an unchanged frame this often (bit-slip healing)
+
+
+class Zone:
+    def __init__(self, name, start, end, effect='solid', color=(255, 255, 255),
+                 speed=50, brightness=None):
+        self.name = str(name)
+        self.start = max(0, int(start))
+        self.end = max(self.start, int(end))
+        self.effect = effect
+        self.color = [max(0, min(255, int(c))) for c in color[:3]]
+        self.speed = max(1, min(100, int(speed)))
+        self.brightness = None if brightness is None else max(0, min(255, int(brightness)))
+        self.params = {}
+        self.clock = animation.Clock()
+        self.capture = FrameCapture(self.end - self.start)
+        self.next_due = 0.0
+        self._stamp = None
+
+    def __len__(self):
+        return self.end - self.start
+
+    def set_effect(self, effect):
+        """New effect, fresh state — like /api/effect on the whole strip."""
+        self.effect = effect
+        self.params = {}
+        self.clock.reset()
+        self.next_due = 0.0
+
+    def stamp(self, master_brightness, theater_rainbow):
+        """Everything a static frame depends on; a change forces a render."""
+        bri = master_brightness if self.brightness is None else self.brightness
+        return (self.effect, tuple(self.color), self.speed, bri, theater_rainbow)
+
+    def status(self) -> dict:
+        return {'name': self.name, 'start': self.start, 'end': self.end,
+                'effect': self.effect, 'speed': self.speed,
+                'color': {'r': self.color[0], 'g': self.color[1], 'b': self.color[2]},
+                'brightness': self.brightness}
+
+
+class ZoneView:
+    """Host of one zone's effect — exactly what zone-capable effects read.
+
+    Built-in effects take it as `host`, plugin runners render on it:
+    strip (the zone capture), clock, speed, colour, brightness, state and
+    the two plane writers. `ramp(n, rgb, lo)` is the controller's cached
+    level ramp; nothing else of the controller is reachable from here.
+    """
+
+    __slots__ = ('strip', 'effect_params', 'color', 'speed', 'anim_clock',
+                 'brightness', '_ramp')
+
+    def __init__(self, zone, master_brightness, ramp):
+        self.strip = zone.capture
+        self.effect_params = zone.params
+        self.color = zone.color
+        self.speed = zone.speed
+        self.anim_clock = zone.clock
+        self.brightness = (master_brightness if zone.brightness is None
+                           else zone.brightness)
+        self._ramp = ramp
+
+    def _show_plane(self, plane):
+        """Unscaled plane into the capture, the zone brightness as its gain."""
+        self.strip.show_payload(plane, max(0, min(255, self.brightness)))
+
+    def _show_level(self, level, lo):
+        frames = self._ramp(self.strip.numPixels(), tuple(self.color[:3]), lo)
+        self._show_plane(frames[animation.ramp_index(level, lo, len(frames))])
+
+
+class ZoneMap:
+    def __init__(self, zones, n):
+        self.n = max(0, int(n))
+        ordered = sorted(zones, key=lambda z: z.start)
+        last = 0
+        for z in ordered:
+            if z.start < last:
+                raise ValueError(f"zone {z.name!r} overlaps the zone before it")
+            if z.end > self.n:
+                raise ValueError(f"zone {z.name!r} ends past LED {self.n}")
+            last = z.end
+        self.zones = ordered
+        self._by_name = {z.name: z for z in ordered}
+        if len(self._by_name) != len(ordered):
+            raise ValueError("zone names must be unique")
+        self._payload = None
+        self._last_write = 0.0
+
+    @classmethod
+    def from_config(cls, entries, n):
+        zones = [Zone(e['name'], e['start'], e['end'], e.get('effect', 'solid'),
+                      e.get('color', (255, 255, 255)), e.get('speed', 50),
+                      e.get('brightness')) for e in (entries or [])]
+        return cls(zones, n)
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def render(self, render_zone, master_brightness, theater_rainbow, now=None):
+        """Re-render due/changed zones; the assembled payload, or None if unchanged.
+
+        `render_zone(zone)` runs the zone's effect into `zone.capture`.
+        """
+        now = time.monotonic() if now is None else now
+        changed = False
+        for z in self.zones:
+            stamp = z.stamp(master_brightness, theater_rainbow)
+            moving = z.effect not in STATIC_EFFECTS
+            if stamp != z._stamp or (moving and now >= z.next_due):
+                render_zone(z)
+                z._stamp = stamp
+                z.next_due = now + 1.0 / animation.target_fps(z.effect, z.speed, self.n)
+                changed = True
+        if changed or self._payload is None:
+            self._payload = self.assemble()
+        elif now - self._last_write < HEAL_S:
+            return None
+        self._last_write = now
+        return self._payload
+
+    def assemble(self) -> bytes:
+        """One payload: zone slices in order, black between and after them."""
+        parts, pos = [], 0
+        for z in self.zones:
+            if z.start > pos:
+                parts.append(bytes((z.start - pos) * 4))
+            parts.append(z.capture.payload)
+            pos = z.end
+        if self.n > pos:
+            parts.append(bytes((self.n - pos) * 4))
+        return b''.join(parts)
+
+    def sleep_hint(self, now=None) -> float:
+        """Seconds until the next zone is due (static zones never are)."""
+        now = time.monotonic() if now is None else now
+        due = [z.next_due for z in self.zones if z.effect not in STATIC_EFFECTS]
+        if not due:
+            return 0.1
+        return max(0.005, min(due) - now)
+
+    def status(self):
+        return [z.status() for z in self.zones]